@@ -0,0 +1,216 @@
+"""
+Benchmarks for page parsing and post extraction on synthetic activity pages.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_extraction --output bench.json
+    python -m benchmarks.bench_extraction --output new.json --compare bench.json
+
+Results are written as JSON, one entry per benchmark, so runs from different commits
+can be compared with --compare.
+"""
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+
+from src.cli import setup_logging
+from src.html_parser import FEED, PARSERS, PROFILE, parse_html
+from src.linkedin_parser import LinkedinParser
+from tests.synthetic_feed import PROFILE_FIXTURE, make_activity_page, read_fixture
+
+FIELD_EXTRACTORS = [
+    "extract_likes",
+    "extract_reposts",
+    "extract_comments",
+    "extract_post_age",
+    "extract_text",
+    "extract_is_repost",
+    "extract_post_type",
+    "extract_post_id",
+]
+
+
+def time_call(func, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {"min_s": min(timings), "median_s": statistics.median(timings)}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def available_parsers():
+    parsers = []
+    for parser in PARSERS:
+        try:
+            parse_html("<html></html>", parser, FEED)
+            parsers.append(parser)
+        except ImportError:
+            logging.warning(f"Skipping the {parser} parser, it is not installed")
+
+    return parsers
+
+
+def run_benchmarks(sizes, repeat: int):
+    results = []
+
+    def record(name, n_posts, params, func):
+        result = {"name": name, "n_posts": n_posts, "params": params, "repeat": repeat}
+        result.update(time_call(func, repeat))
+        result["per_post_s"] = result["median_s"] / n_posts if n_posts else None
+        results.append(result)
+        logging.info(f"{name} {params} n_posts={n_posts}: {result['median_s']:.5f}s")
+
+    parsers = available_parsers()
+
+    profile_html = read_fixture(PROFILE_FIXTURE)
+    for parser in parsers:
+        for region in [None, PROFILE]:
+            record(
+                "parse_profile_page",
+                0,
+                {"parser": parser, "region": region},
+                lambda: LinkedinParser.extract_profile(
+                    parse_html(profile_html, parser, region)
+                ),
+            )
+
+    for n_posts in sizes:
+        html = make_activity_page(n_posts)
+
+        for parser in parsers:
+            for region in [None, FEED]:
+                record(
+                    "parse_activity_page",
+                    n_posts,
+                    {"parser": parser, "region": region},
+                    lambda: parse_html(html, parser, region),
+                )
+                record(
+                    "extract_activity_page",
+                    n_posts,
+                    {"parser": parser, "region": region},
+                    lambda: LinkedinParser.extract_posts(
+                        LinkedinParser.find_posts(parse_html(html, parser, region))
+                    ),
+                )
+
+        soup = parse_html(html, "lxml")
+        record("find_posts", n_posts, {}, lambda: LinkedinParser.find_posts(soup))
+
+        posts = LinkedinParser.find_posts(soup)
+        for extractor_name in FIELD_EXTRACTORS:
+            extractor = getattr(LinkedinParser, extractor_name)
+            record(
+                extractor_name,
+                n_posts,
+                {},
+                lambda: [extractor(post) for post in posts],
+            )
+
+        record(
+            "extract_fields_separately",
+            n_posts,
+            {},
+            lambda: [
+                [getattr(LinkedinParser, name)(post) for name in FIELD_EXTRACTORS]
+                for post in posts
+            ],
+        )
+        record(
+            "extract_posts", n_posts, {}, lambda: LinkedinParser.extract_posts(posts)
+        )
+
+    return results
+
+
+def result_key(result: dict) -> str:
+    return json.dumps([result["name"], result["n_posts"], result["params"]])
+
+
+def compare(results, baseline, threshold: float) -> int:
+    """Print the change against a baseline run and return the number of regressions."""
+    baseline_by_key = {result_key(result): result for result in baseline["results"]}
+    regressions = 0
+
+    print(f"{'benchmark':<70} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for result in results:
+        base = baseline_by_key.get(result_key(result))
+        if base is None:
+            continue
+
+        ratio = result["median_s"] / base["median_s"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+
+        label = f"{result['name']} {result['params']} n={result['n_posts']}"
+        print(
+            f"{label:<70} {base['median_s']:>10.5f} {result['median_s']:>10.5f}"
+            f" {ratio:>7.2f}{flag}"
+        )
+
+    return regressions
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    arg_parser = ArgumentParser(description="Benchmark page parsing and extraction.")
+    arg_parser.add_argument("--output", required=True, help="JSON results path")
+    arg_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="Numbers of posts in the synthetic activity pages",
+    )
+    arg_parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per benchmark"
+    )
+    arg_parser.add_argument(
+        "--compare", default=None, help="Baseline JSON results to compare against"
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown reported as a regression by --compare",
+    )
+    args = arg_parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.repeat)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.time(),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            if compare(results, json.load(f), args.threshold):
+                sys.exit(1)
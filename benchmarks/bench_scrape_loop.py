@@ -0,0 +1,160 @@
+"""
+End-to-end benchmark of LinkedinPostScraper.scrape_profile on a FakeDriver, without
+a browser and without the loop's pauses.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scrape_loop --output loop.json
+    python -m benchmarks.bench_scrape_loop --output new.json --compare loop.json
+
+Each entry records the wall and CPU time per profile, the scraper's phase timings
+and a digest of the scraped rows: --compare also fails if a change to the loop alters
+the results. The time the FakeDriver takes to answer page scripts is counted in the
+script phase, in place of the browser's.
+"""
+import hashlib
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+
+from benchmarks.bench_extraction import available_parsers, compare, git_commit, result_key
+from src.cli import setup_logging
+from src.linkedin_post_scraper import LinkedinPostScraper
+from src.metrics import ProfileMetrics
+from tests.fake_driver import FakeDriver
+
+EXTRACTIONS = ["soup", "script", "verify"]
+PROFILE_URL = "https://www.linkedin.com/in/synthetic"
+
+
+def scrape_once(
+    n_posts: int, page_size: int, extraction: str, parser: str, metrics: ProfileMetrics
+):
+    scraper = LinkedinPostScraper(
+        driver=FakeDriver(n_posts=n_posts, page_size=page_size),
+        extraction=extraction,
+        parser=parser,
+        sleep=lambda seconds: None,
+    )
+    return scraper.scrape_profile(
+        PROFILE_URL, max_post_age_years=100, max_posts=n_posts, metrics=metrics
+    )
+
+
+def rows_digest(profile) -> str:
+    return hashlib.sha256(
+        json.dumps(profile.rows(), sort_keys=True).encode()
+    ).hexdigest()
+
+
+def run_benchmarks(sizes, page_size: int, repeat: int):
+    results = []
+    for n_posts in sizes:
+        for extraction in EXTRACTIONS:
+            for parser in available_parsers():
+                walls, cpus = [], []
+                for _ in range(repeat):
+                    metrics = ProfileMetrics(PROFILE_URL)
+                    wall, cpu = time.perf_counter(), time.process_time()
+                    profile = scrape_once(
+                        n_posts, page_size, extraction, parser, metrics
+                    )
+                    walls.append(time.perf_counter() - wall)
+                    cpus.append(time.process_time() - cpu)
+
+                result = {
+                    "name": "scrape_profile",
+                    "n_posts": n_posts,
+                    "params": {
+                        "extraction": extraction,
+                        "parser": parser,
+                        "page_size": page_size,
+                    },
+                    "repeat": repeat,
+                    "min_s": min(walls),
+                    "median_s": statistics.median(walls),
+                    "cpu_median_s": statistics.median(cpus),
+                    "per_post_s": statistics.median(walls) / n_posts,
+                    "phases_s": dict(metrics.phases),
+                    "digest": rows_digest(profile),
+                }
+                results.append(result)
+                logging.info(
+                    f"scrape_profile {result['params']} n_posts={n_posts}: "
+                    f"{result['median_s']:.4f}s wall, {result['cpu_median_s']:.4f}s CPU"
+                )
+
+    return results
+
+
+def changed_results(results, baseline) -> int:
+    """Print and count benchmarks whose scraped rows differ from the baseline run."""
+    baseline_by_key = {result_key(result): result for result in baseline["results"]}
+    changed = 0
+    for result in results:
+        base = baseline_by_key.get(result_key(result))
+        if base is not None and base.get("digest") != result["digest"]:
+            changed += 1
+            print(f"RESULTS CHANGED: {result['params']} n={result['n_posts']}")
+
+    return changed
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    arg_parser = ArgumentParser(description="Benchmark the scrape loop on a fake driver.")
+    arg_parser.add_argument("--output", required=True, help="JSON results path")
+    arg_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[30, 100],
+        help="Numbers of posts in each synthetic profile feed",
+    )
+    arg_parser.add_argument(
+        "--page-size",
+        type=int,
+        default=10,
+        help="Posts loaded by each scroll",
+    )
+    arg_parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per benchmark"
+    )
+    arg_parser.add_argument(
+        "--compare", default=None, help="Baseline JSON results to compare against"
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown reported as a regression by --compare",
+    )
+    args = arg_parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.page_size, args.repeat)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.time(),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args.threshold)
+        if changed_results(results, baseline) or regressions:
+            sys.exit(1)
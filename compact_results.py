@@ -0,0 +1,62 @@
+import json
+import logging
+import os
+from argparse import ArgumentParser
+
+from src.cli import setup_logging
+from src.compaction import Compactor
+
+if __name__ == "__main__":
+    setup_logging()
+
+    arg_parser = ArgumentParser(
+        description="""
+            Merge output CSVs and JSONL result stores from any number of runs into one
+            CSV, keeping the latest observation of each post. Memory use is bounded by
+            --run-size, however large the inputs are.
+        """
+    )
+    arg_parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Output CSVs and .jsonl result stores, in the order they were written",
+    )
+    arg_parser.add_argument("--output", required=True, help="Compacted output CSV path")
+    arg_parser.add_argument(
+        "--summary",
+        default=None,
+        help="JSON summary of the compaction. Defaults to the output path with a .summary.json suffix",
+    )
+    arg_parser.add_argument(
+        "--run-size",
+        type=int,
+        default=100_000,
+        help="Rows sorted in memory at a time before being spilled to a temporary file",
+    )
+    arg_parser.add_argument(
+        "--fan-in",
+        type=int,
+        default=64,
+        help="Maximum number of temporary files merged at once",
+    )
+    arg_parser.add_argument(
+        "--tmp-dir",
+        default=None,
+        help="Directory for the temporary sorted runs. Defaults to the system temp directory",
+    )
+    args = arg_parser.parse_args()
+
+    compactor = Compactor(
+        run_size=args.run_size, fan_in=args.fan_in, tmp_dir=args.tmp_dir
+    )
+    summary = compactor.compact(args.inputs, args.output)
+
+    summary_path = args.summary or os.path.splitext(args.output)[0] + ".summary.json"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=4)
+
+    logging.info(
+        f"Wrote {summary['rows_written']} rows ({summary['profiles']} profiles) to "
+        f"{args.output}, dropping {summary['rows_dropped']} superseded rows of "
+        f"{summary['rows_read']} read from {summary['inputs']} files"
+    )
@@ -0,0 +1,65 @@
+import json
+import logging
+import os
+import sys
+from argparse import ArgumentParser
+
+from src.cli import setup_logging
+from src.html_parser import PARSERS
+from src.parse_pipeline import iter_html_files, parse_files
+
+if __name__ == "__main__":
+    setup_logging()
+
+    arg_parser = ArgumentParser(
+        description="Extract saved profile and activity pages across all CPU cores."
+    )
+    arg_parser.add_argument(
+        "--input",
+        required=True,
+        help="Directory of saved .html/.html.gz pages, or - to read file paths from stdin",
+    )
+    arg_parser.add_argument(
+        "--output", required=True, help="JSONL output, one result per input file"
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of parsing processes",
+    )
+    arg_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=16,
+        help="Number of files handed to a worker at a time",
+    )
+    arg_parser.add_argument(
+        "--parser",
+        default="lxml",
+        choices=PARSERS,
+        help="HTML parser backend. selectolax is fastest but needs the selectolax package.",
+    )
+    args = arg_parser.parse_args()
+
+    if args.input == "-":
+        paths = (line.strip() for line in sys.stdin if line.strip())
+    else:
+        paths = iter_html_files(args.input)
+
+    parsed = failed = 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        for result in parse_files(
+            paths,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            parser=args.parser,
+        ):
+            f.write(json.dumps(result) + "\n")
+            parsed += 1
+
+            if result["error"]:
+                failed += 1
+                logging.error(f"Failed {result['path']}: {result['error']}")
+
+    logging.info(f"Parsed {parsed} files into {args.output} ({failed} failed)")
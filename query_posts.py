@@ -0,0 +1,87 @@
+import csv
+import json
+import logging
+import sys
+import time
+from argparse import ArgumentParser
+
+from src.cli import setup_logging
+from src.compaction import iter_result_file
+from src.post_search import PostSearchIndex
+
+if __name__ == "__main__":
+    setup_logging()
+
+    arg_parser = ArgumentParser(
+        description="Query scraped posts through a local SQLite full-text index."
+    )
+    arg_parser.add_argument(
+        "--index", required=True, help="SQLite search index, created if missing"
+    )
+    arg_parser.add_argument(
+        "--update",
+        nargs="+",
+        default=[],
+        help="""
+            Index these JSONL result stores (incrementally, from where the last update
+            stopped) and output CSVs (in full) before querying
+        """,
+    )
+    arg_parser.add_argument(
+        "--match",
+        default=None,
+        help="""FTS5 query on post text, e.g. python or '"machine learning" OR ai*'""",
+    )
+    arg_parser.add_argument("--min-likes", default=None, type=int)
+    arg_parser.add_argument("--min-followers", default=None, type=int)
+    arg_parser.add_argument(
+        "--post-type", default=None, choices=["Text", "Image", "Video", "Article"]
+    )
+    arg_parser.add_argument(
+        "--repost",
+        default=None,
+        choices=["yes", "no"],
+        help="Only reposts, or only original posts",
+    )
+    arg_parser.add_argument("--profile-url", default=None)
+    arg_parser.add_argument("--limit", default=100, type=int)
+    arg_parser.add_argument(
+        "--format",
+        default="csv",
+        choices=["csv", "jsonl"],
+        help="Format of the matching posts written to stdout",
+    )
+    args = arg_parser.parse_args()
+
+    index = PostSearchIndex(args.index)
+    for path in args.update:
+        if path.endswith(".jsonl"):
+            entries = index.update_from_store(path)
+            logging.info(f"Indexed {entries} new entries of {path}")
+        else:
+            index.add_rows(row for _, row in iter_result_file(path))
+            logging.info(f"Indexed {path}")
+
+    start = time.perf_counter()
+    posts = index.search(
+        match=args.match,
+        min_likes=args.min_likes,
+        post_type=args.post_type,
+        is_repost=None if args.repost is None else args.repost == "yes",
+        min_followers=args.min_followers,
+        profile_url=args.profile_url,
+        limit=args.limit,
+    )
+    logging.info(
+        f"{len(posts)} posts in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+
+    if args.format == "jsonl":
+        for post in posts:
+            print(json.dumps(post))
+    elif posts:
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(posts[0]))
+        writer.writeheader()
+        writer.writerows(posts)
+
+    index.close()
@@ -0,0 +1,77 @@
+import logging
+from argparse import ArgumentParser
+
+from src.cli import setup_logging
+from src.html_parser import PARSERS
+from src.linkedin_parser import LinkedinParser
+from src.result_store import COLUMNS
+from src.snapshot_archive import SnapshotArchive
+
+if __name__ == "__main__":
+    setup_logging()
+
+    arg_parser = ArgumentParser(
+        description="Rebuild scrape results from a snapshot archive, without a browser."
+    )
+    arg_parser.add_argument(
+        "--archive", required=True, help="Snapshot archive written with --archive"
+    )
+    arg_parser.add_argument("--output", required=True, help="Output CSV path")
+    arg_parser.add_argument(
+        "--max-post-age-years",
+        default=10,
+        type=int,
+        help="Drop posts published more than max-post-age-years years ago.",
+    )
+    arg_parser.add_argument(
+        "--max-post-age-days",
+        default=None,
+        type=float,
+        help="Finer-grained alternative to --max-post-age-years, which it overrides",
+    )
+    arg_parser.add_argument(
+        "--max-posts",
+        default=30,
+        type=int,
+        help="Keep a maximum of max-posts on each profile.",
+    )
+    arg_parser.add_argument(
+        "--parser",
+        default="lxml",
+        choices=PARSERS,
+        help="HTML parser backend. selectolax is fastest but needs the selectolax package.",
+    )
+    args = arg_parser.parse_args()
+
+    archive = SnapshotArchive(args.archive)
+
+    rows = []
+    failed = 0
+    latest_captures = archive.latest_captures()
+    for profile_url in {entry["profile_url"] for entry in archive.iter_entries()}:
+        if profile_url not in latest_captures:
+            logging.warning(f"{profile_url} has no complete capture, skipping...")
+
+    for profile_url, captures in latest_captures.items():
+        try:
+            rows.extend(
+                LinkedinParser.extract_snapshot(
+                    profile_url,
+                    archive.get(captures[SnapshotArchive.PROFILE]["digest"]),
+                    archive.get(captures[SnapshotArchive.ACTIVITY]["digest"]),
+                    max_post_age_years=args.max_post_age_years,
+                    max_post_age_days=args.max_post_age_days,
+                    max_posts=args.max_posts,
+                    parser=args.parser,
+                )
+            )
+        except Exception as e:
+            failed += 1
+            logging.exception(e)
+            logging.error(f"Failed to re-extract {profile_url}, skipping...")
+
+    import pandas
+
+    df = pandas.DataFrame(rows) if rows else pandas.DataFrame(columns=COLUMNS)
+    df.to_csv(args.output, index=False)
+    logging.info(f"Wrote {len(df)} rows to {args.output} ({failed} profiles failed)")
@@ -1,30 +1,115 @@
+import gc
 import json
 import logging
+import os
 import random
 import time
 from argparse import ArgumentParser
 
-import pandas
-from selenium import webdriver
-
+from src.browser import DEFAULT_CACHE_DIR
+from src.cli import setup_logging
+from src.html_parser import PARSERS
+from src.job_queue import SCRAPE, SEARCH, JobQueue
 from src.linkedin_post_scraper import LinkedinPostScraper
+from src.memory_monitor import MemoryMonitor
+from src.metrics import MetricsRecorder, ProfileMetrics
+from src.post_index import PostIndex
+from src.post_search import PostSearchIndex
+from src.profile_urls import (
+    canonical_profile_url,
+    canonical_profile_urls,
+    plan_profile_urls,
+)
+from src.result_store import ResultStore
+from src.snapshot_archive import SnapshotArchive
+from src.write_behind import WriteBehindWriter
 
 if __name__ == "__main__":
+    setup_logging()
+
     arg_parser = ArgumentParser()
     arg_parser.add_argument("--email", required=True, help="Linkedin Email")
     arg_parser.add_argument("--password", required=True, help="Linkedin Password")
     arg_parser.add_argument(
         "--input",
-        required=True,
+        default=None,
         help="CSV containing a profile_url column. URLs should be of the form https://www.linkedin.com/in/profile_id",
     )
+    arg_parser.add_argument(
+        "--queue",
+        default=None,
+        help="""
+            Scrape the profile URLs of a job queue filled by search_google_multi_thread.py
+            --queue instead of an --input CSV, as soon as they are found. Waits for new
+            URLs while the search stage is running
+        """,
+    )
+    arg_parser.add_argument(
+        "--queue-poll",
+        type=float,
+        default=30,
+        help="Seconds between checks for new URLs while the queue is empty",
+    )
+    arg_parser.add_argument(
+        "--queue-idle-timeout",
+        type=float,
+        default=30 * 60,
+        help="""
+            Stop if the queue gets no new URLs for this many seconds. Until searches have
+            been enqueued, the scraper waits for them at most this long
+        """,
+    )
+    arg_parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=30 * 60,
+        help="With --queue, profiles not scraped within N seconds are retried",
+    )
     arg_parser.add_argument(
         "--output",
         required=True,
-        help="Output CSV path. If it already exists, append results to it, unless --override is provided",
+        help="Output CSV path, exported from the result store at the end of the run",
+    )
+    arg_parser.add_argument(
+        "--parquet",
+        default=None,
+        help="""
+            Also export the results as two normalized Parquet tables, PREFIX.profiles.parquet
+            and PREFIX.posts.parquet. Requires pyarrow
+        """,
+        metavar="PREFIX",
+    )
+    arg_parser.add_argument(
+        "--store",
+        default=None,
+        help="""
+            Append-only JSONL result store. Profiles already in it are skipped, unless
+            --override is provided. Defaults to the output path with a .jsonl suffix, seeded
+            from the output CSV if that already exists.
+        """,
+    )
+    arg_parser.add_argument(
+        "--archive",
+        default=None,
+        help="Save each profile's raw page HTML to this snapshot archive directory, for re-extraction with reextract_snapshots.py",
+    )
+    arg_parser.add_argument(
+        "--save-every",
+        type=int,
+        default=3,
+        help="Fsync the result store to disk every N profiles",
+    )
+    arg_parser.add_argument(
+        "--write-batch-size",
+        type=int,
+        default=5,
+        help="Results are written by a background thread in batches of up to N profiles",
     )
     arg_parser.add_argument(
-        "--save-every", type=int, default=3, help="Save to disk every N profiles"
+        "--write-interval",
+        type=float,
+        default=10,
+        help="Write a pending batch of results once it is this many seconds old",
     )
     arg_parser.add_argument(
         "--headless", default=False, action="store_true", help="Do not display browser"
@@ -51,7 +136,33 @@ if __name__ == "__main__":
         "--override",
         default=False,
         action="store_true",
-        help="Override all results in the output CSV instead of skipping already scraped profiles",
+        help="Re-scrape profiles already in the result store, replacing their results",
+    )
+    arg_parser.add_argument(
+        "--refresh",
+        default=False,
+        action="store_true",
+        help="""
+            Refresh profiles already in the result store incrementally: stop scrolling at
+            posts scraped before, add the new posts and update the engagement counts of the
+            --refresh-window most recent known posts
+        """,
+    )
+    arg_parser.add_argument(
+        "--refresh-window",
+        default=10,
+        type=int,
+        help="Number of most recent already scraped posts updated by --refresh",
+    )
+    arg_parser.add_argument(
+        "--post-index",
+        default=None,
+        help="SQLite index of scraped post IDs used by --refresh. Defaults to the store path with a .posts.sqlite suffix",
+    )
+    arg_parser.add_argument(
+        "--search-index",
+        default=None,
+        help="Also keep this SQLite full-text index of the results up to date, for query_posts.py",
     )
     arg_parser.add_argument(
         "--max-post-age-years",
@@ -59,12 +170,34 @@ if __name__ == "__main__":
         type=int,
         help="Stop scraping posts published more than max-post-age-years years ago. Note that post ages are rough estimates.",
     )
+    arg_parser.add_argument(
+        "--max-post-age-days",
+        default=None,
+        type=float,
+        help="Finer-grained alternative to --max-post-age-years, which it overrides",
+    )
     arg_parser.add_argument(
         "--max-posts",
         default=30,
         type=int,
         help="Scrape a maximum of max-posts on each profile.",
     )
+    arg_parser.add_argument(
+        "--profile-dir",
+        default=None,
+        help="""
+            Chrome user data directory reused across launches (warm start). The LinkedIn
+            session is kept in it, so relaunches skip the login page while it is valid
+        """,
+    )
+    arg_parser.add_argument(
+        "--driver-cache-dir",
+        default=None,
+        help=f"""
+            Keep the patched chromedriver for --chrome-version in this directory instead of
+            downloading it on every launch, e.g. {DEFAULT_CACHE_DIR}
+        """,
+    )
     arg_parser.add_argument(
         "--chrome-version",
         default=130,
@@ -75,98 +208,310 @@ if __name__ == "__main__":
             'This version of ChromeDriver only supports Chrome version X'
         """,
     )
+    arg_parser.add_argument(
+        "--extraction",
+        default="soup",
+        choices=["soup", "script", "verify"],
+        help="""
+            How fields are read from each page. soup: parse the page HTML with BeautifulSoup.
+            script: extract inside the browser and transfer only compact JSON.
+            verify: do both and log any difference.
+        """,
+    )
+    arg_parser.add_argument(
+        "--parser",
+        default="lxml",
+        choices=PARSERS,
+        help="HTML parser backend. selectolax is fastest but needs the selectolax package.",
+    )
+    arg_parser.add_argument(
+        "--metrics-output",
+        default=None,
+        help="Append a JSONL record of per-phase timings and counters for each profile to this path",
+    )
+    arg_parser.add_argument(
+        "--memory-trace",
+        default=False,
+        action="store_true",
+        help="""
+            Trace Python allocations with tracemalloc: record traced memory in the metrics
+            and log the top allocation sites every --memory-report-every profiles. Slow
+        """,
+    )
+    arg_parser.add_argument(
+        "--memory-report-every",
+        default=10,
+        type=int,
+        help="Log the top allocation sites every N profiles with --memory-trace",
+    )
+    arg_parser.add_argument(
+        "--max-rss-mb",
+        default=None,
+        type=float,
+        help="""
+            Memory ceiling for the scraper and its browser processes together. Above it,
+            pending results are checkpointed and the browser is restarted
+        """,
+    )
     args = arg_parser.parse_args()
+    assert bool(args.input) != bool(args.queue), "Provide one of --input or --queue"
 
-    df_in = pandas.read_csv(args.input, index_col=None).sample(frac=1.0)
-    assert (
-        "profile_url" in df_in
-    ), "input csv must contain profile_url column contain linkedin profiles. Of the form https://www.linkedin.com/in/profile_id"
+    import pandas
 
-    try:
-        df_out = pandas.read_csv(args.output)
-    except FileNotFoundError:
-        logging.info("No existing output CSV found -- starting a new one.")
-        df_out = pandas.DataFrame(
-            columns=[
-                "profile_url",
-                "followers",
-                "likes",
-                "reposts",
-                "comments",
-                "post_age",
-                "text",
-                "is_repost",
-                "post_type",
-                "post_id",
-            ]
-        )
+    store_path = args.store or os.path.splitext(args.output)[0] + ".jsonl"
+    seed_from_csv = not os.path.exists(store_path) and os.path.exists(args.output)
+    store = ResultStore(store_path)
 
-    scraper = LinkedinPostScraper(
-        email=args.email,
-        password=args.password,
-        chrome_version=args.chrome_version,
-        headless=args.headless,
-    )
-
-    completed = 0
-    failed_in_a_row = 0
-    for i, profile_url in enumerate(df_in.profile_url.unique()):
-        if (completed + 1) % args.break_after_n_profiles == 0:
-            logging.info("Taking a very long break to avoid detection.")
-            logging.info(f"Sleeping for {args.break_time} seconds...")
-            scraper.driver.quit()
-            time.sleep(args.break_time)
-
-            scraper = LinkedinPostScraper(
-                email=args.email,
-                password=args.password,
-                chrome_version=args.chrome_version,
-                headless=args.headless,
-            )
+    if seed_from_csv:
+        logging.info(f"Seeding {store_path} from existing output CSV {args.output}")
+        store.import_csv(args.output)
+
+    logging.info(f"{len(store)} profiles already in {store_path}")
+
+    post_index_path = args.post_index or os.path.splitext(store_path)[0] + ".posts.sqlite"
+    seed_post_index = not os.path.exists(post_index_path)
+    post_index = PostIndex(post_index_path)
+
+    if seed_post_index and len(store):
+        logging.info(f"Seeding {post_index_path} from {store_path}")
+        post_index.add_rows(store.iter_rows())
+
+    search_index = None
+    if args.search_index:
+        search_index = PostSearchIndex(args.search_index)
+        entries = search_index.update_from_store(store_path)
+        logging.info(f"Indexed {entries} entries of {store_path} in {args.search_index}")
+
+    # Profiles stored before URLs were canonicalized keep their stored spelling.
+    stored = pandas.Series(list(store.completed), dtype=object)
+    stored_urls = dict(zip(canonical_profile_urls(stored), stored))
+    skip_stored = not (args.override or args.refresh)
 
-        parsed_url = LinkedinPostScraper.extract_linkedin_profile(profile_url)
+    job_queue = None
+    if args.queue:
+        job_queue = JobQueue(args.queue)
+        logging.info(f"Scrape queue: {job_queue.counts(SCRAPE)}")
 
-        if not parsed_url:
+        def leased_profile_urls():
+            """Lease profile URLs one at a time, waiting while searches are running."""
+            worker = f"scrape-{os.getpid()}"
+            idle_since = time.monotonic()
+            while True:
+                # Read before leasing: the last search enqueues its profile URL in the
+                # same transaction that completes it, so once the search stage is seen
+                # drained, a lease taken afterwards finds every URL it produced.
+                searched = job_queue.drained(SEARCH)
+                jobs = job_queue.lease(SCRAPE, worker, args.lease_seconds)
+                if not jobs and searched:
+                    jobs = job_queue.lease(SCRAPE, worker, args.lease_seconds)
+                    if not jobs:
+                        return
+
+                if not jobs:
+                    if time.monotonic() - idle_since > args.queue_idle_timeout:
+                        logging.warning("No new profile URLs in the queue, stopping")
+                        return
+
+                    logging.info("Waiting for the search stage to find profiles...")
+                    time.sleep(args.queue_poll)
+                    continue
+
+                idle_since = time.monotonic()
+                profile_url = jobs[0].key
+                if skip_stored and stored_urls.get(profile_url, profile_url) in store:
+                    job_queue.complete(SCRAPE, profile_url)
+                    continue
+
+                yield profile_url
+
+        profile_urls = leased_profile_urls()
+    else:
+        df_in = pandas.read_csv(args.input, index_col=None).sample(frac=1.0)
+        assert (
+            "profile_url" in df_in
+        ), "input csv must contain profile_url column contain linkedin profiles. Of the form https://www.linkedin.com/in/profile_id"
+
+        profile_urls, malformed = plan_profile_urls(
+            df_in.profile_url, store.completed if skip_stored else ()
+        )
+        for profile_url in malformed:
             logging.error(f"{profile_url} is malformed, skipping...")
-            continue
+        logging.info(f"{len(profile_urls)} profiles to scrape")
 
-        if not args.override and df_out.profile_url.str.contains(parsed_url).any():
-            logging.info(f"{parsed_url} already scraped, skipping ...")
-            continue
+    archive = SnapshotArchive(args.archive) if args.archive else None
+    recorder = MetricsRecorder(args.metrics_output)
 
-        logging.info(parsed_url)
+    monitor = (
+        MemoryMonitor(trace=args.memory_trace)
+        if args.memory_trace or args.max_rss_mb
+        else None
+    )
+    if args.max_rss_mb and monitor.tree_rss_mb() is None:
+        logging.warning(
+            "--max-rss-mb needs /proc or the psutil package to measure memory, ignoring it"
+        )
+        args.max_rss_mb = None
 
-        try:
-            post_data = scraper.scrape_profile(
-                parsed_url,
-                max_post_age_years=args.max_post_age_years,
-                max_posts=args.max_posts,
+    startup_times = []
+
+    def start_scraper():
+        scraper = LinkedinPostScraper(
+            email=args.email,
+            password=args.password,
+            chrome_version=args.chrome_version,
+            headless=args.headless,
+            extraction=args.extraction,
+            parser=args.parser,
+            profile_dir=args.profile_dir,
+            driver_cache_dir=args.driver_cache_dir,
+        )
+        startup_times.append(
+            scraper.startup_timings["launch_s"] + scraper.startup_timings["login_s"]
+        )
+        return scraper
+
+    scraper = start_scraper()
+
+    def save_profiles(batch):
+        for profile, _ in batch:
+            logging.info(json.dumps(profile.rows(), indent=4))
+
+        store.append_profiles(batch)
+        post_index.add_many(
+            (profile.profile_url, profile.post_ids()) for profile, _ in batch
+        )
+        if search_index is not None:
+            # Reads just the entries appended above.
+            search_index.update_from_store(store_path)
+        if job_queue is not None:
+            # Only completed once the results are in the store.
+            job_queue.complete_many(
+                SCRAPE, (canonical_profile_url(p.profile_url) for p, _ in batch)
             )
-            failed_in_a_row = 0
-        except Exception as e:
-            failed_in_a_row += 1
 
-            if failed_in_a_row >= args.max_fails_in_a_row:
-                logging.error("Failed too many times in a row. Stopping.")
-                raise e
+    writer = WriteBehindWriter(
+        save_profiles,
+        store.checkpoint,
+        batch_size=args.write_batch_size,
+        flush_interval=args.write_interval,
+    )
+    try:
+        completed = 0
+        failed_in_a_row = 0
+        failed_urls = set()
+        for i, profile_url in enumerate(profile_urls):
+            if (completed + 1) % args.break_after_n_profiles == 0:
+                logging.info("Taking a very long break to avoid detection.")
+                logging.info(f"Sleeping for {args.break_time} seconds...")
+                if job_queue is not None:
+                    # Keep the profile leased through the break.
+                    job_queue.renew(
+                        SCRAPE, profile_url, args.break_time + args.lease_seconds
+                    )
+                scraper.driver.quit()
+                time.sleep(args.break_time)
+
+                scraper = start_scraper()
+
+            parsed_url = stored_urls.get(profile_url, profile_url)
+            refresh = args.refresh and not args.override and parsed_url in store
+
+            known_post_ids = post_index.known(parsed_url) if refresh else None
+            logging.info(f"{parsed_url} (refresh)" if refresh else parsed_url)
+            metrics = ProfileMetrics(parsed_url)
 
-            logging.exception(e)
-            logging.error(f"Failed {profile_url}, skipping...")
-            continue
+            try:
+                profile = scraper.scrape_profile(
+                    parsed_url,
+                    max_post_age_years=args.max_post_age_years,
+                    max_post_age_days=args.max_post_age_days,
+                    max_posts=args.max_posts,
+                    archive=archive,
+                    metrics=metrics,
+                    known_post_ids=known_post_ids,
+                    refresh_window=args.refresh_window,
+                )
+                failed_in_a_row = 0
+            except Exception as e:
+                # Queue retries of a profile that already failed don't count again.
+                if profile_url not in failed_urls:
+                    failed_in_a_row += 1
+                    failed_urls.add(profile_url)
+                metrics.status = "failed"
+                recorder.record(metrics)
+                if job_queue is not None:
+                    job_queue.fail(SCRAPE, profile_url, repr(e))
 
-        logging.info(json.dumps(post_data, indent=4))
+                if failed_in_a_row >= args.max_fails_in_a_row:
+                    logging.error("Failed too many times in a row. Stopping.")
+                    raise e
 
-        df_out = df_out[df_out.profile_url != profile_url]
-        df_out = df_out.append(post_data, ignore_index=True)
+                logging.exception(e)
+                logging.error(f"Failed {profile_url}, skipping...")
+                continue
 
-        if (i + 1) % args.save_every == 0:
-            df_out.to_csv(args.output, index=False)
+            with metrics.phase("save"):
+                writer.submit((profile, refresh))
 
-        completed += 1
+                if (i + 1) % args.save_every == 0:
+                    writer.checkpoint()
 
-        wait_time = random.uniform(15, 20)
-        logging.info(f"Pausing for {int(wait_time)} seconds...")
-        time.sleep(wait_time)
+            completed += 1
 
-    df_out.to_csv(args.output, index=False)
+            if monitor is not None:
+                tree_rss_mb = monitor.sample(metrics)
+                if args.memory_trace and completed % args.memory_report_every == 0:
+                    monitor.report_top()
+
+                if args.max_rss_mb and tree_rss_mb > args.max_rss_mb:
+                    logging.warning(
+                        f"Memory use {tree_rss_mb:.0f}MB is over --max-rss-mb "
+                        f"{args.max_rss_mb:.0f}MB, restarting the browser"
+                    )
+                    with metrics.phase("restart"):
+                        writer.checkpoint(wait=True)
+                        scraper.driver.quit()
+                        gc.collect()
+                        scraper = start_scraper()
+
+            wait_time = random.uniform(15, 20)
+            logging.info(f"Pausing for {int(wait_time)} seconds...")
+            with metrics.phase("pause"):
+                time.sleep(wait_time)
+
+            recorder.record(metrics)
+    except BaseException as e:
+        scrape_error = e
+        raise
+    else:
+        scrape_error = None
+    finally:
+        try:
+            writer.close()
+        except Exception:
+            # Don't mask the error that stopped the scrape loop.
+            if scrape_error is None:
+                raise
+            logging.exception("Failed to write the remaining results")
+        finally:
+            if monitor is not None:
+                monitor.stop()
+            recorder.log_summary()
+            logging.info(
+                f"Started the browser {len(startup_times)} times in "
+                f"{sum(startup_times):.1f}s ({max(startup_times):.1f}s at most)"
+            )
+
+    store.export_csv(args.output)
+    if args.parquet:
+        store.export_parquet(
+            args.parquet + ".profiles.parquet", args.parquet + ".posts.parquet"
+        )
+    store.close()
+    post_index.close()
+    if search_index is not None:
+        search_index.close()
+    if job_queue is not None:
+        logging.info(f"Scrape queue: {job_queue.counts(SCRAPE)}")
+        job_queue.close()
     logging.info("Done!")
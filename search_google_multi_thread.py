@@ -1,44 +1,24 @@
-import concurrent.futures
+import asyncio
 import logging
 import warnings
 from argparse import ArgumentParser
 
-import pandas
-import requests
-
-warnings.filterwarnings("ignore")
-logging.basicConfig(
-    format="%(asctime)s %(levelname)-8s %(message)s",
-    level=logging.INFO,
-    datefmt="%Y-%m-%d %H:%M:%S",
+from src.async_search import AsyncSearchEngine
+from src.cli import setup_logging
+from src.profile_search import (
+    run_threaded,
+    search_in_memory,
+    search_queued,
+    search_streaming,
 )
-
-
-def search_linkedin_profile(index, username: str, password: str, query: str):
-    response = requests.post(
-        "https://realtime.oxylabs.io/v1/queries",
-        auth=(username, password),
-        json={
-            "source": "google_search",
-            "query": f"linkedin {query}",
-            "parse": True,
-        },
-        timeout=10,
-    )
-    for result in response.json()["results"][0]["content"]["results"]["organic"]:
-        url = result["url"]
-
-        if "linkedin.com/in/" not in url:
-            continue
-
-        logging.info(f"{query}: {url}")
-        return index, url
-
-    logging.info(f"{query}: NOT FOUND")
-    return index, "NOT FOUND"
+from src.query_cache import QueryCache
+from src.search_client import SearchClient
 
 
 def main():
+    warnings.filterwarnings("ignore")
+    setup_logging()
+
     arg_parse = ArgumentParser()
     arg_parse.add_argument(
         "--input",
@@ -54,45 +34,133 @@ def main():
         default=5,
         help="Number of concurrent searches, limited by the oxylabs subscription plan.",
     )
+    arg_parse.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retries per search after a timeout, connection error or 429/5xx response",
+    )
+    arg_parse.add_argument(
+        "--backoff",
+        type=float,
+        default=1.0,
+        help="Base delay in seconds between retries, doubled on every attempt",
+    )
+    arg_parse.add_argument(
+        "--cache",
+        default=None,
+        help="SQLite file caching search results across runs and input files",
+    )
+    arg_parse.add_argument(
+        "--cache-ttl-days",
+        type=float,
+        default=None,
+        help="Search again for queries cached more than N days ago",
+    )
+    arg_parse.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=None,
+        help="Evict the least recently used queries beyond N cache entries",
+    )
+    arg_parse.add_argument(
+        "--stream",
+        default=False,
+        action="store_true",
+        help="""
+            Read the input in chunks, keep a bounded window of searches in flight and
+            checkpoint results to an append-only journal (INPUT.journal.jsonl) that is
+            replayed on restart and merged into the input CSV at the end.
+        """,
+    )
+    arg_parse.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10000,
+        help="Rows read from the input at a time in --stream mode",
+    )
+    arg_parse.add_argument(
+        "--window",
+        type=int,
+        default=None,
+        help="""
+            Maximum searches in flight. Defaults to 4 x --threads with --engine threads
+            and 2 x --threads with --engine asyncio
+        """,
+    )
+    arg_parse.add_argument(
+        "--queue",
+        default=None,
+        help="""
+            SQLite job queue shared with scrape_linkedin.py --queue. Input rows are
+            enqueued as search jobs and each resolved profile URL is enqueued for scraping
+            as soon as it is found, so both scripts can run at the same time. Rerunning
+            resumes from the queue
+        """,
+    )
+    arg_parse.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=600,
+        help="With --queue, searches not finished within N seconds are retried",
+    )
+    arg_parse.add_argument(
+        "--engine",
+        default="threads",
+        choices=["threads", "asyncio"],
+        help="Run searches on a thread pool, or on one asyncio event loop (needs aiohttp)",
+    )
     args = arg_parse.parse_args()
 
-    df = pandas.read_csv(args.input, index_col=None)
-
-    if "profile_url" not in df:
-        df["profile_url"] = None
-
-    assert "name" in df, "Add a name column to the CSV"
-    assert (
-        "extra_info" in df
-    ), "Add an extra_info column to the CSV with any helpful identifying information"
-
-    rows_to_process = df[df.profile_url.isnull()].iterrows()
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=args.threads) as executor:
-        futures = []
-        for index, row in rows_to_process:
-            future = executor.submit(
-                search_linkedin_profile,
-                index,
-                args.username,
-                args.password,
-                row["name"] + " " + row["extra_info"],
-            )
-            futures.append(future)
-
-        for i, future in enumerate(concurrent.futures.as_completed(futures)):
-            if future.exception():
-                logging.error(future.exception())
-                continue
-
-            index, profile_url = future.result()
-            df.loc[index, "profile_url"] = profile_url
-
-            if (i + 1) % args.save_every == 0:
-                df.to_csv(args.input, index=False)
-                logging.info(f"Saved progress after processing {i + 1} profiles")
-
-    df.to_csv(args.input, index=False)
+    cache = None
+    if args.cache:
+        cache = QueryCache(
+            args.cache,
+            ttl=args.cache_ttl_days * 24 * 60 * 60 if args.cache_ttl_days else None,
+            max_entries=args.cache_max_entries,
+        )
+
+    if args.engine == "asyncio":
+        engine = AsyncSearchEngine(
+            args.username,
+            args.password,
+            concurrency=args.threads,
+            max_retries=args.max_retries,
+            backoff=args.backoff,
+            cache=cache,
+            window=args.window,
+        )
+
+        def run_searches(items, on_result):
+            asyncio.run(engine.run(items, on_result))
+
+    else:
+        engine = SearchClient(
+            args.username,
+            args.password,
+            pool_size=args.threads,
+            max_retries=args.max_retries,
+            backoff=args.backoff,
+        )
+
+        def run_searches(items, on_result):
+            run_threaded(args, engine, cache, items, on_result)
+
+    if args.queue:
+        search_queued(args, run_searches)
+    elif args.stream:
+        search_streaming(args, run_searches)
+    else:
+        search_in_memory(args, run_searches)
+
+    logging.info(f"Search API stats: {engine.stats()}")
+
+    if args.engine == "threads":
+        engine.close()
+
+    if cache is not None:
+        logging.info(f"Search cache stats: {cache.stats()}")
+        cache.close()
 
 
 if __name__ == "__main__":
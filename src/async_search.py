@@ -0,0 +1,175 @@
+import asyncio
+import base64
+import logging
+import time
+from typing import Callable, Iterable, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from src.query_cache import QueryCache
+from src.search_client import (
+    RETRY_STATUSES,
+    SEARCH_URL,
+    SearchStats,
+    organic_results,
+    pick_linkedin_url,
+    retry_delay,
+    search_payload,
+)
+
+
+class SearchAPIError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"{status} from search API")
+        self.status = status
+
+
+class AsyncSearchEngine:
+    """
+    asyncio alternative to running search_linkedin_profile on a thread pool.
+
+    A semaphore caps concurrent requests at the plan's concurrency, while one event
+    loop thread drives them all. Each attempt has its own deadline of timeout seconds
+    and is cancelled when it expires; timeouts, connection errors and 429/5xx
+    responses are retried like SearchClient does. Results are the same (index, url)
+    pairs search_linkedin_profile returns.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        concurrency: int = 5,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        url: str = SEARCH_URL,
+        cache: Optional[QueryCache] = None,
+        window: Optional[int] = None,
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                "The asyncio search engine requires the aiohttp package: pip install aiohttp"
+            )
+
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+        self.headers = {"Authorization": f"Basic {credentials}"}
+        self.concurrency = concurrency
+        self.window = window or 2 * concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.url = url
+        self.cache = cache
+        self.search_stats = SearchStats()
+
+    async def search(self, session, semaphore: asyncio.Semaphore, query: str) -> dict:
+        start = time.perf_counter()
+        attempt = 0
+        failed = True
+        try:
+            while True:
+                retry_after = None
+                try:
+                    async with semaphore:
+                        async with session.post(
+                            self.url,
+                            json=search_payload(query),
+                            timeout=aiohttp.ClientTimeout(total=self.timeout),
+                        ) as response:
+                            if response.status not in RETRY_STATUSES:
+                                response.raise_for_status()
+                                payload = await response.json()
+                                failed = False
+                                return payload
+
+                            retry_after = response.headers.get("Retry-After")
+                            error = SearchAPIError(response.status)
+                except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                    error = e
+
+                if attempt >= self.max_retries:
+                    raise error
+
+                await asyncio.sleep(retry_delay(self.backoff, attempt, retry_after))
+                attempt += 1
+        finally:
+            self.search_stats.record(time.perf_counter() - start, attempt, failed)
+
+    async def search_profile(
+        self, session, semaphore: asyncio.Semaphore, index, query: str
+    ) -> Tuple[object, str]:
+        cached = self.cache.get(query) if self.cache is not None else None
+
+        if cached is not None:
+            url = cached["url"]
+        else:
+            organic = organic_results(await self.search(session, semaphore, query))
+            url = pick_linkedin_url(organic)
+
+            if self.cache is not None:
+                self.cache.put(query, organic, url)
+
+        if url:
+            logging.info(f"{query}: {url}")
+            return index, url
+
+        logging.info(f"{query}: NOT FOUND")
+        return index, "NOT FOUND"
+
+    async def run(
+        self,
+        items: Iterable[Tuple[object, str]],
+        on_result: Callable[[object, str], None],
+    ):
+        """
+        Search every (index, query) item, calling on_result(index, url) as each completes.
+
+        Items are consumed lazily with at most window searches scheduled at a time,
+        2 * concurrency unless given. Failed searches are logged and skipped. If run is cancelled, all searches
+        in flight are cancelled too.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        pending = set()
+
+        def collect(done):
+            for task in done:
+                if task.exception():
+                    logging.error(task.exception())
+                    continue
+
+                on_result(*task.result())
+
+        async with aiohttp.ClientSession(
+            headers=self.headers, connector=connector
+        ) as session:
+            try:
+                for index, query in items:
+                    if len(pending) >= self.window:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        collect(done)
+
+                    pending.add(
+                        asyncio.ensure_future(
+                            self.search_profile(session, semaphore, index, query)
+                        )
+                    )
+
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    collect(done)
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return self.search_stats.summary()
@@ -0,0 +1,33 @@
+"""
+Helpers for starting Chrome quickly: a chromedriver binary downloaded and patched
+once per Chrome version, instead of on every launch.
+"""
+import logging
+import os
+import shutil
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "linkedin_scrape")
+
+
+def cached_driver_path(chrome_version: int, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """
+    Path of a patched chromedriver for chrome_version, downloaded on first use.
+
+    undetected_chromedriver deletes, downloads and patches its driver on every
+    launch unless it is given a binary that is already patched, so the patched
+    binary is kept in cache_dir, one per Chrome major version.
+    """
+    path = os.path.join(cache_dir, f"chromedriver-{chrome_version}")
+    if os.path.exists(path):
+        return path
+
+    import undetected_chromedriver
+
+    logging.info(f"Downloading chromedriver {chrome_version} to {path}")
+    os.makedirs(cache_dir, exist_ok=True)
+    patcher = undetected_chromedriver.Patcher(version_main=chrome_version)
+    patcher.auto()
+
+    shutil.copy2(patcher.executable_path, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return path
@@ -0,0 +1,10 @@
+import logging
+
+
+def setup_logging():
+    """Log INFO and above to stderr, for the command line scripts."""
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)-8s %(message)s",
+        level=logging.INFO,
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
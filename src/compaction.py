@@ -0,0 +1,201 @@
+"""
+Streaming compaction of accumulated scrape results: any number of output CSVs and
+JSONL result stores merged into one dataset holding the latest observation of each
+post, with memory bounded by an external merge sort.
+"""
+import csv
+import heapq
+import itertools
+import json
+import os
+import tempfile
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.jsonl import iter_jsonl
+from src.profile_urls import canonical_profile_url
+from src.result_store import COLUMNS, PROFILE_FIELDS, entry_rows
+
+# A sort record: [profile_url, post_id, observed_at, seq, row]. Sorted, the
+# observations of a post are adjacent and in the order they were made.
+SORT_KEY = slice(0, 4)
+
+
+def iter_result_file(
+    path: str, observed_at: float = 0.0
+) -> Iterator[Tuple[float, dict]]:
+    """
+    Yield (observed_at, row) for the rows of an output CSV or a JSONL result store.
+
+    Store rows are observed when their entry was scraped. CSVs don't record when
+    their rows were scraped, so their rows (and store entries without scraped_at) are
+    given observed_at.
+    """
+    if path.endswith(".jsonl"):
+        for _, entry in iter_jsonl(path):
+            entry_observed_at = entry.get("scraped_at") or observed_at
+            for row in entry_rows(entry):
+                yield entry_observed_at, row
+        return
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield observed_at, row
+
+
+def sort_record(observed_at: float, seq: int, row: dict) -> list:
+    profile_url = row.get("profile_url") or ""
+    profile_url = canonical_profile_url(profile_url) or profile_url
+    return [profile_url, row.get("post_id") or "", observed_at, seq, row]
+
+
+class Compactor:
+    """
+    Merges result files into one CSV with a row per (profile_url, post_id), keeping
+    the latest observation of each post.
+
+    Rows are read in runs of at most run_size, each run is sorted by
+    (profile_url, post_id, observed_at) and spilled to a temporary JSONL file, and
+    the runs are merged at most fan_in at a time, so memory holds one run or one row
+    per merged run, plus the rows of one profile. Observations made at the same time
+    are ordered by input position, later files and rows winning.
+
+    Paths are expected in the order they were written. CSV rows have no scrape time:
+    they count as observed at the latest time seen in the inputs before them, so a
+    CSV wins over the files listed before it and loses to the stores scraped after
+    it, whatever its modification time.
+
+    Profile URLs are canonicalized. Each profile's name, bio and followers are taken
+    from its latest observation and applied to all its rows, and a row without a post
+    (a profile that had no posts) is only kept if no posts of that profile were seen.
+    """
+
+    def __init__(
+        self, run_size: int = 100_000, fan_in: int = 64, tmp_dir: Optional[str] = None
+    ):
+        if fan_in < 2:
+            raise ValueError(f"fan_in must be at least 2, got {fan_in}")
+
+        self.run_size = run_size
+        self.fan_in = fan_in
+        self.tmp_dir = tmp_dir
+        self.stats = {
+            "inputs": 0,
+            "rows_read": 0,
+            "rows_written": 0,
+            "rows_dropped": 0,
+            "profiles": 0,
+            "posts": 0,
+            "runs": 0,
+            "merge_passes": 0,
+        }
+
+    def compact(self, paths: Iterable[str], output: str) -> dict:
+        """Write the compacted rows of paths to the output CSV and return a summary."""
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory(dir=self.tmp_dir) as run_dir:
+            columns = list(COLUMNS)
+            runs = self._write_runs(paths, run_dir, columns)
+            self.stats["runs"] = len(runs)
+
+            while len(runs) > self.fan_in:
+                self.stats["merge_passes"] += 1
+                runs = [
+                    self._merge_runs(group, run_dir)
+                    for group in chunked(runs, self.fan_in)
+                ]
+
+            self.stats["merge_passes"] += 1
+            self._write_output(self._compacted_rows(merge_runs(runs)), output, columns)
+
+        stats = self.stats
+        stats["rows_dropped"] = stats["rows_read"] - stats["rows_written"]
+        self.stats["seconds"] = round(time.perf_counter() - started, 3)
+        return dict(self.stats)
+
+    def _write_runs(self, paths: Iterable[str], run_dir: str, columns: List[str]):
+        seen_columns = set(columns)
+        runs, buffer = [], []
+        latest = 0.0
+        for path in paths:
+            self.stats["inputs"] += 1
+            for observed_at, row in iter_result_file(path, latest):
+                latest = max(latest, observed_at)
+                for column in row.keys() - seen_columns - {None}:
+                    seen_columns.add(column)
+                    columns.append(column)
+
+                buffer.append(sort_record(observed_at, self.stats["rows_read"], row))
+                self.stats["rows_read"] += 1
+                if len(buffer) >= self.run_size:
+                    runs.append(self._spill(buffer, run_dir))
+
+        if buffer:
+            runs.append(self._spill(buffer, run_dir))
+
+        return runs
+
+    def _spill(self, buffer: List[list], run_dir: str) -> str:
+        buffer.sort(key=lambda r: r[SORT_KEY])
+        path = self._write_run(buffer, run_dir)
+        buffer.clear()
+        return path
+
+    def _write_run(self, records: Iterable[list], run_dir: str) -> str:
+        fd, path = tempfile.mkstemp(suffix=".jsonl", dir=run_dir)
+        with open(fd, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+
+        return path
+
+    def _merge_runs(self, runs: List[str], run_dir: str) -> str:
+        path = self._write_run(merge_runs(runs), run_dir)
+        for run in runs:
+            os.remove(run)
+
+        return path
+
+    def _compacted_rows(self, records: Iterable[list]) -> Iterator[dict]:
+        for _, profile_records in itertools.groupby(records, key=lambda r: r[0]):
+            latest = []
+            for _, observations in itertools.groupby(
+                profile_records, key=lambda r: r[1]
+            ):
+                latest.append(list(observations)[-1])
+
+            if len(latest) > 1 and not latest[0][1]:
+                # Posts sort after the empty post_id of a no-posts row.
+                latest = latest[1:]
+
+            newest = max(latest, key=lambda r: r[2:4])[4]
+            profile = {field: newest.get(field) for field in PROFILE_FIELDS}
+
+            self.stats["profiles"] += 1
+            for profile_url, post_id, _, _, row in latest:
+                self.stats["posts"] += bool(post_id)
+                yield {**row, **profile, "profile_url": profile_url}
+
+    def _write_output(self, rows: Iterable[dict], output: str, columns: List[str]):
+        with open(output + ".tmp", "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                self.stats["rows_written"] += 1
+
+        os.replace(output + ".tmp", output)
+
+
+def iter_run(path: str) -> Iterator[list]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def merge_runs(runs: List[str]) -> Iterator[list]:
+    return heapq.merge(*map(iter_run, runs), key=lambda r: r[SORT_KEY])
+
+
+def chunked(items: List, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
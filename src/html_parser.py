@@ -0,0 +1,78 @@
+"""
+Parser backends for turning LinkedIn page HTML into the BeautifulSoup trees the
+extractors work on.
+
+"lxml" and "html.parser" are BeautifulSoup's own tree builders. "selectolax" uses
+the much faster selectolax parser to cut the requested region out of the page, then
+builds a BeautifulSoup tree of that region only with lxml.
+
+Restricting parsing to a region skips navigation, scripts and sidebars:
+FEED keeps only the feed posts, PROFILE keeps only the <main> profile content that
+holds the name, bio and followers.
+"""
+import re
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+PARSERS = ("lxml", "html.parser", "selectolax")
+
+FEED = "feed"
+PROFILE = "profile"
+
+FEED_POST_CLASS_PATTERN = re.compile(r"(^|\s)feed-shared-update-v2(\s|$)")
+
+STRAINERS = {
+    FEED: SoupStrainer("div", class_=FEED_POST_CLASS_PATTERN),
+    PROFILE: SoupStrainer("main"),
+}
+
+SELECTORS = {
+    FEED: "div.feed-shared-update-v2",
+    PROFILE: "main",
+}
+
+
+def is_feed_post(node) -> bool:
+    return "feed-shared-update-v2" in (node.attributes.get("class") or "").split()
+
+
+def select_region(html: str, region: str) -> str:
+    """Return the outer HTML of the top-level nodes of a region, using selectolax."""
+    if LexborHTMLParser is None:
+        raise ImportError(
+            "The selectolax parser requires the selectolax package: pip install selectolax"
+        )
+
+    fragments = []
+    for node in LexborHTMLParser(html).css(SELECTORS[region]):
+        parent = node.parent
+        while parent is not None and not (region == FEED and is_feed_post(parent)):
+            parent = parent.parent
+
+        # Nested posts are already part of their enclosing post's HTML.
+        if parent is None:
+            fragments.append(node.html)
+
+    return "".join(fragments)
+
+
+def parse_html(html: str, parser: str = "lxml", region: Optional[str] = None):
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser {parser!r}, expected one of {PARSERS}")
+
+    if parser == "selectolax":
+        if region is None:
+            return BeautifulSoup(html, features="lxml")
+
+        return BeautifulSoup(select_region(html, region), features="lxml")
+
+    if region is None:
+        return BeautifulSoup(html, features=parser)
+
+    return BeautifulSoup(html, features=parser, parse_only=STRAINERS[region])
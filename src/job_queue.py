@@ -0,0 +1,202 @@
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.sqlite_store import SQLiteStore
+
+SEARCH = "search"
+SCRAPE = "scrape"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    stage: str
+    key: str
+    payload: Optional[dict]
+    attempts: int
+
+
+class JobQueue(SQLiteStore):
+    """
+    Durable SQLite queue of jobs connecting the search and scrape stages, so profile
+    URLs flow to the scraper as soon as their search completes and each stage can be
+    stopped and resumed on its own.
+
+    Each job is identified by its stage and key; enqueueing a job that already exists
+    does nothing, so input can be enqueued again on restart. Workers lease jobs for a
+    number of seconds. A job is pending until leased, then done once completed, or
+    pending again when it fails or its lease expires, until it has been attempted
+    max_attempts times and is marked failed. A failed attempt moves the job behind
+    the other pending jobs of its stage, so one bad job isn't retried back to back.
+    Completing a job can enqueue follow-up jobs in the same transaction.
+
+    Leases are taken in IMMEDIATE transactions, so several processes can share a
+    queue file.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        super().__init__(path)
+        self.max_attempts = max_attempts
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                seq INTEGER PRIMARY KEY,
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL,
+                worker TEXT,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (stage, key)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_stage_state ON jobs (stage, state, seq);
+            """
+        )
+
+    def _insert(self, jobs: Iterable[Tuple[str, str, Optional[dict]]]):
+        now = time.time()
+        self.connection.executemany(
+            """
+            INSERT INTO jobs (stage, key, payload, state, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (stage, key) DO NOTHING
+            """,
+            (
+                (stage, key, json.dumps(payload), PENDING, now)
+                for stage, key, payload in jobs
+            ),
+        )
+
+    def enqueue(self, stage: str, key: str, payload: Optional[dict] = None):
+        self.enqueue_many(stage, [(key, payload)])
+
+    def enqueue_many(self, stage: str, jobs: Iterable[Tuple[str, Optional[dict]]]):
+        """Enqueue (key, payload) pairs in one transaction, skipping existing jobs."""
+        with self.transaction():
+            self._insert((stage, key, payload) for key, payload in jobs)
+
+    def lease(
+        self, stage: str, worker: str, seconds: float = 600, limit: int = 1
+    ) -> List[Job]:
+        """Lease up to limit pending jobs of stage, oldest first, for seconds."""
+        now = time.time()
+        with self.transaction("IMMEDIATE"):
+            self.connection.execute(
+                """
+                UPDATE jobs SET state = ?, error = 'lease expired', updated_at = ?
+                WHERE stage = ? AND state = ? AND lease_until < ? AND attempts >= ?
+                """,
+                (FAILED, now, stage, LEASED, now, self.max_attempts),
+            )
+            rows = self.connection.execute(
+                """
+                SELECT seq, key, payload, attempts FROM jobs
+                WHERE stage = ? AND (state = ? OR (state = ? AND lease_until < ?))
+                ORDER BY seq LIMIT ?
+                """,
+                (stage, PENDING, LEASED, now, limit),
+            ).fetchall()
+            self.connection.executemany(
+                """
+                UPDATE jobs SET state = ?, attempts = attempts + 1, lease_until = ?,
+                    worker = ?, updated_at = ?
+                WHERE seq = ?
+                """,
+                [(LEASED, now + seconds, worker, now, seq) for seq, *_ in rows],
+            )
+
+        return [
+            Job(stage, key, json.loads(payload), attempts + 1)
+            for _, key, payload, attempts in rows
+        ]
+
+    def complete(
+        self,
+        stage: str,
+        key: str,
+        result=None,
+        next_jobs: Iterable[Tuple[str, str, Optional[dict]]] = (),
+    ):
+        """Mark a job done and enqueue its (stage, key, payload) follow-up jobs."""
+        with self.transaction():
+            self._set_done(stage, [key], result)
+            self._insert(next_jobs)
+
+    def complete_many(self, stage: str, keys: Iterable[str]):
+        with self.transaction():
+            self._set_done(stage, keys, None)
+
+    def _set_done(self, stage: str, keys: Iterable[str], result):
+        now = time.time()
+        self.connection.executemany(
+            """
+            UPDATE jobs SET state = ?, result = ?, lease_until = NULL, error = NULL,
+                updated_at = ?
+            WHERE stage = ? AND key = ?
+            """,
+            [(DONE, json.dumps(result), now, stage, key) for key in keys],
+        )
+
+    def fail(self, stage: str, key: str, error: str):
+        """
+        Return a job to the back of the queue for a retry, or mark it failed after
+        max_attempts.
+        """
+        with self.transaction():
+            self.connection.execute(
+                """
+                UPDATE jobs
+                SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                    seq = (SELECT MAX(seq) + 1 FROM jobs),
+                    lease_until = NULL, error = ?, updated_at = ?
+                WHERE stage = ? AND key = ?
+                """,
+                (self.max_attempts, FAILED, PENDING, error, time.time(), stage, key),
+            )
+
+    def renew(self, stage: str, key: str, seconds: float):
+        """Extend the lease of a job to seconds from now."""
+        now = time.time()
+        with self.transaction():
+            self.connection.execute(
+                """
+                UPDATE jobs SET lease_until = ?, updated_at = ?
+                WHERE stage = ? AND key = ? AND state = ?
+                """,
+                (now + seconds, now, stage, key, LEASED),
+            )
+
+    def counts(self, stage: str) -> Dict[str, int]:
+        with self.lock:
+            return dict(
+                self.connection.execute(
+                    "SELECT state, COUNT(*) FROM jobs WHERE stage = ? GROUP BY state",
+                    (stage,),
+                ).fetchall()
+            )
+
+    def drained(self, stage: str) -> bool:
+        """
+        Whether stage has jobs and none of them is pending or under an unexpired lease.
+        A stage with no jobs yet is not drained: its producer may not have started.
+        """
+        with self.lock:
+            total, active = self.connection.execute(
+                """
+                SELECT COUNT(*), SUM(state = ? OR (state = ? AND lease_until >= ?))
+                FROM jobs WHERE stage = ?
+                """,
+                (PENDING, LEASED, time.time(), stage),
+            ).fetchone()
+
+        return total > 0 and not active
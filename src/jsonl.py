@@ -0,0 +1,64 @@
+"""
+Reading the append-only JSONL files used for results, journals and indexes, with one
+recovery rule for damaged lines.
+"""
+import json
+import logging
+import os
+from typing import Callable, Iterator, Optional, Tuple
+
+BLOCK_SIZE = 64 * 1024
+
+
+def iter_jsonl(
+    path: str, offset: int = 0, on_error: Optional[Callable[[int], None]] = None
+) -> Iterator[Tuple[int, dict]]:
+    """
+    Yield (end offset, entry) for each line of a JSONL file, from byte offset on.
+
+    A complete line that doesn't decode is logged and skipped, and on_error is called
+    with its end offset. A last line without a trailing newline is an append that was
+    interrupted (or is still being written): it is not yielded, and complete_size
+    gives the size of the file without it.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+
+            start, offset = offset, offset + len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logging.warning(f"Skipping malformed line at byte {start} of {path}")
+                if on_error is not None:
+                    on_error(offset)
+                continue
+
+            yield offset, entry
+
+
+def complete_size(path: str) -> int:
+    """Size of a JSONL file up to and including its last newline."""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - BLOCK_SIZE)
+            f.seek(start)
+            block = f.read(end - start)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+
+    return 0
+
+
+def drop_torn_tail(path: str):
+    """Truncate an interrupted last line, so the next append starts on a new line."""
+    size = complete_size(path)
+    if size < os.path.getsize(path):
+        logging.warning(f"Dropping truncated entry at byte {size} of {path}")
+        with open(path, "r+b") as f:
+            f.truncate(size)
@@ -0,0 +1,492 @@
+"""
+Extraction of profile and post fields from LinkedIn page HTML.
+
+This module has no browser dependencies, so parsing workers, tests and tools that
+work on saved pages can import it without loading Selenium.
+"""
+import json
+import logging
+import re
+from typing import Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+from bs4 import Tag
+
+from src.html_parser import FEED, PROFILE, parse_html
+from src.metrics import ProfileMetrics
+from src.post_age import max_age_days, parse_post_age_days
+from src.records import Post, Profile
+from src.page_scripts import NEW_POSTS_SCRIPT, NEW_POST_FIELDS_SCRIPT
+
+
+LIKES_CLASS = "social-details-social-counts__reactions-count"
+REPOSTS_CLASS = "social-details-social-counts__link"
+COMMENTS_CLASS = "social-details-social-counts__comments"
+TEXT_CLASS = "feed-shared-inline-show-more-text"
+TEXT_SPAN_CLASS = "break-words"
+POST_AGE_CLASS = "update-components-actor__sub-description-link"
+REPOST_WRAPPER_CLASS = "feed-shared-update-v2__update-content-wrapper"
+VIDEO_CLASS = "update-components-linkedin-video"
+IMAGE_CLASS = "update-components-image"
+ARTICLE_CLASS = "update-components-article"
+
+LIKES_PATTERN = re.compile(LIKES_CLASS)
+REPOSTS_PATTERN = re.compile(REPOSTS_CLASS)
+COMMENTS_PATTERN = re.compile(COMMENTS_CLASS)
+TEXT_PATTERN = re.compile(TEXT_CLASS)
+TEXT_SPAN_PATTERN = re.compile(TEXT_SPAN_CLASS)
+POST_AGE_PATTERN = re.compile(POST_AGE_CLASS)
+ARTICLE_PATTERN = re.compile(ARTICLE_CLASS)
+ABOUT_THIS_PROFILE_PATTERN = re.compile(
+    r"/in/[a-zA-Z0-9\-]+/overlay/about-this-profile/.*"
+)
+
+
+def has_class_fragment(classes, fragment: str) -> bool:
+    """Mirror BeautifulSoup's ``class_=re.compile(fragment)`` matching."""
+    return any(fragment in c for c in classes)
+
+
+class FeedReader:
+    """
+    Incrementally extracts posts from an activity feed as it grows during scrolling.
+
+    Every post is parsed and extracted once: the browser hands over only the
+    feed-shared-update-v2 nodes it has not handed over before, and the reader skips
+    any data-urn it has already seen.
+
+    extraction selects how posts are extracted: "soup" parses the post HTML with
+    BeautifulSoup, "script" extracts the fields inside the page, and "verify" does
+    both, logging any difference and keeping the BeautifulSoup records.
+
+    For incremental refreshes, known_post_ids holds the posts already scraped. Only
+    the first refresh_window known posts are kept (to update their engagement counts),
+    later ones are counted in known_seen but not extracted.
+    """
+
+    def __init__(
+        self,
+        parser: str = "lxml",
+        extraction: str = "soup",
+        metrics: Optional[ProfileMetrics] = None,
+        known_post_ids: Optional[Set[str]] = None,
+        refresh_window: int = 0,
+    ):
+        self.parser = parser
+        self.extraction = extraction
+        self.metrics = metrics or ProfileMetrics()
+        self.known_post_ids = known_post_ids or set()
+        self.refresh_window = refresh_window
+        self.known_seen = 0
+        self.seen_urns = set()
+        self.records: List[dict] = []
+
+    def accept(self, urn: str) -> bool:
+        """Whether a post should be extracted, marking it as seen."""
+        if urn in self.seen_urns:
+            return False
+
+        self.seen_urns.add(urn)
+        if urn in self.known_post_ids:
+            self.known_seen += 1
+            return self.known_seen <= self.refresh_window
+
+        return True
+
+    def add_records(self, records: Iterable[dict]) -> List[dict]:
+        new_records = []
+        for record in records:
+            if self.accept(record["post_id"]):
+                new_records.append(record)
+
+        self.records.extend(new_records)
+        return new_records
+
+    def add_posts(self, posts) -> List[dict]:
+        new_records = []
+        with self.metrics.phase("extract"):
+            for post in posts:
+                if self.accept(post.get("data-urn")):
+                    new_records.append(LinkedinParser.extract_post(post))
+
+        self.records.extend(new_records)
+        self.metrics.count("posts", len(new_records))
+        return new_records
+
+    def add_fragments(self, fragments: Iterable[str]) -> List[dict]:
+        html = "".join(fragments)
+        if not html:
+            return []
+
+        with self.metrics.phase("parse"):
+            soup = parse_html(html, self.parser, FEED)
+            posts = LinkedinParser.find_posts(soup)
+
+        try:
+            return self.add_posts(posts)
+        finally:
+            # Records hold plain strings, so the tree can be freed now instead of
+            # waiting for the cyclic garbage collector.
+            soup.decompose()
+
+    def add_page(self, soup) -> List[dict]:
+        return self.add_posts(LinkedinParser.find_posts(soup))
+
+    def read(self, driver) -> List[dict]:
+        if self.extraction == "soup":
+            with self.metrics.phase("script"):
+                fragments = driver.execute_script(NEW_POSTS_SCRIPT)
+
+            self.metrics.count("html_chars", sum(len(html) for html in fragments))
+            return self.add_fragments(fragments)
+
+        with self.metrics.phase("script"):
+            response = driver.execute_script(
+                NEW_POST_FIELDS_SCRIPT, self.extraction == "verify"
+            )
+
+        self.metrics.count("html_chars", len(response))
+        posts = json.loads(response)
+        if self.extraction == "script":
+            with self.metrics.phase("extract"):
+                records = [
+                    LinkedinParser.post_from_script(fields) for fields in posts
+                ]
+
+            new_records = self.add_records(records)
+            self.metrics.count("posts", len(new_records))
+            return new_records
+
+        new_records = self.add_fragments(fields["html"] for fields in posts)
+        soup_records = {record["post_id"]: record for record in new_records}
+        for fields in posts:
+            record = soup_records.get(fields["post_id"])
+            if record is not None:
+                LinkedinParser.check_parity(
+                    fields["post_id"], LinkedinParser.post_from_script(fields), record
+                )
+
+        return new_records
+
+    @property
+    def last_post_age_days(self) -> Optional[float]:
+        if not self.records:
+            return None
+
+        return self.records[-1]["post_age_days"]
+
+
+class LinkedinParser:
+    @staticmethod
+    def int_cast(s: str) -> int:
+        return int(s.strip().replace(",", ""))
+
+    @staticmethod
+    def find_posts(soup):
+        return soup.find_all("div", class_="feed-shared-update-v2")
+
+    @staticmethod
+    def extract_post_age(post):
+        post_age = post.find(
+            "a",
+            class_=POST_AGE_PATTERN,
+        )
+        return post_age.find_all("span")[-1].text.strip()
+
+    @staticmethod
+    def extract_likes(post) -> int:
+        likes = post.find(
+            "span",
+            class_=LIKES_PATTERN,
+        )
+        if likes:
+            return LinkedinParser.int_cast(likes.text)
+        else:
+            return 0
+
+    @staticmethod
+    def extract_reposts(post) -> int:
+        for element in post.find_all(
+            "button",
+            class_=REPOSTS_PATTERN,
+        ):
+            if "repost" in element.text:
+                return LinkedinParser.int_cast(element.text.strip().split()[0])
+
+        return 0
+
+    @staticmethod
+    def extract_comments(post) -> int:
+        reposts = post.find(
+            "li",
+            class_=COMMENTS_PATTERN,
+        )
+        if reposts:
+            return LinkedinParser.int_cast(reposts.text.strip().split()[0])
+        else:
+            return 0
+
+    @staticmethod
+    def extract_text(post) -> str:
+        text = post.find("div", class_=TEXT_PATTERN)
+        if text:
+            return text.find("span", class_=TEXT_SPAN_PATTERN).text.strip()
+        else:
+            return ""
+
+    @staticmethod
+    def extract_is_repost(post) -> bool:
+        return (
+            post.find("div", class_=REPOST_WRAPPER_CLASS) is not None
+        )
+
+    @staticmethod
+    def extract_post_type(post) -> str:
+        if post.find("div", class_=VIDEO_CLASS) is not None:
+            return "Video"
+        elif post.find("div", class_=IMAGE_CLASS) is not None:
+            return "Image"
+        elif post.find("div", class_=ARTICLE_PATTERN) is not None:
+            return "Article"
+        else:
+            return "Text"
+
+    @staticmethod
+    def extract_followers(soup) -> int:
+        for span in soup.find_all("span"):
+            if span.get_text(strip=True).endswith("followers"):
+                return LinkedinParser.int_cast(
+                    span.get_text(strip=True).split()[0]
+                )
+
+        return 0
+
+    @staticmethod
+    def extract_name(soup) -> str:
+        return soup.find("a", href=ABOUT_THIS_PROFILE_PATTERN).text.strip()
+
+    @staticmethod
+    def extract_mini_bio(soup) -> str:
+        return soup.find("div", class_="text-body-medium break-words").text.strip()
+
+    @staticmethod
+    def extract_post_id(soup) -> str:
+        return soup["data-urn"]
+
+    @staticmethod
+    def extract_linkedin_profile(url: str) -> Optional[str]:
+        if "linkedin.com/in/" in url:
+            parsed_url = urlparse(url)
+            path_components = parsed_url.path.split("/")
+            username_index = path_components.index("in") + 1
+
+            if path_components[username_index]:
+                return (
+                    parsed_url.scheme
+                    + "://"
+                    + parsed_url.netloc
+                    + "/".join(path_components[: username_index + 1])
+                )
+
+    @staticmethod
+    def parse_post_age_years(post_age: str):
+        if "year" not in post_age:
+            return False
+
+        return int(post_age.split()[0])
+
+    @staticmethod
+    def extract_post_age_years(post):
+        return LinkedinParser.parse_post_age_years(
+            LinkedinParser.extract_post_age(post)
+        )
+
+    @staticmethod
+    def extract_post(post) -> dict:
+        """
+        Extract every post field in a single walk over the post subtree.
+
+        Produces the same values as calling each extract_* method on the post, but
+        the subtree is traversed once instead of once per field. Only the small
+        text and post-age elements found during the walk are searched again.
+        """
+        likes = reposts = comments = text = post_age = None
+        is_repost = has_video = has_image = has_article = False
+
+        for element in post.descendants:
+            if not isinstance(element, Tag):
+                continue
+
+            classes = element.get("class")
+            if not classes:
+                continue
+
+            if element.name == "div":
+                if text is None and has_class_fragment(classes, TEXT_CLASS):
+                    text = element
+                is_repost = is_repost or REPOST_WRAPPER_CLASS in classes
+                has_video = has_video or VIDEO_CLASS in classes
+                has_image = has_image or IMAGE_CLASS in classes
+                has_article = has_article or has_class_fragment(classes, ARTICLE_CLASS)
+            elif element.name == "span":
+                if likes is None and has_class_fragment(classes, LIKES_CLASS):
+                    likes = element
+            elif element.name == "button":
+                if (
+                    reposts is None
+                    and has_class_fragment(classes, REPOSTS_CLASS)
+                    and "repost" in element.text
+                ):
+                    reposts = element
+            elif element.name == "li":
+                if comments is None and has_class_fragment(classes, COMMENTS_CLASS):
+                    comments = element
+            elif element.name == "a":
+                if post_age is None and has_class_fragment(classes, POST_AGE_CLASS):
+                    post_age = element
+
+        int_cast = LinkedinParser.int_cast
+        age = post_age.find_all("span")[-1].text.strip()
+        return {
+            "likes": int_cast(likes.text) if likes else 0,
+            "reposts": int_cast(reposts.text.strip().split()[0]) if reposts else 0,
+            "comments": int_cast(comments.text.strip().split()[0]) if comments else 0,
+            "post_age": age,
+            "post_age_days": parse_post_age_days(age),
+            "text": (
+                text.find("span", class_=TEXT_SPAN_PATTERN).text.strip() if text else ""
+            ),
+            "is_repost": is_repost,
+            "post_type": LinkedinParser.post_type_from_flags(
+                has_video, has_image, has_article
+            ),
+            "post_id": LinkedinParser.extract_post_id(post),
+        }
+
+    @staticmethod
+    def extract_posts(posts) -> list:
+        return [LinkedinParser.extract_post(post) for post in posts]
+
+    @staticmethod
+    def post_type_from_flags(has_video: bool, has_image: bool, has_article: bool):
+        if has_video:
+            return "Video"
+        elif has_image:
+            return "Image"
+        elif has_article:
+            return "Article"
+        else:
+            return "Text"
+
+    @staticmethod
+    def post_from_script(fields: dict) -> dict:
+        """Convert the raw fields returned by NEW_POST_FIELDS_SCRIPT into a post record."""
+        int_cast = LinkedinParser.int_cast
+        likes, reposts, comments = fields["likes"], fields["reposts"], fields["comments"]
+        return {
+            "likes": int_cast(likes) if likes is not None else 0,
+            "reposts": int_cast(reposts.strip().split()[0]) if reposts is not None else 0,
+            "comments": (
+                int_cast(comments.strip().split()[0]) if comments is not None else 0
+            ),
+            "post_age": fields["post_age"].strip(),
+            "post_age_days": parse_post_age_days(fields["post_age"]),
+            "text": fields["text"].strip(),
+            "is_repost": fields["is_repost"],
+            "post_type": LinkedinParser.post_type_from_flags(
+                fields["has_video"], fields["has_image"], fields["has_article"]
+            ),
+            "post_id": fields["post_id"],
+        }
+
+    @staticmethod
+    def extract_profile(soup) -> dict:
+        return {
+            "name": LinkedinParser.extract_name(soup),
+            "bio": LinkedinParser.extract_mini_bio(soup),
+            "followers": LinkedinParser.extract_followers(soup),
+        }
+
+    @staticmethod
+    def profile_from_script(fields: dict) -> dict:
+        """Convert the raw fields returned by PROFILE_FIELDS_SCRIPT into profile fields."""
+        followers = fields["followers"]
+        return {
+            "name": fields["name"].strip(),
+            "bio": fields["bio"].strip(),
+            "followers": (
+                LinkedinParser.int_cast(followers.split()[0])
+                if followers is not None
+                else 0
+            ),
+        }
+
+    @staticmethod
+    def check_parity(label: str, script_fields: dict, soup_fields: dict) -> bool:
+        mismatches = {
+            key: (script_fields.get(key), value)
+            for key, value in soup_fields.items()
+            if script_fields.get(key) != value
+        }
+        if mismatches:
+            logging.warning(
+                f"In-page extraction differs from BeautifulSoup for {label}: {mismatches}"
+            )
+
+        return not mismatches
+
+    @staticmethod
+    def build_profile(
+        url: str,
+        profile: dict,
+        records: List[dict],
+        max_post_age_years: int,
+        max_posts: int,
+        max_post_age_days: Optional[float] = None,
+    ) -> Profile:
+        limit = max_age_days(max_post_age_years, max_post_age_days)
+        return Profile(
+            url,
+            **profile,
+            posts=[
+                Post(**record)
+                for record in records[:max_posts]
+                if (record["post_age_days"] or 0) <= limit
+            ],
+        )
+
+    @staticmethod
+    def build_rows(
+        url: str,
+        profile: dict,
+        records: List[dict],
+        max_post_age_years: int,
+        max_posts: int,
+        max_post_age_days: Optional[float] = None,
+    ) -> List[dict]:
+        return LinkedinParser.build_profile(
+            url, profile, records, max_post_age_years, max_posts, max_post_age_days
+        ).rows()
+
+    @staticmethod
+    def extract_snapshot(
+        url: str,
+        profile_html: str,
+        activity_html: str,
+        max_post_age_years: int = 5,
+        max_posts: int = 30,
+        parser: str = "lxml",
+        max_post_age_days: Optional[float] = None,
+    ) -> List[dict]:
+        """Build the rows scrape_profile returns from saved profile and activity pages."""
+        profile_soup = parse_html(profile_html, parser, PROFILE)
+        profile = LinkedinParser.extract_profile(profile_soup)
+        profile_soup.decompose()
+
+        activity_soup = parse_html(activity_html, parser, FEED)
+        records = LinkedinParser.extract_posts(LinkedinParser.find_posts(activity_soup))
+        activity_soup.decompose()
+
+        return LinkedinParser.build_rows(
+            url, profile, records, max_post_age_years, max_posts, max_post_age_days
+        )
@@ -3,34 +3,75 @@ import pickle
 import random
 import logging
 import time
-import re
-from typing import Optional
-from urllib.parse import urlparse
+import json
+from typing import Callable, Optional, Set
 
-from selenium import webdriver
-import undetected_chromedriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
+from src.browser import cached_driver_path
+from src.html_parser import PROFILE, parse_html
+from src.linkedin_parser import FeedReader, LinkedinParser
+from src.metrics import ProfileMetrics
+from src.post_age import max_age_days
+from src.records import Profile
+from src.snapshot_archive import SnapshotArchive
+from src.page_scripts import PROFILE_FIELDS_SCRIPT
 
-logging.basicConfig(
-    format="%(asctime)s %(levelname)-8s %(message)s",
-    level=logging.INFO,
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
 
+class LinkedinPostScraper(LinkedinParser):
+    """
+    Scrapes profiles in a Chrome session logged in to LinkedIn.
+
+    The extractors are inherited from LinkedinParser. Selenium and
+    undetected_chromedriver are only imported when a browser is started.
+    """
 
-class LinkedinPostScraper:
     COOKIES_FILE_PATH = "/tmp/linkedin_cookies.pkl"
+    LOGIN_URL = "https://www.linkedin.com/login"
+    FEED_URL = "https://www.linkedin.com/feed"
 
     def __init__(
         self,
-        email: str,
-        password: str,
-        chrome_version: int,
+        email: Optional[str] = None,
+        password: Optional[str] = None,
+        chrome_version: Optional[int] = None,
         headless: bool = False,
+        extraction: str = "soup",
+        parser: str = "lxml",
+        driver=None,
+        sleep: Callable[[float], None] = time.sleep,
+        profile_dir: Optional[str] = None,
+        driver_cache_dir: Optional[str] = None,
     ):
+        """
+        extraction selects how profile and post fields are read from the page:
+        "soup" parses the page HTML with BeautifulSoup, "script" extracts the fields
+        inside the browser with page_scripts and transfers only compact JSON, and
+        "verify" runs both and logs any difference, keeping the BeautifulSoup values.
+
+        parser is the html_parser backend used to parse page HTML.
+
+        A driver that is already logged in, or a stand-in such as
+        tests.fake_driver.FakeDriver, can be passed instead of starting Chrome. It needs
+        get, page_source, execute_script and quit. sleep is called for every pause of
+        the scrape loop; pass a no-op to run the loop without waiting.
+
+        For a warm start, profile_dir is a Chrome user data directory kept between
+        launches, so the LinkedIn session survives relaunches, and driver_cache_dir
+        keeps a patched chromedriver for chrome_version instead of downloading one on
+        every launch. Launch and login times are logged and kept in startup_timings.
+        """
+        self.extraction = extraction
+        self.parser = parser
+        self.sleep = sleep
+
+        if driver is not None:
+            self.driver = driver
+            return
+
+        import undetected_chromedriver
+        from selenium import webdriver
+
+        started = time.perf_counter()
+
         chrome_options = webdriver.ChromeOptions()
         chrome_options.add_argument("--log-level=3")
         chrome_options.add_argument("--start-maximized")
@@ -41,20 +82,40 @@ class LinkedinPostScraper:
             )
             chrome_options.add_argument("--headless")
 
+        driver_path = None
+        if driver_cache_dir and chrome_version:
+            driver_path = cached_driver_path(chrome_version, driver_cache_dir)
+
         self.driver = undetected_chromedriver.Chrome(
-            options=chrome_options, version_main=chrome_version
+            options=chrome_options,
+            version_main=chrome_version,
+            user_data_dir=profile_dir,
+            driver_executable_path=driver_path,
+        )
+        launched = time.perf_counter()
+        session = self.login(email, password)
+
+        self.startup_timings = {
+            "launch_s": launched - started,
+            "login_s": time.perf_counter() - launched,
+            "session": session,
+        }
+        logging.info(
+            f"Browser ready in {time.perf_counter() - started:.1f}s "
+            f"(launch {self.startup_timings['launch_s']:.1f}s, "
+            f"login {self.startup_timings['login_s']:.1f}s, session from {session})"
         )
-        self.login(email, password)
 
-    def login(self, email: str, password: str):
-        self.driver.get("https://www.linkedin.com/login")
+    def session_active(self) -> bool:
+        """Open the feed directly, LinkedIn redirects it to a login page if logged out."""
+        self.driver.get(self.FEED_URL)
+        return self.driver.current_url.startswith(self.FEED_URL)
 
-        email_field = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located((By.ID, "username"))
-        )
-        password_field = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located((By.ID, "password"))
-        )
+    def login(self, email: str, password: str) -> str:
+        """Log in unless already logged in. Returns where the session came from."""
+        if self.session_active():
+            logging.info("Already logged in, reusing the browser profile's session.")
+            return "profile"
 
         if os.path.exists(self.COOKIES_FILE_PATH):
             try:
@@ -63,204 +124,163 @@ class LinkedinPostScraper:
                 )
 
                 self.load_cookies_to_session()
-
-                WebDriverWait(self.driver, 3).until(
-                    EC.url_matches("https://www.linkedin.com/feed")
-                )
-                return
+                if self.session_active():
+                    return "cookies"
             except Exception as e:
-                logging.info("Cookies expired, logging in with email and password.")
+                logging.info(f"Could not restore the session from cookies: {e}")
+
+            logging.info("Cookies expired, logging in with email and password.")
+
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.driver.get(self.LOGIN_URL)
+
+        email_field = WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.ID, "username"))
+        )
+        password_field = WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.ID, "password"))
+        )
 
         email_field.send_keys(email)
         password_field.send_keys(password)
 
         password_field.submit()
 
-        WebDriverWait(self.driver, 60).until(
-            EC.url_matches("https://www.linkedin.com/feed")
-        )
+        WebDriverWait(self.driver, 60).until(EC.url_matches(self.FEED_URL))
 
         self.save_cookies()
+        return "password"
 
     def load_cookies_to_session(self):
         for cookie in pickle.load(open(self.COOKIES_FILE_PATH, "rb")):
             self.driver.add_cookie(cookie)
 
-        self.driver.refresh()
-
     def save_cookies(self):
         cookies = self.driver.get_cookies()
         pickle.dump(cookies, open(self.COOKIES_FILE_PATH, "wb"))
 
-    @staticmethod
-    def int_cast(s: str) -> int:
-        return int(s.strip().replace(",", ""))
+    def wait(self, seconds: float, metrics: ProfileMetrics):
+        with metrics.phase("wait"):
+            self.sleep(seconds)
 
-    @staticmethod
-    def find_posts(soup):
-        return soup.find_all("div", class_="feed-shared-update-v2")
-
-    @staticmethod
-    def extract_post_age(post):
-        post_age = post.find(
-            "a",
-            class_=re.compile("update-components-actor__sub-description-link"),
-        )
-        return post_age.find_all("span")[-1].text.strip()
-
-    @staticmethod
-    def extract_likes(post) -> int:
-        likes = post.find(
-            "span",
-            class_=re.compile("social-details-social-counts__reactions-count"),
-        )
-        if likes:
-            return LinkedinPostScraper.int_cast(likes.text)
-        else:
-            return 0
-
-    @staticmethod
-    def extract_reposts(post) -> int:
-        for element in post.find_all(
-            "button",
-            class_=re.compile("social-details-social-counts__link"),
-        ):
-            if "repost" in element.text:
-                return LinkedinPostScraper.int_cast(element.text.strip().split()[0])
-
-        return 0
-
-    @staticmethod
-    def extract_comments(post) -> int:
-        reposts = post.find(
-            "li",
-            class_=re.compile("social-details-social-counts__comments"),
-        )
-        if reposts:
-            return LinkedinPostScraper.int_cast(reposts.text.strip().split()[0])
-        else:
-            return 0
-
-    @staticmethod
-    def extract_text(post) -> str:
-        text = post.find("div", class_=re.compile("feed-shared-inline-show-more-text"))
-        if text:
-            return text.find("span", class_=re.compile("break-words")).text.strip()
-        else:
-            return ""
-
-    @staticmethod
-    def extract_is_repost(post) -> bool:
-        return (
-            post.find("div", class_="feed-shared-update-v2__update-content-wrapper")
-            is not None
-        )
+    def page_source(self, metrics: ProfileMetrics) -> str:
+        with metrics.phase("page_source"):
+            html = self.driver.page_source
 
-    @staticmethod
-    def extract_post_type(post) -> str:
-        if post.find("div", class_="update-components-linkedin-video") is not None:
-            return "Video"
-        elif post.find("div", class_="update-components-image") is not None:
-            return "Image"
-        elif (
-            post.find("div", class_=re.compile("update-components-article")) is not None
-        ):
-            return "Article"
-        else:
-            return "Text"
-
-    @staticmethod
-    def extract_followers(soup) -> int:
-        for span in soup.find_all("span"):
-            if span.get_text(strip=True).endswith("followers"):
-                return LinkedinPostScraper.int_cast(
-                    span.get_text(strip=True).split()[0]
-                )
+        metrics.count("html_chars", len(html))
+        return html
 
-        return 0
-
-    @staticmethod
-    def extract_name(soup) -> str:
-        pattern = re.compile(r"/in/[a-zA-Z0-9\-]+/overlay/about-this-profile/.*")
-        return soup.find("a", href=pattern).text.strip()
-
-    @staticmethod
-    def extract_mini_bio(soup) -> str:
-        return soup.find("div", class_="text-body-medium break-words").text.strip()
-
-    @staticmethod
-    def extract_post_id(soup) -> str:
-        return soup["data-urn"]
-
-    @staticmethod
-    def extract_linkedin_profile(url: str) -> Optional[str]:
-        if "linkedin.com/in/" in url:
-            parsed_url = urlparse(url)
-            path_components = parsed_url.path.split("/")
-            username_index = path_components.index("in") + 1
-
-            if path_components[username_index]:
-                return (
-                    parsed_url.scheme
-                    + "://"
-                    + parsed_url.netloc
-                    + "/".join(path_components[: username_index + 1])
-                )
+    def profile_from_page(self, metrics: ProfileMetrics) -> dict:
+        with metrics.phase("script"):
+            response = self.driver.execute_script(PROFILE_FIELDS_SCRIPT)
 
-    @staticmethod
-    def extract_post_age_years(post):
-        post_age = LinkedinPostScraper.extract_post_age(post)
+        metrics.count("html_chars", len(response))
+        return LinkedinPostScraper.profile_from_script(json.loads(response))
 
-        if "year" not in post_age:
-            return False
+    def read_profile(
+        self,
+        url: str,
+        html: Optional[str] = None,
+        metrics: Optional[ProfileMetrics] = None,
+    ) -> dict:
+        metrics = metrics or ProfileMetrics(url)
+
+        if self.extraction == "script":
+            return self.profile_from_page(metrics)
+
+        html = html or self.page_source(metrics)
+        with metrics.phase("parse"):
+            soup = parse_html(html, self.parser, PROFILE)
+
+        with metrics.phase("extract"):
+            profile = LinkedinPostScraper.extract_profile(soup)
+            soup.decompose()
+
+        if self.extraction == "verify":
+            LinkedinPostScraper.check_parity(
+                url, self.profile_from_page(metrics), profile
+            )
 
-        return int(post_age.split()[0])
+        return profile
 
     def scrape_profile(
-        self, url: str, max_post_age_years: int = 5, max_posts: int = 30
-    ):
-        self.driver.get(url)
-        time.sleep(3)
-        soup = BeautifulSoup(self.driver.page_source, features="lxml")
-
-        followers = LinkedinPostScraper.extract_followers(soup)
-        name = LinkedinPostScraper.extract_name(soup)
-        bio = LinkedinPostScraper.extract_mini_bio(soup)
-
-        time.sleep(random.uniform(3, 6))
-
-        self.driver.get(url + "/recent-activity/all/")
-        time.sleep(random.uniform(4, 6))
-
+        self,
+        url: str,
+        max_post_age_years: int = 5,
+        max_posts: int = 30,
+        archive: Optional[SnapshotArchive] = None,
+        metrics: Optional[ProfileMetrics] = None,
+        known_post_ids: Optional[Set[str]] = None,
+        refresh_window: int = 10,
+        max_post_age_days: Optional[float] = None,
+    ) -> Profile:
+        """
+        If an archive is given, the profile page and the final activity page are saved
+        to it so the rows can be rebuilt later with extract_snapshot.
+
+        Posts older than max_post_age_days, or max_post_age_years if that is not given,
+        are dropped, and scrolling stops once the last post read is that old.
+
+        Time spent per phase and scroll/byte counters are added to metrics if given.
+
+        Given the known_post_ids of an earlier scrape, the profile is refreshed
+        incrementally: scrolling stops once refresh_window known posts have been
+        reached, and only new posts plus those refresh_window most recent known posts
+        are returned.
+        """
+        metrics = metrics or ProfileMetrics(url)
+        age_limit = max_age_days(max_post_age_years, max_post_age_days)
+        captured_at = time.time()
+        with metrics.phase("page_load"):
+            self.driver.get(url)
+        self.wait(3, metrics)
+
+        profile_html = None
+        if archive is not None:
+            profile_html = self.page_source(metrics)
+            archive.put(url, SnapshotArchive.PROFILE, profile_html, captured_at)
+
+        profile = self.read_profile(url, profile_html, metrics)
+
+        self.wait(random.uniform(3, 6), metrics)
+
+        with metrics.phase("page_load"):
+            self.driver.get(url + "/recent-activity/all/")
+        self.wait(random.uniform(4, 6), metrics)
+
+        feed = FeedReader(
+            parser=self.parser,
+            extraction=self.extraction,
+            metrics=metrics,
+            known_post_ids=known_post_ids,
+            refresh_window=refresh_window,
+        )
         scroll_height = 0
         while True:
+            metrics.count("scroll_iterations")
             total_height = int(
                 self.driver.execute_script("return document.body.scrollHeight")
             )
 
-            soup = BeautifulSoup(self.driver.page_source, features="lxml")
-            posts = LinkedinPostScraper.find_posts(soup)
+            feed.read(self.driver)
 
-            if not posts:
+            if not feed.seen_urns:
                 logging.info("No posts found...")
-                return [
-                    {
-                        "profile_url": url,
-                        "name": name,
-                        "bio": bio,
-                        "followers": followers,
-                    }
-                ]
-
-            if len(posts) > max_posts:
+                break
+
+            if known_post_ids and feed.known_seen > refresh_window:
+                logging.info("Reached already scraped posts...")
+                break
+
+            if len(feed.records) > max_posts:
                 logging.info("Max posts reached...")
                 break
 
-            if (
-                LinkedinPostScraper.extract_post_age_years(posts[-1])
-                >= max_post_age_years
-            ):
-                logging.info("Post ages exceed max-post-age-years...")
+            if (feed.last_post_age_days or 0) >= age_limit:
+                logging.info("Post ages exceed the max post age...")
                 break
 
             if total_height == scroll_height:
@@ -269,23 +289,13 @@ class LinkedinPostScraper:
 
             scroll_height = total_height
             self.driver.execute_script(f"window.scrollTo(0, {total_height});")
-            time.sleep(random.uniform(5, 6))
-
-        return [
-            {
-                "profile_url": url,
-                "name": name,
-                "bio": bio,
-                "followers": followers,
-                "likes": LinkedinPostScraper.extract_likes(post),
-                "reposts": LinkedinPostScraper.extract_reposts(post),
-                "comments": LinkedinPostScraper.extract_comments(post),
-                "post_age": LinkedinPostScraper.extract_post_age(post),
-                "text": LinkedinPostScraper.extract_text(post),
-                "is_repost": LinkedinPostScraper.extract_is_repost(post),
-                "post_type": LinkedinPostScraper.extract_post_type(post),
-                "post_id": LinkedinPostScraper.extract_post_id(post),
-            }
-            for post in posts[:max_posts]
-            if self.extract_post_age_years(post) <= max_post_age_years
-        ]
+            self.wait(random.uniform(5, 6), metrics)
+
+        if archive is not None:
+            archive.put(
+                url, SnapshotArchive.ACTIVITY, self.page_source(metrics), captured_at
+            )
+
+        return LinkedinPostScraper.build_profile(
+            url, profile, feed.records, max_post_age_years, max_posts, max_post_age_days
+        )
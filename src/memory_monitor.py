@@ -0,0 +1,139 @@
+"""
+Memory instrumentation for long scrape runs: resident set size of the scraper and
+of the browser processes it started, and optional tracemalloc allocation reports.
+"""
+import logging
+import os
+import tracemalloc
+from typing import Dict, List, Optional
+
+from src.metrics import ProfileMetrics
+
+MB = 1024 * 1024
+
+
+def rss_bytes(pid="self") -> Optional[int]:
+    """Current RSS of a process from /proc, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def child_pids() -> Dict[int, List[int]]:
+    """Map of parent pid to child pids, read from /proc/*/stat."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name can contain spaces, the fields after it can't.
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    return children
+
+
+def psutil_tree_rss_bytes() -> Optional[int]:
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            # The child exited in the meantime.
+            continue
+
+    return total
+
+
+def process_tree_rss_bytes() -> Optional[int]:
+    """
+    Current RSS of this process and all its descendants (chromedriver and Chrome).
+
+    Read from /proc or, where there is none (e.g. macOS), with psutil if it is
+    installed. None if neither is available.
+    """
+    own = rss_bytes()
+    if own is None:
+        return psutil_tree_rss_bytes()
+
+    total = own
+    children = child_pids()
+    pending = list(children.get(os.getpid(), []))
+    while pending:
+        pid = pending.pop()
+        total += rss_bytes(pid) or 0
+        pending.extend(children.get(pid, []))
+
+    return total
+
+
+class MemoryMonitor:
+    """
+    Samples memory use once per profile into its ProfileMetrics gauges: rss_mb for
+    the scraper process and tree_rss_mb including the browser.
+
+    With trace, tracemalloc also records Python allocations: traced_mb and
+    traced_peak_mb are sampled too, and report_top logs the top allocation sites by
+    growth since the previous report.
+    """
+
+    def __init__(self, trace: bool = False, top: int = 10):
+        self.trace = trace
+        self.top = top
+        self.snapshot = None
+        if trace:
+            tracemalloc.start()
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def tree_rss_mb(self) -> Optional[float]:
+        tree_rss = process_tree_rss_bytes()
+        return tree_rss / MB if tree_rss is not None else None
+
+    def sample(self, metrics: ProfileMetrics) -> Optional[float]:
+        """Record memory gauges on metrics and return tree_rss_mb."""
+        own = rss_bytes()
+        tree_rss_mb = self.tree_rss_mb()
+        if own is not None:
+            metrics.gauge("rss_mb", own / MB)
+        if tree_rss_mb is not None:
+            metrics.gauge("tree_rss_mb", tree_rss_mb)
+
+        if self.trace:
+            current, peak = tracemalloc.get_traced_memory()
+            metrics.gauge("traced_mb", current / MB)
+            metrics.gauge("traced_peak_mb", peak / MB)
+            tracemalloc.reset_peak()
+
+        return tree_rss_mb
+
+    def report_top(self) -> List[str]:
+        if not self.trace:
+            return []
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        lines = [str(stat) for stat in snapshot.compare_to(self.snapshot, "lineno")]
+        lines = lines[: self.top]
+        self.snapshot = snapshot
+
+        logging.info(f"Top {len(lines)} allocation sites by growth:")
+        for line in lines:
+            logging.info(f"  {line}")
+
+        return lines
+
+    def stop(self):
+        if self.trace:
+            tracemalloc.stop()
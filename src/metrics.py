@@ -0,0 +1,115 @@
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+PERCENTILES = (50, 90, 99)
+
+
+class ProfileMetrics:
+    """
+    Wall time per phase and counters for scraping one profile.
+
+    Phases used by the scraper: page_load, wait, page_source, script, parse, extract,
+    save and pause. Counters: scroll_iterations, html_chars (characters of page HTML
+    and script responses read from the browser) and posts. Gauges hold point-in-time
+    values such as memory use, sampled once per profile.
+    """
+
+    def __init__(self, profile_url: Optional[str] = None):
+        self.profile_url = profile_url
+        self.phases: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.gauges: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.status = "ok"
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def as_record(self) -> dict:
+        return {
+            "profile_url": self.profile_url,
+            "status": self.status,
+            "timestamp": time.time(),
+            "wall_s": time.perf_counter() - self.started,
+            "phases": dict(self.phases),
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+        }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linearly interpolated percentile of values, q between 0 and 100."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class MetricsRecorder:
+    """Collects ProfileMetrics records, appending each to a JSONL file if a path is given."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.records: List[dict] = []
+
+    def record(self, metrics: ProfileMetrics) -> dict:
+        record = metrics.as_record()
+        self.records.append(record)
+
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+        return record
+
+    def summary(self) -> dict:
+        series = defaultdict(list)
+        gauges = defaultdict(list)
+        for record in self.records:
+            series["wall_s"].append(record["wall_s"])
+            for name, seconds in record["phases"].items():
+                series[f"{name}_s"].append(seconds)
+            for name, count in record["counters"].items():
+                series[name].append(count)
+            for name, value in record.get("gauges", {}).items():
+                gauges[name].append(value)
+
+        return {
+            "profiles": len(self.records),
+            "failed": sum(record["status"] != "ok" for record in self.records),
+            "totals": {name: sum(values) for name, values in series.items()},
+            "percentiles": {
+                name: {f"p{q}": percentile(values, q) for q in PERCENTILES}
+                for name, values in {**series, **gauges}.items()
+            },
+        }
+
+    def log_summary(self):
+        if not self.records:
+            return
+
+        summary = self.summary()
+        logging.info(
+            f"Scraped {summary['profiles']} profiles ({summary['failed']} failed)"
+        )
+        for name, values in sorted(summary["percentiles"].items()):
+            quantiles = " ".join(f"{q}={value:.2f}" for q, value in values.items())
+            total = summary["totals"].get(name)
+            total = f"total={total:.2f} " if total is not None else ""
+            logging.info(f"{name:<20} {total}{quantiles}")
@@ -0,0 +1,96 @@
+"""
+JavaScript run inside the LinkedIn page through driver.execute_script.
+
+The scripts locate the same elements as the BeautifulSoup extractors in
+linkedin_parser.py and return their raw text as a JSON string. Casting and
+cleanup stay in Python (LinkedinParser.post_from_script and
+profile_from_script) so both extraction paths share one set of conversion rules.
+"""
+
+# Returns the outerHTML of feed posts not yet returned, marking them as read.
+NEW_POSTS_SCRIPT = """
+    const posts = document.querySelectorAll(
+        "div.feed-shared-update-v2:not([data-scraper-read])"
+    );
+    return Array.from(posts).map((post) => {
+        const html = post.outerHTML;
+        post.setAttribute("data-scraper-read", "1");
+        return html;
+    });
+"""
+
+# Returns raw post fields for feed posts not yet returned, marking them as read.
+# arguments[0]: also return each post's outerHTML, for parity checks.
+NEW_POST_FIELDS_SCRIPT = """
+    const includeHtml = arguments[0];
+    const posts = document.querySelectorAll(
+        "div.feed-shared-update-v2:not([data-scraper-read])"
+    );
+    const textOf = (element) => (element ? element.textContent : null);
+
+    return JSON.stringify(Array.from(posts).map((post) => {
+        const repostButton = Array.from(
+            post.querySelectorAll('button[class*="social-details-social-counts__link"]')
+        ).find((button) => button.textContent.includes("repost"));
+        const textDiv = post.querySelector(
+            'div[class*="feed-shared-inline-show-more-text"]'
+        );
+        const ageLink = post.querySelector(
+            'a[class*="update-components-actor__sub-description-link"]'
+        );
+        const ageSpans = ageLink ? ageLink.querySelectorAll("span") : [];
+
+        const fields = {
+            post_id: post.getAttribute("data-urn"),
+            likes: textOf(post.querySelector(
+                'span[class*="social-details-social-counts__reactions-count"]'
+            )),
+            reposts: textOf(repostButton),
+            comments: textOf(post.querySelector(
+                'li[class*="social-details-social-counts__comments"]'
+            )),
+            post_age: ageSpans.length ? textOf(ageSpans[ageSpans.length - 1]) : null,
+            text: textDiv ? textOf(textDiv.querySelector('span[class*="break-words"]')) : "",
+            is_repost: post.querySelector(
+                "div.feed-shared-update-v2__update-content-wrapper"
+            ) !== null,
+            has_video: post.querySelector("div.update-components-linkedin-video") !== null,
+            has_image: post.querySelector("div.update-components-image") !== null,
+            has_article: post.querySelector(
+                'div[class*="update-components-article"]'
+            ) !== null,
+        };
+        if (includeHtml) {
+            fields.html = post.outerHTML;
+        }
+        post.setAttribute("data-scraper-read", "1");
+        return fields;
+    }));
+"""
+
+# Returns the raw followers, name and bio text of a profile page.
+PROFILE_FIELDS_SCRIPT = """
+    const strippedText = (element) => {
+        const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+        const parts = [];
+        while (walker.nextNode()) {
+            parts.push(walker.currentNode.textContent.trim());
+        }
+        return parts.join("");
+    };
+    const aboutPattern = /\\/in\\/[a-zA-Z0-9\\-]+\\/overlay\\/about-this-profile\\/.*/;
+
+    const followers = Array.from(document.querySelectorAll("span"))
+        .map(strippedText)
+        .find((text) => text.endsWith("followers"));
+    const name = Array.from(document.querySelectorAll("a[href]"))
+        .find((a) => aboutPattern.test(a.getAttribute("href")));
+    const bio = Array.from(document.querySelectorAll("div.text-body-medium.break-words"))
+        .find((div) => Array.from(div.classList).join(" ") === "text-body-medium break-words");
+
+    return JSON.stringify({
+        followers: followers === undefined ? null : followers,
+        name: name ? name.textContent : null,
+        bio: bio ? bio.textContent : null,
+    });
+"""
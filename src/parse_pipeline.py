@@ -0,0 +1,93 @@
+import gzip
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from src.html_parser import FEED, PROFILE, parse_html
+from src.linkedin_parser import LinkedinParser
+
+HTML_SUFFIXES = (".html", ".htm", ".html.gz", ".htm.gz")
+
+
+def iter_html_files(root: str) -> Iterator[str]:
+    """Yield the saved pages under root in a stable, sorted order."""
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(HTML_SUFFIXES):
+                yield os.path.join(directory, filename)
+
+
+def read_html(path: str) -> str:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+def parse_html_file(path: str, parser: str = "lxml") -> dict:
+    """
+    Extract one saved page. Activity pages (any feed posts found) yield post records,
+    other pages are treated as profile pages. Errors are returned, not raised, so one
+    bad file does not stop the rest of its chunk.
+    """
+    result = {"path": path, "kind": None, "profile": None, "posts": [], "error": None}
+    try:
+        html = read_html(path)
+        posts = LinkedinParser.find_posts(parse_html(html, parser, FEED))
+
+        if posts:
+            result["kind"] = "activity"
+            result["posts"] = LinkedinParser.extract_posts(posts)
+        else:
+            result["kind"] = "profile"
+            result["profile"] = LinkedinParser.extract_profile(
+                parse_html(html, parser, PROFILE)
+            )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def parse_chunk(paths: List[str], parser: str) -> List[dict]:
+    return [parse_html_file(path, parser) for path in paths]
+
+
+def chunked(iterable: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_files(
+    paths: Iterable[str],
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = 16,
+    parser: str = "lxml",
+) -> Iterator[dict]:
+    """
+    Parse saved pages across a process pool, yielding one result per path in input order.
+
+    Paths are consumed lazily and at most 2 * workers chunks are in flight, so memory
+    stays bounded however long the input is.
+    """
+    if workers <= 1:
+        for path in paths:
+            yield parse_html_file(path, parser)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunked(paths, chunk_size):
+            in_flight.append(executor.submit(parse_chunk, chunk, parser))
+
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+
+        while in_flight:
+            yield from in_flight.popleft().result()
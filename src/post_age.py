@@ -0,0 +1,51 @@
+import re
+from typing import Optional
+
+DAYS_PER_YEAR = 365
+
+# LinkedIn shows post ages as "7 months ago" on activity pages and as "7mo" in the
+# feed. Every spelling maps to its length in days.
+UNIT_DAYS = {
+    **dict.fromkeys(["year", "years", "yr", "yrs", "y"], DAYS_PER_YEAR),
+    **dict.fromkeys(["month", "months", "mo", "mos"], 30),
+    **dict.fromkeys(["week", "weeks", "wk", "wks", "w"], 7),
+    **dict.fromkeys(["day", "days", "d"], 1),
+    **dict.fromkeys(["hour", "hours", "hr", "hrs", "h"], 1 / 24),
+    **dict.fromkeys(["minute", "minutes", "min", "mins", "m"], 1 / 1440),
+    **dict.fromkeys(["second", "seconds", "sec", "secs", "s"], 1 / 86400),
+}
+
+# Longest spellings first, so "mo" is not read as "m" (minutes).
+POST_AGE_PATTERN = re.compile(
+    r"(\d+)\s*("
+    + "|".join(sorted(UNIT_DAYS, key=len, reverse=True))
+    + r")\b"
+)
+
+
+def parse_post_age_days(post_age: Optional[str]) -> Optional[float]:
+    """Convert a LinkedIn relative post age to days, or None if it can't be read."""
+    if not post_age:
+        return None
+
+    match = POST_AGE_PATTERN.search(post_age.lower())
+    if match is None:
+        return None
+
+    return int(match.group(1)) * UNIT_DAYS[match.group(2)]
+
+
+def post_age_days_column(post_ages):
+    """Vectorized parse_post_age_days over a pandas Series of post ages."""
+    parts = post_ages.astype("string").str.lower().str.extract(POST_AGE_PATTERN)
+    return parts[0].astype(float) * parts[1].map(UNIT_DAYS).astype(float)
+
+
+def max_age_days(
+    max_post_age_years: Optional[float], max_post_age_days: Optional[float] = None
+) -> float:
+    """The post age limit in days: max_post_age_days if given, else the limit in years."""
+    if max_post_age_days is not None:
+        return max_post_age_days
+
+    return max_post_age_years * DAYS_PER_YEAR
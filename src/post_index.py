@@ -0,0 +1,68 @@
+import time
+from typing import Iterable, Set, Tuple
+
+from src.sqlite_store import SQLiteStore
+
+
+class PostIndex(SQLiteStore):
+    """
+    Persistent SQLite index of the post IDs already scraped for each profile.
+
+    Used by incremental refreshes to recognise where the new part of a feed ends.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                profile_url TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (profile_url, post_id)
+            ) WITHOUT ROWID
+            """
+        )
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def known(self, profile_url: str) -> Set[str]:
+        with self.lock:
+            return {
+                post_id
+                for (post_id,) in self.connection.execute(
+                    "SELECT post_id FROM posts WHERE profile_url = ?", (profile_url,)
+                )
+            }
+
+    def add(self, profile_url: str, post_ids: Iterable[str]):
+        self.add_many([(profile_url, post_ids)])
+
+    def add_many(self, profiles: Iterable[Tuple[str, Iterable[str]]]):
+        """Index the post IDs of several (profile_url, post_ids) pairs in one transaction."""
+        now = time.time()
+        with self.transaction():
+            self.connection.executemany(
+                """
+                INSERT INTO posts (profile_url, post_id, first_seen, last_seen)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (profile_url, post_id) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                (
+                    (profile_url, post_id, now, now)
+                    for profile_url, post_ids in profiles
+                    for post_id in post_ids
+                ),
+            )
+
+    def add_rows(self, rows: Iterable[dict]):
+        """Index the post IDs of result rows, e.g. to seed the index from a ResultStore."""
+        by_profile = {}
+        for row in rows:
+            if row.get("post_id"):
+                by_profile.setdefault(row["profile_url"], []).append(row["post_id"])
+
+        self.add_many(by_profile.items())
@@ -0,0 +1,248 @@
+import logging
+import math
+import os
+import sqlite3
+import time
+from typing import Iterable, List, Optional
+
+from src.jsonl import iter_jsonl
+from src.records import POST_FIELDS, PROFILE_COLUMNS, Profile
+from src.result_store import entry_rows
+from src.sqlite_store import SQLiteStore
+
+NUMERIC_FIELDS = {"likes", "reposts", "comments", "post_age_days", "followers"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    profile_url TEXT PRIMARY KEY,
+    name TEXT,
+    bio TEXT,
+    followers INTEGER,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_followers ON profiles (followers);
+
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    profile_url TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    likes INTEGER,
+    reposts INTEGER,
+    comments INTEGER,
+    post_age TEXT,
+    post_age_days REAL,
+    text TEXT,
+    is_repost INTEGER,
+    post_type TEXT,
+    indexed_at REAL NOT NULL,
+    UNIQUE (profile_url, post_id)
+);
+CREATE INDEX IF NOT EXISTS posts_likes ON posts (likes);
+CREATE INDEX IF NOT EXISTS posts_type_likes ON posts (post_type, likes);
+CREATE INDEX IF NOT EXISTS posts_repost_likes ON posts (is_repost, likes);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5 (
+    text, content='posts', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF text ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO posts_fts (rowid, text) VALUES (new.id, new.text);
+END;
+
+-- Bytes of each JSONL result store already indexed.
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL
+);
+"""
+
+UPSERT_PROFILE = """
+INSERT INTO profiles (profile_url, name, bio, followers, indexed_at)
+VALUES (:profile_url, :name, :bio, :followers, :indexed_at)
+ON CONFLICT (profile_url) DO UPDATE SET
+    name = excluded.name,
+    bio = excluded.bio,
+    followers = excluded.followers,
+    indexed_at = excluded.indexed_at
+"""
+
+UPSERT_POST = f"""
+INSERT INTO posts (profile_url, {", ".join(POST_FIELDS)}, indexed_at)
+VALUES (:profile_url, {", ".join(":" + f for f in POST_FIELDS)}, :indexed_at)
+ON CONFLICT (profile_url, post_id) DO UPDATE SET
+    {", ".join(f"{f} = excluded.{f}" for f in POST_FIELDS if f != "post_id")},
+    indexed_at = excluded.indexed_at
+"""
+
+
+def _value(field: str, value):
+    """Normalize a value read from a CSV, a store or a Profile for its column."""
+    if field == "is_repost":
+        return int(value in (True, "True", "true", "1"))
+
+    if field in NUMERIC_FIELDS and (
+        value == "" or (isinstance(value, float) and math.isnan(value))
+    ):
+        return None
+
+    return value
+
+
+class PostSearchIndex(SQLiteStore):
+    """
+    SQLite database of scraped profiles and posts for downstream queries, with an
+    FTS5 full-text index on post text and indexes on profile, post type, repost flag,
+    likes and followers.
+
+    Posts are upserted by (profile_url, post_id), so results can be added as they
+    arrive: re-scraped posts update their counts and the full-text index is kept in
+    sync by triggers. JSONL result stores are indexed incrementally, from the byte
+    offset reached by the previous update.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def add_profiles(self, profiles: Iterable[Profile]):
+        """Index several profiles and their posts in one transaction."""
+        self.add_rows(row for profile in profiles for row in profile.rows())
+
+    def add_rows(self, rows: Iterable[dict]):
+        """Index wide result rows, as in the output CSV, in one transaction."""
+        with self.transaction():
+            self._upsert_rows(rows)
+
+    def _upsert_rows(self, rows: Iterable[dict]):
+        now = time.time()
+        last_profile = None
+        for row in rows:
+            values = {
+                field: _value(field, row.get(field))
+                for field in PROFILE_COLUMNS + POST_FIELDS
+            }
+            values["indexed_at"] = now
+            # A profile's rows are adjacent and repeat its fields.
+            profile = tuple(values[field] for field in PROFILE_COLUMNS)
+            if profile != last_profile:
+                self.connection.execute(UPSERT_PROFILE, values)
+                last_profile = profile
+
+            if values["post_id"]:
+                self.connection.execute(UPSERT_POST, values)
+
+    def update_from_store(self, path: str) -> int:
+        """
+        Index the entries appended to a JSONL result store since the last update.
+
+        A truncated last line is left for the next update and lines that don't decode
+        are skipped (see iter_jsonl). If the store was truncated or replaced since the
+        last update, it is indexed again from the start. Returns the number of entries
+        indexed.
+        """
+        with self.transaction():
+            row = self.connection.execute(
+                "SELECT offset FROM sources WHERE path = ?", (path,)
+            ).fetchone()
+            offset = row[0] if row else 0
+            if offset and not self._at_line_start(path, offset):
+                logging.warning(f"{path} changed since it was indexed, reindexing it")
+                offset = 0
+
+            def skip(end: int):
+                nonlocal offset
+                offset = end
+
+            entries = 0
+            for offset, entry in iter_jsonl(path, offset, on_error=skip):
+                self._upsert_rows(entry_rows(entry))
+                entries += 1
+
+            self.connection.execute(
+                """
+                INSERT INTO sources (path, offset) VALUES (?, ?)
+                ON CONFLICT (path) DO UPDATE SET offset = excluded.offset
+                """,
+                (path, offset),
+            )
+
+        return entries
+
+    @staticmethod
+    def _at_line_start(path: str, offset: int) -> bool:
+        if offset > os.path.getsize(path):
+            return False
+
+        with open(path, "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+
+    def search(
+        self,
+        match: Optional[str] = None,
+        min_likes: Optional[int] = None,
+        post_type: Optional[str] = None,
+        is_repost: Optional[bool] = None,
+        min_followers: Optional[int] = None,
+        profile_url: Optional[str] = None,
+        limit: Optional[int] = 100,
+    ) -> List[dict]:
+        """
+        Posts matching all the given conditions, most liked first, with their
+        profile's name and followers.
+
+        match is an FTS5 query on the post text, e.g. 'python' or '"machine learning"
+        OR ai*'.
+        """
+        conditions, params = [], []
+        if match is not None:
+            conditions.append(
+                "posts.id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)"
+            )
+            params.append(match)
+        if min_likes is not None:
+            conditions.append("posts.likes >= ?")
+            params.append(min_likes)
+        if post_type is not None:
+            conditions.append("posts.post_type = ?")
+            params.append(post_type)
+        if is_repost is not None:
+            conditions.append("posts.is_repost = ?")
+            params.append(int(is_repost))
+        if min_followers is not None:
+            conditions.append("profiles.followers >= ?")
+            params.append(min_followers)
+        if profile_url is not None:
+            conditions.append("posts.profile_url = ?")
+            params.append(profile_url)
+
+        query = """
+            SELECT posts.profile_url, profiles.name, profiles.followers,
+                {}
+            FROM posts JOIN profiles USING (profile_url)
+        """.format(", ".join(f"posts.{f}" for f in POST_FIELDS))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY posts.likes DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            rows = [dict(row) for row in self.connection.execute(query, params)]
+
+        for row in rows:
+            row["is_repost"] = bool(row["is_repost"])
+
+        return rows
@@ -0,0 +1,212 @@
+"""
+The search stage: resolve the profile URL of every input row with the search API,
+on a thread pool or an AsyncSearchEngine, in memory, through a journal or through a
+job queue.
+"""
+import concurrent.futures
+import logging
+import os
+from typing import Callable, Iterable, Optional, Tuple
+
+from src.job_queue import SCRAPE, SEARCH, JobQueue
+from src.profile_urls import canonical_profile_url
+from src.query_cache import QueryCache, normalize_query
+from src.search_client import SearchClient, organic_results, pick_linkedin_url
+from src.search_journal import SearchJournal
+
+
+def search_linkedin_profile(
+    index,
+    username: str,
+    password: str,
+    query: str,
+    client: Optional[SearchClient] = None,
+    cache: Optional[QueryCache] = None,
+):
+    cached = cache.get(query) if cache is not None else None
+
+    if cached is not None:
+        url = cached["url"]
+    else:
+        client = client or SearchClient(username, password)
+        organic = organic_results(client.search(query))
+        url = pick_linkedin_url(organic)
+
+        if cache is not None:
+            cache.put(query, organic, url)
+
+    if url:
+        logging.info(f"{query}: {url}")
+        return index, url
+
+    logging.info(f"{query}: NOT FOUND")
+    return index, "NOT FOUND"
+
+
+def check_columns(df):
+    assert "name" in df, "Add a name column to the CSV"
+    assert (
+        "extra_info" in df
+    ), "Add an extra_info column to the CSV with any helpful identifying information"
+
+
+def iter_queries(df):
+    for index, row in df[df.profile_url.isnull()].iterrows():
+        yield index, row["name"] + " " + row["extra_info"]
+
+
+def run_threaded(
+    args,
+    client: SearchClient,
+    cache: Optional[QueryCache],
+    items: Iterable[Tuple[int, str]],
+    on_result: Callable[[int, str], None],
+):
+    """Run search_linkedin_profile on a thread pool with at most --window searches in flight."""
+    window = args.window or 4 * args.threads
+
+    def collect(done):
+        for future in done:
+            if future.exception():
+                logging.error(future.exception())
+                continue
+
+            on_result(*future.result())
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.threads) as executor:
+        in_flight = set()
+        for index, query in items:
+            if len(in_flight) >= window:
+                done, in_flight = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                collect(done)
+
+            in_flight.add(
+                executor.submit(
+                    search_linkedin_profile,
+                    index,
+                    args.username,
+                    args.password,
+                    query,
+                    client,
+                    cache,
+                )
+            )
+
+        collect(concurrent.futures.wait(in_flight).done)
+
+
+def search_in_memory(args, run_searches):
+    import pandas
+
+    df = pandas.read_csv(args.input, index_col=None)
+
+    if "profile_url" not in df:
+        df["profile_url"] = None
+
+    check_columns(df)
+
+    processed = 0
+
+    def on_result(index, profile_url):
+        nonlocal processed
+        df.loc[index, "profile_url"] = profile_url
+        processed += 1
+
+        if processed % args.save_every == 0:
+            df.to_csv(args.input, index=False)
+            logging.info(f"Saved progress after processing {processed} profiles")
+
+    run_searches(iter_queries(df), on_result)
+
+    df.to_csv(args.input, index=False)
+
+
+def search_streaming(args, run_searches):
+    import pandas
+
+    journal = SearchJournal(args.input + ".journal.jsonl")
+    completed = journal.completed()
+    if completed:
+        logging.info(f"Resuming: {len(completed)} rows already resolved in the journal")
+
+    processed = 0
+
+    def on_result(index, profile_url):
+        nonlocal processed
+        journal.append(index, profile_url)
+        processed += 1
+
+        if processed % args.save_every == 0:
+            journal.checkpoint()
+            logging.info(f"Journaled {processed} profiles")
+
+    def iter_chunked_queries():
+        for chunk in pandas.read_csv(
+            args.input, index_col=None, chunksize=args.chunk_size
+        ):
+            if "profile_url" not in chunk:
+                chunk["profile_url"] = None
+
+            check_columns(chunk)
+
+            for index, query in iter_queries(chunk):
+                if index not in completed:
+                    yield index, query
+
+    run_searches(iter_chunked_queries(), on_result)
+
+    journal.checkpoint()
+    journal.merge_into_csv(args.input, args.chunk_size)
+
+
+def search_queued(args, run_searches):
+    import pandas
+
+    queue = JobQueue(args.queue)
+
+    for chunk in pandas.read_csv(args.input, index_col=None, chunksize=args.chunk_size):
+        if "profile_url" not in chunk:
+            chunk["profile_url"] = None
+
+        check_columns(chunk)
+
+        # Rows resolved before the queue was used go straight to the scrape stage.
+        resolved = chunk.profile_url.dropna().map(canonical_profile_url).dropna()
+        queue.enqueue_many(SCRAPE, ((url, None) for url in resolved))
+        # Keyed on the query rather than the row, so input files can share a queue.
+        queries = (query for _, query in iter_queries(chunk))
+        queue.enqueue_many(
+            SEARCH, ((normalize_query(query), {"query": query}) for query in queries)
+        )
+
+    worker = f"search-{os.getpid()}"
+    processed = 0
+    while True:
+        jobs = queue.lease(
+            SEARCH, worker, args.lease_seconds, limit=args.window or 4 * args.threads
+        )
+        if not jobs:
+            break
+
+        unresolved = {job.key for job in jobs}
+
+        def on_result(key, profile_url):
+            nonlocal processed
+            unresolved.discard(key)
+            processed += 1
+
+            url = canonical_profile_url(profile_url)
+            next_jobs = [(SCRAPE, url, None)] if url else ()
+            queue.complete(SEARCH, key, result=profile_url, next_jobs=next_jobs)
+
+        run_searches(((job.key, job.payload["query"]) for job in jobs), on_result)
+
+        for key in unresolved:
+            queue.fail(SEARCH, key, "search failed")
+
+        logging.info(f"Searched {processed} profiles, queue: {queue.counts(SEARCH)}")
+
+    logging.info(f"Scrape queue: {queue.counts(SCRAPE)}")
+    queue.close()
@@ -0,0 +1,51 @@
+"""
+Canonical LinkedIn profile URLs, so different spellings of one profile (http or
+https, with or without www or a country subdomain, trailing paths, query strings,
+letter case) are scraped once.
+"""
+import re
+from typing import Iterable, List, Optional, Tuple
+
+CANONICAL_PREFIX = "https://www.linkedin.com/in/"
+
+# Matched against the stripped, lowercased URL. The group is the profile ID.
+PROFILE_URL_PATTERN = re.compile(
+    r"^(?:https?://)?(?:[a-z0-9-]+\.)?linkedin\.com/in/([^/?#\s]+)"
+)
+
+
+def canonical_profile_url(url: Optional[str]) -> Optional[str]:
+    """The canonical form of a profile URL, or None if it is not a profile URL."""
+    if not isinstance(url, str):
+        return None
+
+    match = PROFILE_URL_PATTERN.match(url.strip().lower())
+    return CANONICAL_PREFIX + match.group(1) if match else None
+
+
+def canonical_profile_urls(urls):
+    """Vectorized canonical_profile_url over a pandas Series; malformed URLs are None."""
+    ids = urls.astype("string").str.strip().str.lower().str.extract(
+        PROFILE_URL_PATTERN, expand=False
+    )
+    return (CANONICAL_PREFIX + ids).astype(object).where(ids.notna(), None)
+
+
+def plan_profile_urls(
+    urls, completed: Iterable[str] = ()
+) -> Tuple[List[str], "pandas.Series"]:
+    """
+    Canonicalize an input column of profile URLs before scraping.
+
+    Returns the canonical URLs left to scrape, deduplicated in input order and without
+    those in completed (compared in canonical form too), and the malformed inputs.
+    """
+    import pandas
+
+    canonical = canonical_profile_urls(urls)
+    malformed = urls[canonical.isna() & urls.notna()]
+
+    done = canonical_profile_urls(pandas.Series(list(completed), dtype=object))
+    todo = canonical.dropna().drop_duplicates()
+    todo = todo[~todo.isin(set(done.dropna()))]
+    return todo.tolist(), malformed
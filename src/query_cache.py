@@ -0,0 +1,116 @@
+import json
+import time
+from typing import List, Optional
+
+from src.sqlite_store import SQLiteStore
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class QueryCache(SQLiteStore):
+    """
+    On-disk SQLite cache of search results, keyed by the normalized query string.
+
+    Each entry keeps the full organic result list and the LinkedIn URL chosen from it
+    (None when no LinkedIn profile was found), so "NOT FOUND" answers are cached too.
+    Entries older than ttl seconds are treated as missing. When the cache grows past
+    max_entries, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        super().__init__(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS queries (
+                query TEXT PRIMARY KEY,
+                organic TEXT NOT NULL,
+                url TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS queries_accessed_at ON queries (accessed_at)"
+        )
+        self.size = self.count()
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+
+    def get(self, query: str) -> Optional[dict]:
+        key = normalize_query(query)
+        now = time.time()
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT organic, url, created_at FROM queries WHERE query = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[2] > self.ttl):
+                self.misses += 1
+                return None
+
+            self.connection.execute(
+                "UPDATE queries SET accessed_at = ? WHERE query = ?", (now, key)
+            )
+            self.hits += 1
+
+        return {"organic": json.loads(row[0]), "url": row[1]}
+
+    def put(self, query: str, organic: List[dict], url: Optional[str]):
+        key = normalize_query(query)
+        now = time.time()
+
+        with self.transaction():
+            exists = self.connection.execute(
+                "SELECT 1 FROM queries WHERE query = ?", (key,)
+            ).fetchone()
+            self.connection.execute(
+                """
+                INSERT INTO queries (query, organic, url, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (query) DO UPDATE SET
+                    organic = excluded.organic,
+                    url = excluded.url,
+                    created_at = excluded.created_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (key, json.dumps(organic), url, now, now),
+            )
+            if exists:
+                return
+
+            self.size += 1
+            if self.max_entries is not None and self.size > self.max_entries:
+                self.evict()
+
+    def evict(self):
+        """Delete least recently used entries down to max_entries. Caller holds the lock."""
+        self.size = self.count()
+        excess = self.size - self.max_entries
+        if excess > 0:
+            self.connection.execute(
+                """
+                DELETE FROM queries WHERE query IN (
+                    SELECT query FROM queries ORDER BY accessed_at LIMIT ?
+                )
+                """,
+                (excess,),
+            )
+            self.size -= excess
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": self.size}
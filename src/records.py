@@ -0,0 +1,120 @@
+import importlib.util
+from dataclasses import asdict, dataclass, field, fields
+from typing import Iterable, List, Optional, Tuple
+
+PROFILE_COLUMNS = ["profile_url", "name", "bio", "followers"]
+
+# String columns with few distinct values, stored as categoricals (dictionary encoded
+# in Parquet) instead of one Python string per row.
+CATEGORICAL_POST_COLUMNS = ["profile_url", "post_age", "post_type"]
+
+
+@dataclass(slots=True)
+class Post:
+    post_id: Optional[str] = None
+    likes: int = 0
+    reposts: int = 0
+    comments: int = 0
+    post_age: str = ""
+    post_age_days: Optional[float] = None
+    text: str = ""
+    is_repost: bool = False
+    post_type: str = "Text"
+
+
+POST_FIELDS = [f.name for f in fields(Post)]
+
+
+@dataclass(slots=True)
+class Profile:
+    """
+    A scraped profile and its posts.
+
+    The profile fields are held once rather than copied into every post row; rows()
+    expands them into the wide rows of the output CSV when needed.
+    """
+
+    profile_url: str
+    name: str = ""
+    bio: str = ""
+    followers: int = 0
+    posts: List[Post] = field(default_factory=list)
+
+    @classmethod
+    def from_rows(cls, profile_url: str, rows: List[dict]) -> "Profile":
+        """Build a profile from wide result rows, as returned by build_rows."""
+        first = rows[0] if rows else {}
+        profile = cls(
+            profile_url,
+            **{f: first[f] for f in PROFILE_COLUMNS[1:] if first.get(f) is not None},
+        )
+        profile.posts = [
+            Post(**{f: row[f] for f in POST_FIELDS if row.get(f) is not None})
+            for row in rows
+            if row.get("post_id") or row.get("post_age")
+        ]
+        return profile
+
+    def fields(self) -> dict:
+        return {"name": self.name, "bio": self.bio, "followers": self.followers}
+
+    def post_ids(self) -> List[str]:
+        return [post.post_id for post in self.posts if post.post_id]
+
+    def rows(self) -> List[dict]:
+        head = {"profile_url": self.profile_url, **self.fields()}
+        if not self.posts:
+            return [head]
+
+        return [{**head, **post_record(post)} for post in self.posts]
+
+
+def post_record(post: Post) -> dict:
+    return asdict(post)
+
+
+def profiles_to_frames(
+    profiles: Iterable[Profile],
+) -> Tuple["pandas.DataFrame", "pandas.DataFrame"]:
+    """
+    Build the normalized profiles and posts tables.
+
+    The posts table refers to its profile by profile_url, a categorical column, so each
+    URL string is stored once however many posts the profile has.
+    """
+    import pandas
+
+    profile_records = []
+    post_columns = {name: [] for name in ["profile_url", *POST_FIELDS]}
+
+    for profile in profiles:
+        profile_records.append(
+            (profile.profile_url, profile.name, profile.bio, profile.followers)
+        )
+        for post in profile.posts:
+            post_columns["profile_url"].append(profile.profile_url)
+            for name in POST_FIELDS:
+                post_columns[name].append(getattr(post, name))
+
+    profiles_df = pandas.DataFrame.from_records(profile_records, columns=PROFILE_COLUMNS)
+    posts_df = pandas.DataFrame(post_columns)
+
+    profiles_df["followers"] = profiles_df.followers.astype("Int64")
+    for name in ["likes", "reposts", "comments"]:
+        posts_df[name] = posts_df[name].astype("int64")
+    posts_df["is_repost"] = posts_df.is_repost.astype(bool)
+    for name in CATEGORICAL_POST_COLUMNS:
+        posts_df[name] = posts_df[name].astype("category")
+
+    return profiles_df, posts_df
+
+
+def export_parquet(profiles: Iterable[Profile], profiles_path: str, posts_path: str):
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ImportError(
+            "Parquet export requires the pyarrow package: pip install pyarrow"
+        )
+
+    profiles_df, posts_df = profiles_to_frames(profiles)
+    profiles_df.to_parquet(profiles_path, index=False)
+    posts_df.to_parquet(posts_path, index=False)
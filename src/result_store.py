@@ -0,0 +1,241 @@
+import json
+import os
+import time
+from typing import Iterable, Iterator, List, Tuple
+
+from src.jsonl import drop_torn_tail, iter_jsonl
+from src.post_age import post_age_days_column
+from src.records import Profile, export_parquet, post_record
+
+COLUMNS = [
+    "profile_url",
+    "name",
+    "bio",
+    "followers",
+    "likes",
+    "reposts",
+    "comments",
+    "post_age",
+    "post_age_days",
+    "text",
+    "is_repost",
+    "post_type",
+    "post_id",
+]
+
+
+PROFILE_FIELDS = ["name", "bio", "followers"]
+
+
+def entry_rows(entry: dict) -> List[dict]:
+    """Expand a store entry into wide result rows, one per post."""
+    if "rows" in entry:
+        # Entries written before the store was normalized.
+        return entry["rows"]
+
+    head = {"profile_url": entry["profile_url"], **entry["profile"]}
+    if not entry["posts"]:
+        return [head]
+
+    return [{**head, **post} for post in entry["posts"]]
+
+
+def merge_refresh(rows: List[dict], refresh_rows: List[dict]) -> List[dict]:
+    """
+    Merge the rows of an incremental refresh into a profile's previous rows.
+
+    Refreshed posts replace the previous rows with the same post_id, posts not seen
+    before are put first (they are the newest), and the refreshed profile fields
+    (name, bio, followers) are applied to every row.
+    """
+    refreshed = {row["post_id"]: row for row in refresh_rows if row.get("post_id")}
+    previous_posts = [row for row in rows if row.get("post_id")]
+    previous_ids = {row["post_id"] for row in previous_posts}
+
+    merged = [row for row in refreshed.values() if row["post_id"] not in previous_ids]
+    merged += [refreshed.get(row["post_id"], row) for row in previous_posts]
+
+    if not merged:
+        return refresh_rows or rows
+
+    if refresh_rows:
+        profile = {field: refresh_rows[0].get(field) for field in PROFILE_FIELDS}
+        merged = [{**row, **profile} for row in merged]
+
+    return merged
+
+
+class ResultStore:
+    """
+    Append-only JSONL store of scrape results, one line per scraped profile.
+
+    Each line holds a profile URL, the time it was scraped, the profile fields and the
+    profile's posts, stored once per profile rather than once per post row. It is
+    flushed as soon as it is written, so a crash loses at most the profile in progress.
+    A truncated last line left by a crash is dropped when the store is reopened, and
+    other lines that don't decode are skipped (see iter_jsonl). When a profile is
+    scraped again, its latest line supersedes the earlier ones, except for incremental
+    refreshes: their rows are merged by post_id into the profile's previous rows (see
+    merge_refresh).
+
+    The set of completed profile URLs is loaded at startup and kept in memory, so
+    checking whether a profile was already scraped is a hash lookup.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed = set()
+
+        if os.path.exists(path):
+            self._load_index()
+
+        self.file = open(path, "a", encoding="utf-8")
+
+    def _load_index(self):
+        drop_torn_tail(self.path)
+        for _, entry in iter_jsonl(self.path):
+            self.completed.add(entry["profile_url"])
+
+    def __contains__(self, profile_url: str) -> bool:
+        return profile_url in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def append(self, profile_url: str, rows: List[dict], refresh: bool = False):
+        head = rows[0] if rows else {}
+        profile = {field: head[field] for field in PROFILE_FIELDS if field in head}
+        posts = [
+            {
+                key: value
+                for key, value in row.items()
+                if key != "profile_url" and key not in PROFILE_FIELDS
+            }
+            for row in rows
+            if row.get("post_id") or row.get("post_age")
+        ]
+        self._write(profile_url, profile, posts, refresh)
+
+    def append_profile(self, profile: Profile, refresh: bool = False):
+        self.append_profiles([(profile, refresh)])
+
+    def append_profiles(self, profiles: Iterable[Tuple[Profile, bool]]):
+        """Append (profile, refresh) pairs with a single flush."""
+        lines, profile_urls = [], []
+        for profile, refresh in profiles:
+            profile_urls.append(profile.profile_url)
+            lines.append(
+                self._entry_line(
+                    profile.profile_url,
+                    profile.fields(),
+                    [post_record(post) for post in profile.posts],
+                    refresh,
+                )
+            )
+
+        self.file.write("".join(lines))
+        self.file.flush()
+        self.completed.update(profile_urls)
+
+    def _write(self, profile_url: str, profile: dict, posts: List[dict], refresh: bool):
+        self.file.write(self._entry_line(profile_url, profile, posts, refresh))
+        self.file.flush()
+        self.completed.add(profile_url)
+
+    def _entry_line(
+        self, profile_url: str, profile: dict, posts: List[dict], refresh: bool
+    ) -> str:
+        entry = {
+            "profile_url": profile_url,
+            "scraped_at": time.time(),
+            "profile": profile,
+            "posts": posts,
+        }
+        if refresh:
+            entry["refresh"] = True
+
+        return json.dumps(entry) + "\n"
+
+    def checkpoint(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.checkpoint()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def iter_entries(self) -> Iterator[dict]:
+        self.file.flush()
+        for _, entry in iter_jsonl(self.path):
+            yield entry
+
+    def iter_rows(self) -> Iterator[dict]:
+        """
+        Yield the current result rows of every profile: those of its latest full
+        scrape, with any later incremental refreshes merged in.
+        """
+        for _, rows in self._iter_profile_rows():
+            yield from rows
+
+    def iter_profiles(self) -> Iterator[Profile]:
+        for profile_url, rows in self._iter_profile_rows():
+            yield Profile.from_rows(profile_url, rows)
+
+    def _iter_profile_rows(self) -> Iterator[Tuple[str, List[dict]]]:
+        chains = {}
+        for i, entry in enumerate(self.iter_entries()):
+            if entry.get("refresh") and entry["profile_url"] in chains:
+                chains[entry["profile_url"]].append(i)
+            else:
+                chains[entry["profile_url"]] = [i]
+
+        needed = {i for chain in chains.values() for i in chain}
+        last = {chain[-1] for chain in chains.values()}
+
+        pending = {}
+        for i, entry in enumerate(self.iter_entries()):
+            if i not in needed:
+                continue
+
+            profile_url = entry["profile_url"]
+            if profile_url in pending:
+                pending[profile_url] = merge_refresh(
+                    pending[profile_url], entry_rows(entry)
+                )
+            else:
+                pending[profile_url] = entry_rows(entry)
+
+            if i in last:
+                yield profile_url, pending.pop(profile_url)
+
+    def import_csv(self, path: str):
+        """Seed the store from an output CSV written by an earlier version of the scraper."""
+        import pandas
+
+        df = pandas.read_csv(path)
+        if "post_age" in df and "post_age_days" not in df:
+            df["post_age_days"] = post_age_days_column(df.post_age)
+
+        for profile_url, group in df.groupby("profile_url", sort=False):
+            self.append(profile_url, json.loads(group.to_json(orient="records")))
+
+        self.checkpoint()
+
+    def export_csv(self, path: str):
+        import pandas
+
+        df = pandas.DataFrame(self.iter_rows())
+        if df.empty:
+            df = pandas.DataFrame(columns=COLUMNS)
+
+        df.to_csv(path, index=False)
+
+    def export_parquet(self, profiles_path: str, posts_path: str):
+        """Export the normalized profiles and posts tables as Parquet files."""
+        export_parquet(self.iter_profiles(), profiles_path, posts_path)
@@ -0,0 +1,141 @@
+import random
+import threading
+import time
+from typing import List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.metrics import PERCENTILES, percentile
+
+SEARCH_URL = "https://realtime.oxylabs.io/v1/queries"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def organic_results(payload: dict) -> List[dict]:
+    return payload["results"][0]["content"]["results"]["organic"]
+
+
+def pick_linkedin_url(organic: List[dict]) -> Optional[str]:
+    for result in organic:
+        if "linkedin.com/in/" in result["url"]:
+            return result["url"]
+
+    return None
+
+
+class SearchStats:
+    """Thread-safe record of the latency, retries and outcome of every search."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: List[float] = []
+        self.retries: List[int] = []
+        self.failures = 0
+
+    def record(self, latency: float, retries: int, failed: bool):
+        with self.lock:
+            self.latencies.append(latency)
+            self.retries.append(retries)
+            self.failures += failed
+
+    def summary(self) -> dict:
+        with self.lock:
+            latencies, retries = list(self.latencies), list(self.retries)
+            failures = self.failures
+
+        return {
+            "requests": len(latencies),
+            "failures": failures,
+            "retries": sum(retries),
+            "latency_s": {
+                f"p{q}": percentile(latencies, q) if latencies else None
+                for q in PERCENTILES
+            },
+        }
+
+
+def search_payload(query: str) -> dict:
+    return {"source": "google_search", "query": f"linkedin {query}", "parse": True}
+
+
+def retry_delay(backoff: float, attempt: int, retry_after: Optional[str]) -> float:
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+
+    return backoff * 2**attempt * random.uniform(0.5, 1.5)
+
+
+class SearchClient:
+    """
+    Search API client shared by all worker threads.
+
+    Requests go through one requests.Session whose connection pool holds pool_size
+    keep-alive connections, so each thread reuses a connection instead of opening a
+    new TLS session per query. Timeouts, connection errors and 429/5xx responses are
+    retried up to max_retries times with exponential backoff and jitter, honouring
+    Retry-After. Latency and retry counts of every query are recorded for stats().
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        pool_size: int = 5,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 10,
+        url: str = SEARCH_URL,
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        self.session.auth = (username, password)
+        adapter = HTTPAdapter(pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.search_stats = SearchStats()
+
+    def search(self, query: str) -> dict:
+        start = time.perf_counter()
+        attempt = 0
+        failed = True
+        try:
+            while True:
+                response = None
+                try:
+                    response = self.session.post(
+                        self.url, json=search_payload(query), timeout=self.timeout
+                    )
+                    if response.status_code not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        payload = response.json()
+                        failed = False
+                        return payload
+
+                    error = requests.HTTPError(
+                        f"{response.status_code} from search API", response=response
+                    )
+                except (requests.Timeout, requests.ConnectionError) as e:
+                    error = e
+
+                if attempt >= self.max_retries:
+                    raise error
+
+                retry_after = (
+                    response.headers.get("Retry-After") if response is not None else None
+                )
+                time.sleep(retry_delay(self.backoff, attempt, retry_after))
+                attempt += 1
+        finally:
+            self.search_stats.record(time.perf_counter() - start, attempt, failed)
+
+    def stats(self) -> dict:
+        return self.search_stats.summary()
+
+    def close(self):
+        self.session.close()
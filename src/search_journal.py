@@ -0,0 +1,62 @@
+import json
+import logging
+import os
+from typing import Dict, Set
+
+from src.jsonl import iter_jsonl
+
+
+class SearchJournal:
+    """
+    Append-only checkpoint journal of resolved search rows.
+
+    Each line records the input row index and the profile URL found for it. Appending
+    a line costs the same however large the input is, unlike rewriting the CSV. On
+    restart the journal is replayed to skip rows already resolved, and merge_into_csv
+    folds the results back into the input file in one streaming pass.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+
+    def entries(self) -> Dict[int, str]:
+        self.file.flush()
+        return {
+            entry["index"]: entry["profile_url"] for _, entry in iter_jsonl(self.path)
+        }
+
+    def completed(self) -> Set[int]:
+        return set(self.entries())
+
+    def append(self, index: int, profile_url: str):
+        self.file.write(json.dumps({"index": index, "profile_url": profile_url}) + "\n")
+
+    def checkpoint(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def merge_into_csv(self, csv_path: str, chunk_size: int):
+        """Fill the profile_url column of csv_path from the journal, then remove the journal."""
+        import pandas
+
+        results = self.entries()
+        tmp_path = csv_path + ".merging"
+
+        header = True
+        for chunk in pandas.read_csv(csv_path, index_col=None, chunksize=chunk_size):
+            if "profile_url" not in chunk:
+                chunk["profile_url"] = None
+
+            resolved = chunk.index.map(results)
+            chunk["profile_url"] = chunk.profile_url.where(
+                chunk.profile_url.notnull(), resolved
+            )
+            chunk.to_csv(tmp_path, index=False, header=header, mode="w" if header else "a")
+            header = False
+
+        os.replace(tmp_path, csv_path)
+        logging.info(f"Merged {len(results)} journaled results into {csv_path}")
+
+        self.file.close()
+        os.remove(self.path)
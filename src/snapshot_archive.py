@@ -0,0 +1,90 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterator, Optional
+
+from src.jsonl import iter_jsonl
+
+
+class SnapshotArchive:
+    """
+    Content-addressed, gzip-compressed archive of raw page HTML.
+
+    Pages are stored once per distinct content under objects/<2 hex>/<sha256>.html.gz.
+    index.jsonl records which profile URL, page kind ("profile" or "activity") and
+    capture time each stored page belongs to, so pages can be re-extracted offline
+    without a browser.
+    """
+
+    PROFILE = "profile"
+    ACTIVITY = "activity"
+
+    def __init__(self, root: str):
+        self.root = root
+        self.index_path = os.path.join(root, "index.jsonl")
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest + ".html.gz")
+
+    def put(
+        self, profile_url: str, kind: str, html: str, captured_at: Optional[float] = None
+    ) -> str:
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        entry = {
+            "profile_url": profile_url,
+            "kind": kind,
+            "captured_at": captured_at if captured_at is not None else time.time(),
+            "digest": digest,
+        }
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+        return digest
+
+    def get(self, digest: str) -> str:
+        with gzip.open(self.object_path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def iter_entries(self) -> Iterator[dict]:
+        if not os.path.exists(self.index_path):
+            return
+
+        for _, entry in iter_jsonl(self.index_path):
+            yield entry
+
+    def latest_captures(self) -> Dict[str, Dict[str, dict]]:
+        """
+        Map each profile URL to the index entries of its most recent complete capture,
+        by page kind.
+
+        The pages saved while scraping a profile share one captured_at, so a capture
+        is complete once it has both a profile and an activity page. A scrape that
+        failed after saving the profile page leaves an incomplete capture, which is
+        passed over rather than paired with pages from another capture.
+        """
+        captures = {}
+        for entry in self.iter_entries():
+            key = (entry["profile_url"], entry["captured_at"])
+            captures.setdefault(key, {})[entry["kind"]] = entry
+
+        latest = {}
+        for (profile_url, _), kinds in sorted(
+            captures.items(), key=lambda item: item[0][1]
+        ):
+            if self.PROFILE in kinds and self.ACTIVITY in kinds:
+                latest[profile_url] = kinds
+
+        return latest
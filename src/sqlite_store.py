@@ -0,0 +1,40 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+def open_connection(path: str) -> sqlite3.Connection:
+    """
+    Connection in autocommit mode with write-ahead logging, so readers don't block the
+    writer and other processes can use the same file.
+    """
+    connection = sqlite3.connect(
+        path, check_same_thread=False, isolation_level=None, timeout=30
+    )
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
+
+
+class SQLiteStore:
+    """
+    Base for the SQLite caches, indexes and queues: one connection shared by all
+    threads (e.g. the scrape loop and a WriteBehindWriter) behind a lock.
+    """
+
+    def __init__(self, path: str):
+        self.lock = threading.Lock()
+        self.connection = open_connection(path)
+
+    @contextmanager
+    def transaction(self, mode: str = ""):
+        """
+        Hold the lock for one transaction, committed on success and rolled back on
+        errors. mode "IMMEDIATE" takes the write lock up front, for read-then-write
+        transactions that other processes may run concurrently.
+        """
+        with self.lock, self.connection:
+            self.connection.execute(f"BEGIN {mode}")
+            yield self.connection
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class _Checkpoint:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """
+    Persists items on a background thread so disk I/O overlaps with scraping.
+
+    Submitted items go through a queue of at most max_queue items (submit blocks
+    when it is full) to a writer thread, which hands them to write_batch in batches.
+    A batch is written once it holds batch_size items or its first item has waited
+    flush_interval seconds. checkpoint() writes the pending batch and then calls
+    checkpoint (e.g. an fsync). close() drains the queue, writes what is left and
+    checkpoints; using the writer as a context manager closes it on errors too.
+
+    If writing fails, the error is raised by the next submit, checkpoint or close.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List], None],
+        checkpoint: Optional[Callable[[], None]] = None,
+        max_queue: int = 64,
+        batch_size: int = 16,
+        flush_interval: float = 5.0,
+    ):
+        self.write_batch = write_batch
+        self.checkpoint_fn = checkpoint
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.error: Optional[BaseException] = None
+        self.written = 0
+        self.batches = 0
+        self.thread = threading.Thread(
+            target=self._run, name="write-behind", daemon=True
+        )
+        self.thread.start()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError("Write-behind writer failed") from self.error
+
+    def submit(self, item):
+        self._raise_error()
+        self.queue.put(item)
+
+    def checkpoint(self, wait: bool = False):
+        self._raise_error()
+        marker = _Checkpoint()
+        self.queue.put(marker)
+        if wait:
+            marker.done.wait()
+            self._raise_error()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _flush(self, batch: List):
+        if batch:
+            self.write_batch(batch[:])
+            self.written += len(batch)
+            self.batches += 1
+            batch.clear()
+
+    def _checkpoint(self, batch: List):
+        self._flush(batch)
+        if self.checkpoint_fn is not None:
+            self.checkpoint_fn()
+
+    def _run(self):
+        batch = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if not batch else max(0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    self._flush(batch)
+                    continue
+
+                if item is _STOP:
+                    self._checkpoint(batch)
+                    return
+
+                if isinstance(item, _Checkpoint):
+                    self._checkpoint(batch)
+                    item.done.set()
+                    continue
+
+                batch.append(item)
+                if len(batch) == 1:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) >= self.batch_size:
+                    self._flush(batch)
+        except BaseException as e:
+            self.error = e
+            self._discard()
+
+    def _discard(self):
+        """After a failure, keep consuming so producers blocked on a full queue return."""
+        while True:
+            item = self.queue.get()
+            if isinstance(item, _Checkpoint):
+                item.done.set()
+            elif item is _STOP:
+                return
@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class SearchAPIStub(ThreadingHTTPServer):
+    """
+    Local stand-in for the search API. Answers every query with one organic result,
+    https://www.linkedin.com/in/<first word of the query after "linkedin">, unless the
+    query contains "nobody". Responses queued in `responses` are served first.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SearchAPIHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/v1/queries"
+        self.responses = []
+        self.requests = []
+        self.client_ports = set()
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+    def organic(self, query: str):
+        name = query.split()[1].lower()
+        if "nobody" in query.lower():
+            return [{"url": f"https://example.com/{name}"}]
+
+        return [
+            {"url": f"https://example.com/{name}"},
+            {"url": f"https://www.linkedin.com/in/{name}"},
+        ]
+
+
+class SearchAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        with self.server.lock:
+            self.server.requests.append(body)
+            self.server.client_ports.add(self.client_address[1])
+            status, headers = (
+                self.server.responses.pop(0) if self.server.responses else (200, {})
+            )
+
+        time.sleep(self.server.delay)
+
+        payload = {}
+        if status == 200:
+            payload = {
+                "results": [
+                    {
+                        "content": {
+                            "results": {"organic": self.server.organic(body["query"])}
+                        }
+                    }
+                ]
+            }
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def search_api():
+    server = SearchAPIStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
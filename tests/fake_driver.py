@@ -0,0 +1,181 @@
+"""
+A stand-in for the Chrome driver that serves synthetic LinkedIn pages, so the scrape
+loop can be tested and benchmarked without a browser or a LinkedIn login.
+"""
+import json
+
+from bs4 import BeautifulSoup
+
+from src.linkedin_parser import ABOUT_THIS_PROFILE_PATTERN
+from src.page_scripts import (
+    NEW_POST_FIELDS_SCRIPT,
+    NEW_POSTS_SCRIPT,
+    PROFILE_FIELDS_SCRIPT,
+)
+from tests.synthetic_feed import (
+    PROFILE_FIXTURE,
+    fixture_templates,
+    make_posts,
+    read_fixture,
+)
+
+SCROLL_HEIGHT_SCRIPT = "return document.body.scrollHeight"
+SCROLL_PREFIX = "window.scrollTo("
+ACTIVITY_SUFFIX = "/recent-activity/all/"
+
+POST_HEIGHT = 600
+
+
+def script_post_fields(post) -> dict:
+    """Evaluate NEW_POST_FIELDS_SCRIPT's selectors on a parsed post with soupsieve."""
+    text_of = lambda element: element.text if element is not None else None
+    repost_button = next(
+        (
+            button
+            for button in post.select(
+                'button[class*="social-details-social-counts__link"]'
+            )
+            if "repost" in button.text
+        ),
+        None,
+    )
+    text_div = post.select_one('div[class*="feed-shared-inline-show-more-text"]')
+    age_spans = post.select(
+        'a[class*="update-components-actor__sub-description-link"] span'
+    )
+    return {
+        "post_id": post["data-urn"],
+        "likes": text_of(
+            post.select_one(
+                'span[class*="social-details-social-counts__reactions-count"]'
+            )
+        ),
+        "reposts": text_of(repost_button),
+        "comments": text_of(
+            post.select_one('li[class*="social-details-social-counts__comments"]')
+        ),
+        "post_age": age_spans[-1].text if age_spans else None,
+        "text": (
+            text_of(text_div.select_one('span[class*="break-words"]'))
+            if text_div
+            else ""
+        ),
+        "is_repost": post.select_one(
+            "div.feed-shared-update-v2__update-content-wrapper"
+        )
+        is not None,
+        "has_video": post.select_one("div.update-components-linkedin-video")
+        is not None,
+        "has_image": post.select_one("div.update-components-image") is not None,
+        "has_article": post.select_one('div[class*="update-components-article"]')
+        is not None,
+        "html": str(post),
+    }
+
+
+def script_profile_fields(soup) -> dict:
+    """Evaluate PROFILE_FIELDS_SCRIPT on a parsed profile page."""
+    followers = next(
+        (
+            text
+            for text in (span.get_text(strip=True) for span in soup.find_all("span"))
+            if text.endswith("followers")
+        ),
+        None,
+    )
+    name = soup.find("a", href=ABOUT_THIS_PROFILE_PATTERN)
+    bio = next(
+        (
+            div
+            for div in soup.select("div.text-body-medium.break-words")
+            if div.get("class") == ["text-body-medium", "break-words"]
+        ),
+        None,
+    )
+    return {
+        "followers": followers,
+        "name": name.text if name else None,
+        "bio": bio.text if bio else None,
+    }
+
+
+class FakeDriver:
+    """
+    Serves the profile fixture for profile URLs and a synthetic activity feed of
+    n_posts posts for activity URLs.
+
+    The feed starts with page_size posts and each window.scrollTo loads page_size
+    more, like LinkedIn's infinite scroll; document.body.scrollHeight grows with the
+    number of posts loaded and stops changing at the end of the feed. The page
+    scripts are answered from the synthetic HTML, including marking posts as read.
+    """
+
+    def __init__(self, n_posts: int = 100, page_size: int = 10):
+        self.n_posts = n_posts
+        self.page_size = page_size
+        self.profile_html = read_fixture(PROFILE_FIXTURE)
+        self.posts = make_posts(n_posts)
+        self.current_url = None
+        self.loaded = 0
+        self.read = 0
+        self.scripts = 0
+        self.scrolls = 0
+
+    @property
+    def on_activity_page(self) -> bool:
+        return self.current_url is not None and self.current_url.endswith(
+            ACTIVITY_SUFFIX
+        )
+
+    def get(self, url: str):
+        self.current_url = url
+        self.loaded = min(self.page_size, self.n_posts)
+        self.read = 0
+
+    @property
+    def page_source(self) -> str:
+        if not self.on_activity_page:
+            return self.profile_html
+
+        head, tail, _ = fixture_templates()
+        return head + "".join(self.posts[: self.loaded]) + tail
+
+    def unread_posts(self):
+        posts, self.read = self.posts[self.read : self.loaded], self.loaded
+        return posts
+
+    def execute_script(self, script: str, *args):
+        self.scripts += 1
+
+        if script == SCROLL_HEIGHT_SCRIPT:
+            return self.loaded * POST_HEIGHT if self.on_activity_page else POST_HEIGHT
+
+        if script.startswith(SCROLL_PREFIX):
+            self.scrolls += 1
+            self.loaded = min(self.loaded + self.page_size, self.n_posts)
+            return None
+
+        if script == NEW_POSTS_SCRIPT:
+            return self.unread_posts() if self.on_activity_page else []
+
+        if script == NEW_POST_FIELDS_SCRIPT:
+            include_html = args[0] if args else False
+            fields = []
+            for html in self.unread_posts() if self.on_activity_page else []:
+                post = BeautifulSoup(html, "html.parser").div
+                post_fields = script_post_fields(post)
+                if not include_html:
+                    del post_fields["html"]
+                fields.append(post_fields)
+
+            return json.dumps(fields)
+
+        if script == PROFILE_FIELDS_SCRIPT:
+            return json.dumps(
+                script_profile_fields(BeautifulSoup(self.profile_html, "html.parser"))
+            )
+
+        raise ValueError(f"FakeDriver can't run script: {script[:60]!r}")
+
+    def quit(self):
+        self.current_url = None
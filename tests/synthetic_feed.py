@@ -0,0 +1,57 @@
+"""
+Synthetic activity pages of any size, built by replicating the posts of the
+tests/activity.html fixture. Used to benchmark parsing and to drive the scrape loop
+without a browser.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup, Comment
+
+from src.linkedin_parser import LinkedinParser
+
+FIXTURES = Path(__file__).parent
+ACTIVITY_FIXTURE = FIXTURES / "activity.html"
+PROFILE_FIXTURE = FIXTURES / "profile.html"
+
+POSTS_MARKER = "synthetic-feed-posts"
+URN_PATTERN = re.compile(r'data-urn="(urn:li:activity:\d+)"')
+
+
+def read_fixture(path: Path) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def fixture_templates() -> Tuple[str, str, Tuple[str, ...]]:
+    """Split the activity fixture into the page around the posts and the posts themselves."""
+    soup = BeautifulSoup(read_fixture(ACTIVITY_FIXTURE), features="lxml")
+    posts = LinkedinParser.find_posts(soup)
+    templates = tuple(str(post) for post in posts)
+
+    posts[0].replace_with(Comment(POSTS_MARKER))
+    for post in posts[1:]:
+        post.decompose()
+
+    head, tail = str(soup).split(f"<!--{POSTS_MARKER}-->")
+    return head, tail, templates
+
+
+def make_posts(n_posts: int, start: int = 0) -> List[str]:
+    """Return the HTML of n_posts fixture posts, each with a distinct data-urn."""
+    _, _, templates = fixture_templates()
+    return [
+        URN_PATTERN.sub(
+            lambda match: f'data-urn="{match.group(1)}{i:06d}"',
+            templates[i % len(templates)],
+        )
+        for i in range(start, start + n_posts)
+    ]
+
+
+def make_activity_page(n_posts: int) -> str:
+    head, tail, _ = fixture_templates()
+    return head + "".join(make_posts(n_posts)) + tail
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from src.profile_search import search_linkedin_profile
+from src.search_client import SearchClient
+
+pytest.importorskip("aiohttp")
+
+from src.async_search import AsyncSearchEngine  # noqa: E402
+
+QUERIES = [(i, f"{name} acme") for i, name in enumerate(["jane", "nobody", "john"])]
+
+
+def make_engine(search_api, **kwargs):
+    return AsyncSearchEngine(
+        "user", "pass", url=search_api.url, backoff=0.01, **kwargs
+    )
+
+
+def run(engine, items):
+    results = {}
+    asyncio.run(engine.run(items, lambda index, url: results.update({index: url})))
+    return results
+
+
+def test_matches_threaded_search(search_api):
+    client = SearchClient("user", "pass", url=search_api.url)
+    expected = dict(
+        search_linkedin_profile(index, "user", "pass", query, client)
+        for index, query in QUERIES
+    )
+
+    assert run(make_engine(search_api), QUERIES) == expected
+
+
+def test_retries_and_deadlines(search_api):
+    search_api.responses = [(503, {}), (429, {"Retry-After": "0"})]
+    engine = make_engine(search_api, concurrency=1)
+
+    assert run(engine, QUERIES[:1]) == {0: "https://www.linkedin.com/in/jane"}
+    assert engine.stats()["retries"] == 2
+
+    search_api.delay = 0.2
+    engine = make_engine(search_api, timeout=0.05, max_retries=1)
+    assert run(engine, QUERIES[:1]) == {}
+    assert engine.stats()["failures"] == 1
+
+
+def test_concurrency_limit(search_api):
+    search_api.delay = 0.05
+    engine = make_engine(search_api, concurrency=2)
+
+    results = run(engine, [(i, f"user{i} acme") for i in range(10)])
+
+    assert len(results) == 10
+    assert len(search_api.client_ports) <= 2
+
+
+def test_window_limits_items_read_ahead(search_api):
+    consumed = []
+
+    def items():
+        for i in range(10):
+            consumed.append(i)
+            yield i, f"user{i} acme"
+
+    read_ahead = []
+    engine = make_engine(search_api, concurrency=5, window=1)
+    asyncio.run(
+        engine.run(items(), lambda index, url: read_ahead.append(len(consumed) - index))
+    )
+
+    assert len(read_ahead) == 10
+    assert max(read_ahead) <= 2
@@ -0,0 +1,56 @@
+import os
+
+import undetected_chromedriver
+
+from src.browser import cached_driver_path
+from src.linkedin_post_scraper import LinkedinPostScraper
+
+
+class SessionDriver:
+    """Redirects the feed to the login page unless logged in."""
+
+    def __init__(self, logged_in: bool):
+        self.logged_in = logged_in
+        self.current_url = None
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        if url.startswith(LinkedinPostScraper.FEED_URL) and not self.logged_in:
+            url = "https://www.linkedin.com/uas/login?session_redirect=feed"
+        self.current_url = url
+
+
+def test_valid_session_skips_login_page():
+    driver = SessionDriver(logged_in=True)
+    scraper = LinkedinPostScraper(driver=driver)
+
+    assert scraper.login("email", "password") == "profile"
+    assert driver.visited == [LinkedinPostScraper.FEED_URL]
+
+
+def test_session_active():
+    assert not LinkedinPostScraper(driver=SessionDriver(False)).session_active()
+    assert LinkedinPostScraper(driver=SessionDriver(True)).session_active()
+
+
+def test_cached_driver_path_downloads_once(tmp_path, monkeypatch):
+    downloads = []
+
+    class Patcher:
+        def __init__(self, version_main):
+            self.executable_path = str(tmp_path / "patched")
+
+        def auto(self):
+            downloads.append(self.executable_path)
+            with open(self.executable_path, "w") as f:
+                f.write("chromedriver")
+
+    monkeypatch.setattr(undetected_chromedriver, "Patcher", Patcher)
+    cache_dir = str(tmp_path / "cache")
+
+    path = cached_driver_path(130, cache_dir)
+    assert path == os.path.join(cache_dir, "chromedriver-130")
+    assert open(path).read() == "chromedriver"
+    assert cached_driver_path(130, cache_dir) == path
+    assert len(downloads) == 1
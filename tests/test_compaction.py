@@ -0,0 +1,103 @@
+import csv
+import os
+
+import pandas
+import pytest
+
+from src.compaction import Compactor
+from src.result_store import ResultStore
+
+PROFILE = "https://www.linkedin.com/in/johndoe"
+OTHER = "https://www.linkedin.com/in/janedoe"
+
+
+def write_csv(path, rows, mtime):
+    pandas.DataFrame(rows).to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return {(row["profile_url"], row["post_id"]): row for row in csv.DictReader(f)}
+
+
+def test_latest_observation_wins(tmp_path):
+    old = write_csv(
+        tmp_path / "old.csv",
+        [
+            {"profile_url": PROFILE, "name": "John", "post_id": "a", "likes": 1},
+            {"profile_url": PROFILE, "name": "John", "post_id": "b", "likes": 5},
+            {"profile_url": OTHER, "name": "Jane", "post_id": None, "likes": None},
+        ],
+        mtime=2000,
+    )
+    new = write_csv(
+        tmp_path / "new.csv",
+        [
+            {"profile_url": "http://linkedin.com/in/JohnDoe/", "name": "John D."},
+            {"profile_url": PROFILE, "name": "John D.", "post_id": "a", "likes": 3},
+        ],
+        mtime=1000,
+    )
+    output = str(tmp_path / "compacted.csv")
+
+    # The old file was touched since: input order decides, not modification times.
+    summary = Compactor(run_size=2, fan_in=2).compact([old, new], output)
+
+    rows = read_rows(output)
+    assert set(rows) == {(PROFILE, "a"), (PROFILE, "b"), (OTHER, "")}
+    assert float(rows[(PROFILE, "a")]["likes"]) == 3
+    assert float(rows[(PROFILE, "b")]["likes"]) == 5
+    assert rows[(PROFILE, "b")]["name"] == "John D."
+    assert summary["rows_read"] == 5
+    assert summary["rows_written"] == 3
+    assert summary["rows_dropped"] == 2
+    assert summary["profiles"] == 2
+    assert summary["posts"] == 2
+    assert summary["runs"] == 3
+    assert summary["merge_passes"] == 2
+
+
+def test_merges_result_stores_and_csvs(tmp_path):
+    csv_path = write_csv(
+        tmp_path / "old.csv",
+        [{"profile_url": PROFILE, "post_id": "a", "likes": 1, "post_age": "1w"}],
+        mtime=1000,
+    )
+    store_path = str(tmp_path / "results.jsonl")
+    with ResultStore(store_path) as store:
+        store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "a", "likes": 2}])
+        store.append(
+            PROFILE,
+            [{"profile_url": PROFILE, "post_id": "c", "likes": 7}],
+            refresh=True,
+        )
+    with open(store_path, "a") as f:
+        f.write('{"profile_url": "trunc')
+
+    output = str(tmp_path / "compacted.csv")
+    summary = Compactor().compact([csv_path, store_path], output)
+
+    rows = read_rows(output)
+    assert rows[(PROFILE, "a")]["likes"] == "2"
+    assert rows[(PROFILE, "c")]["likes"] == "7"
+    assert summary["rows_written"] == 2
+    assert list(pandas.read_csv(output).columns[:3]) == ["profile_url", "name", "bio"]
+
+    # A CSV written after the store wins over it.
+    newer_csv = write_csv(
+        tmp_path / "new.csv",
+        [{"profile_url": PROFILE, "post_id": "c", "likes": 9}],
+        mtime=1000,
+    )
+    Compactor().compact([csv_path, store_path, newer_csv], output)
+
+    rows = read_rows(output)
+    assert rows[(PROFILE, "a")]["likes"] == "2"
+    assert rows[(PROFILE, "c")]["likes"] == "9"
+
+
+def test_fan_in_must_merge_several_runs():
+    with pytest.raises(ValueError):
+        Compactor(fan_in=1)
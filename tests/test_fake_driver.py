@@ -0,0 +1,62 @@
+import pytest
+
+from tests.fake_driver import FakeDriver
+from src.linkedin_post_scraper import LinkedinPostScraper
+from src.metrics import ProfileMetrics
+
+PROFILE = "https://www.linkedin.com/in/johndoe"
+
+
+def scrape(driver, extraction="soup", parser="lxml", **kwargs):
+    sleeps = []
+    scraper = LinkedinPostScraper(
+        driver=driver, extraction=extraction, parser=parser, sleep=sleeps.append
+    )
+    kwargs.setdefault("max_post_age_years", 100)
+    return scraper.scrape_profile(PROFILE, **kwargs), sleeps
+
+
+def test_scrolls_to_the_end_of_the_feed():
+    driver = FakeDriver(n_posts=25, page_size=10)
+    metrics = ProfileMetrics(PROFILE)
+    profile, sleeps = scrape(driver, metrics=metrics)
+
+    assert len(profile.posts) == 25
+    assert len({post.post_id for post in profile.posts}) == 25
+    assert profile.name
+    # The last scroll finds no new posts and ends the loop.
+    assert driver.scrolls == 3
+    assert metrics.counters["posts"] == 25
+    assert metrics.counters["scroll_iterations"] == 4
+    assert sleeps and "wait" in metrics.phases
+
+
+@pytest.mark.parametrize(
+    "extraction, parser",
+    [("script", "lxml"), ("verify", "lxml"), ("soup", "html.parser")],
+)
+def test_extraction_modes_agree(extraction, parser, caplog):
+    expected, _ = scrape(FakeDriver(n_posts=15, page_size=4))
+    profile, _ = scrape(FakeDriver(n_posts=15, page_size=4), extraction, parser)
+
+    assert profile == expected
+    assert "differs" not in caplog.text
+
+
+def test_stops_at_max_posts():
+    driver = FakeDriver(n_posts=100, page_size=10)
+    profile, _ = scrape(driver, max_posts=15)
+
+    assert len(profile.posts) == 15
+    assert driver.scrolls == 1
+
+
+def test_refresh_stops_at_known_posts():
+    full, _ = scrape(FakeDriver(n_posts=40, page_size=5))
+    known = set(full.post_ids()[5:])
+
+    driver = FakeDriver(n_posts=40, page_size=5)
+    profile, _ = scrape(driver, known_post_ids=known, refresh_window=2)
+
+    assert profile.post_ids() == full.post_ids()[:7]
+    assert driver.scrolls == 1
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.html_parser import FEED, PARSERS, PROFILE, parse_html
+from src.linkedin_parser import LinkedinParser
+
+FIXTURES = Path(__file__).parent
+
+
+def read_fixture(name):
+    with open(FIXTURES / name, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(params=PARSERS)
+def parser(request):
+    if request.param == "selectolax":
+        pytest.importorskip("selectolax.lexbor")
+    return request.param
+
+
+@pytest.mark.parametrize("region", [None, FEED])
+def test_feed_posts_match_full_parse(parser, region):
+    html = read_fixture("activity.html")
+    expected = LinkedinParser.extract_posts(
+        LinkedinParser.find_posts(BeautifulSoup(html, "html.parser"))
+    )
+
+    soup = parse_html(html, parser, region)
+    assert LinkedinParser.extract_posts(
+        LinkedinParser.find_posts(soup)
+    ) == expected
+
+
+@pytest.mark.parametrize("region", [None, PROFILE])
+def test_profile_fields_match_full_parse(parser, region):
+    soup = parse_html(read_fixture("profile.html"), parser, region)
+    assert LinkedinParser.extract_profile(soup) == {
+        "name": "Veronica Ramos",
+        "bio": "Senior Vice President - Wealth Management UBS International Division",
+        "followers": 69,
+    }
+
+
+def test_unknown_parser():
+    with pytest.raises(ValueError):
+        parse_html("<html></html>", "html5lib")
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+# Generous, so the test only catches a heavy dependency creeping back into the import.
+IMPORT_BUDGET_S = 2.0
+BROWSER_MODULES = ["selenium", "undetected_chromedriver"]
+
+
+def imported_modules(code: str):
+    """Run code in a fresh interpreter and return its -X importtime module timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative) / 1e6
+
+    return timings
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "src.linkedin_parser",
+        "src.parse_pipeline",
+        "src.result_store",
+        "src.records",
+        "src.search_journal",
+    ],
+)
+def test_parsing_modules_import_without_browser_or_pandas(module):
+    timings = imported_modules(f"import {module}")
+    top_level = {name.split(".")[0] for name in timings}
+
+    for heavy in BROWSER_MODULES + ["pandas"]:
+        assert heavy not in top_level, f"{module} imports {heavy}"
+    assert timings[module] < IMPORT_BUDGET_S
+
+
+def test_scraper_defers_browser_imports():
+    timings = imported_modules("import src.linkedin_post_scraper")
+    top_level = {name.split(".")[0] for name in timings}
+
+    assert not top_level & set(BROWSER_MODULES)
@@ -0,0 +1,136 @@
+from argparse import Namespace
+
+import pandas
+
+from src.job_queue import DONE, FAILED, LEASED, PENDING, SCRAPE, SEARCH, JobQueue
+from src.profile_search import run_threaded, search_queued
+from src.search_client import SearchClient
+
+
+def test_lease_complete_and_follow_up(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    queue.enqueue_many(SEARCH, [("0", {"query": "Jane"}), ("1", {"query": "John"})])
+    queue.enqueue(SEARCH, "0", {"query": "ignored"})
+
+    jobs = queue.lease(SEARCH, "worker", limit=5)
+    assert [(job.key, job.payload, job.attempts) for job in jobs] == [
+        ("0", {"query": "Jane"}, 1),
+        ("1", {"query": "John"}, 1),
+    ]
+    assert queue.lease(SEARCH, "other") == []
+    assert not queue.drained(SEARCH)
+
+    url = "https://www.linkedin.com/in/jane"
+    queue.complete(SEARCH, "0", result=url, next_jobs=[(SCRAPE, url, None)])
+    assert queue.counts(SEARCH) == {DONE: 1, LEASED: 1}
+    assert [job.key for job in queue.lease(SCRAPE, "scraper")] == [url]
+
+
+def test_failed_jobs_are_retried_until_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite"), max_attempts=2)
+    queue.enqueue(SCRAPE, "a")
+
+    queue.lease(SCRAPE, "worker")
+    queue.fail(SCRAPE, "a", "timeout")
+    assert queue.counts(SCRAPE) == {PENDING: 1}
+
+    assert queue.lease(SCRAPE, "worker")[0].attempts == 2
+    queue.fail(SCRAPE, "a", "timeout")
+    assert queue.counts(SCRAPE) == {FAILED: 1}
+    assert queue.lease(SCRAPE, "worker") == []
+    assert queue.drained(SCRAPE)
+
+
+def test_failed_jobs_go_behind_pending_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    queue.enqueue_many(SCRAPE, [("a", None), ("b", None)])
+
+    assert queue.lease(SCRAPE, "worker")[0].key == "a"
+    queue.fail(SCRAPE, "a", "timeout")
+    queue.enqueue(SCRAPE, "c")
+    jobs = queue.lease(SCRAPE, "worker", limit=3)
+    assert [job.key for job in jobs] == ["b", "a", "c"]
+
+
+def test_drained_needs_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    assert not queue.drained(SEARCH)
+
+    queue.enqueue(SEARCH, "jane")
+    queue.lease(SEARCH, "worker")
+    assert not queue.drained(SEARCH)
+    queue.complete(SEARCH, "jane")
+    assert queue.drained(SEARCH)
+
+
+def test_renewed_lease_is_not_taken_over(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    queue.enqueue(SCRAPE, "a")
+
+    queue.lease(SCRAPE, "sleeping", seconds=-1)
+    queue.renew(SCRAPE, "a", 60)
+    assert queue.lease(SCRAPE, "other") == []
+
+
+def test_expired_leases_are_taken_over(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    queue = JobQueue(path, max_attempts=2)
+    queue.enqueue(SCRAPE, "a")
+
+    assert queue.lease(SCRAPE, "crashed", seconds=-1)[0].attempts == 1
+    assert queue.drained(SCRAPE)
+
+    # A second process sharing the queue file.
+    other = JobQueue(path, max_attempts=2)
+    assert other.lease(SCRAPE, "worker", seconds=-1)[0].attempts == 2
+    assert other.lease(SCRAPE, "worker") == []
+    assert other.counts(SCRAPE) == {FAILED: 1}
+
+
+def test_search_queued_feeds_scrape_stage(search_api, tmp_path):
+    csv_path = str(tmp_path / "input.csv")
+    pandas.DataFrame(
+        {
+            "name": ["Jane", "John", "Nobody"],
+            "extra_info": ["acme"] * 3,
+            "profile_url": [None, "http://www.linkedin.com/in/Known/", None],
+        }
+    ).to_csv(csv_path, index=False)
+    queue_path = str(tmp_path / "queue.sqlite")
+    args = Namespace(
+        input=csv_path,
+        queue=queue_path,
+        username="user",
+        password="pass",
+        threads=2,
+        window=2,
+        chunk_size=2,
+        lease_seconds=60,
+    )
+    client = SearchClient("user", "pass", url=search_api.url)
+    run_searches = lambda items, on_result: run_threaded(
+        args, client, None, items, on_result
+    )
+
+    search_queued(args, run_searches)
+    search_queued(args, run_searches)
+
+    assert len(search_api.requests) == 2
+    queue = JobQueue(queue_path)
+    assert queue.counts(SEARCH) == {DONE: 2}
+    assert queue.drained(SEARCH)
+    assert [job.key for job in queue.lease(SCRAPE, "scraper", limit=5)] == [
+        "https://www.linkedin.com/in/known",
+        "https://www.linkedin.com/in/jane",
+    ]
+
+    # Rows of another input file don't collide with the first file's jobs.
+    other_path = str(tmp_path / "other.csv")
+    pandas.DataFrame(
+        {"name": ["Mary"], "extra_info": ["acme"], "profile_url": [None]}
+    ).to_csv(other_path, index=False)
+    args.input = other_path
+    search_queued(args, run_searches)
+
+    assert len(search_api.requests) == 3
+    assert queue.counts(SEARCH) == {DONE: 3}
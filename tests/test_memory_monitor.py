@@ -0,0 +1,70 @@
+import logging
+import subprocess
+import sys
+
+from src import memory_monitor
+from src.memory_monitor import MemoryMonitor, process_tree_rss_bytes, rss_bytes
+from src.metrics import MetricsRecorder, ProfileMetrics
+
+
+def test_process_tree_includes_children():
+    own = rss_bytes()
+    assert own > 0
+
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        assert process_tree_rss_bytes() > rss_bytes()
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_sample_records_gauges():
+    monitor = MemoryMonitor()
+    metrics = ProfileMetrics("https://www.linkedin.com/in/a")
+
+    tree_rss_mb = monitor.sample(metrics)
+    assert metrics.gauges["tree_rss_mb"] == tree_rss_mb
+    assert 0 < metrics.gauges["rss_mb"] <= tree_rss_mb
+    assert "traced_mb" not in metrics.gauges
+    assert monitor.report_top() == []
+
+
+def test_trace_reports_allocation_growth(caplog):
+    monitor = MemoryMonitor(trace=True, top=3)
+    try:
+        kept = [str(i) * 100 for i in range(10000)]
+        metrics = ProfileMetrics()
+        monitor.sample(metrics)
+        assert metrics.gauges["traced_peak_mb"] >= metrics.gauges["traced_mb"] > 0.5
+
+        with caplog.at_level(logging.INFO):
+            lines = monitor.report_top()
+        assert len(lines) == 3
+        assert "test_memory_monitor.py" in lines[0]
+        assert lines[0] in caplog.text
+        del kept
+    finally:
+        monitor.stop()
+
+
+def test_gauges_summarized_without_totals():
+    recorder = MetricsRecorder()
+    for rss_mb in (100, 200, 300):
+        metrics = ProfileMetrics()
+        metrics.gauge("rss_mb", rss_mb)
+        recorder.record(metrics)
+
+    summary = recorder.summary()
+    assert summary["percentiles"]["rss_mb"]["p50"] == 200
+    assert "rss_mb" not in summary["totals"]
+
+
+def test_no_tree_rss_without_proc_or_psutil(monkeypatch):
+    monkeypatch.setattr(memory_monitor, "rss_bytes", lambda pid="self": None)
+    monkeypatch.setitem(sys.modules, "psutil", None)
+
+    metrics = ProfileMetrics()
+    assert process_tree_rss_bytes() is None
+    assert MemoryMonitor().sample(metrics) is None
+    assert metrics.gauges == {}
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from src.metrics import MetricsRecorder, ProfileMetrics, percentile
+
+
+def test_phase_accumulates():
+    metrics = ProfileMetrics("https://www.linkedin.com/in/johndoe")
+    with metrics.phase("parse"):
+        pass
+    with metrics.phase("parse"):
+        pass
+    metrics.count("scroll_iterations")
+    metrics.count("html_chars", 10)
+
+    record = metrics.as_record()
+    assert set(record["phases"]) == {"parse"}
+    assert record["counters"] == {"scroll_iterations": 1, "html_chars": 10}
+
+
+@pytest.mark.parametrize(
+    "q, expected", [(0, 1.0), (50, 2.5), (100, 4.0), (90, 3.7)]
+)
+def test_percentile(q, expected):
+    assert percentile([4.0, 1.0, 3.0, 2.0], q) == pytest.approx(expected)
+
+
+def test_recorder_writes_jsonl_and_summarizes(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    recorder = MetricsRecorder(str(path))
+    for i in range(3):
+        metrics = ProfileMetrics(f"https://www.linkedin.com/in/user{i}")
+        metrics.count("posts", i)
+        recorder.record(metrics)
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["counters"]["posts"] for line in lines] == [0, 1, 2]
+
+    summary = recorder.summary()
+    assert summary["profiles"] == 3
+    assert summary["totals"]["posts"] == 3
+    assert summary["percentiles"]["posts"]["p50"] == 1
@@ -0,0 +1,29 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.parse_pipeline import iter_html_files, parse_files
+
+FIXTURES = Path(__file__).parent
+
+
+@pytest.fixture
+def pages(tmp_path):
+    for i in range(3):
+        shutil.copy(FIXTURES / "activity.html", tmp_path / f"{i}-activity.html")
+    shutil.copy(FIXTURES / "profile.html", tmp_path / "3-profile.html")
+    (tmp_path / "4-broken.html").write_text("<html></html>")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_files(pages, workers):
+    paths = list(iter_html_files(str(pages)))
+    results = list(parse_files(paths, workers=workers, chunk_size=2))
+
+    assert [result["path"] for result in results] == paths
+    assert [result["kind"] for result in results[:3]] == ["activity"] * 3
+    assert all(len(result["posts"]) == 3 for result in results[:3])
+    assert results[3]["profile"]["name"] == "Veronica Ramos"
+    assert results[4]["error"].startswith("AttributeError")
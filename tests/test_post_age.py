@@ -0,0 +1,43 @@
+import pandas
+import pytest
+
+from src.post_age import max_age_days, parse_post_age_days, post_age_days_column
+
+POST_AGES = [
+    ("7 months ago", 210),
+    ("1 year ago", 365),
+    ("6 years ago", 6 * 365),
+    ("2 weeks ago", 14),
+    ("3 days ago", 3),
+    ("5 hours ago", 5 / 24),
+    ("7mo", 210),
+    ("7mo • Edited", 210),
+    ("1yr", 365),
+    ("2w", 14),
+    ("3d", 3),
+    ("10m", 10 / 1440),
+    ("Just now", None),
+    ("", None),
+]
+
+
+@pytest.mark.parametrize("post_age, expected", POST_AGES)
+def test_parse_post_age_days(post_age, expected):
+    assert parse_post_age_days(post_age) == pytest.approx(expected)
+
+
+def test_post_age_days_column_matches_parser():
+    ages = [post_age for post_age, _ in POST_AGES] + [None]
+    days = post_age_days_column(pandas.Series(ages))
+
+    for post_age, value in zip(ages, days):
+        expected = parse_post_age_days(post_age)
+        if expected is None:
+            assert pandas.isna(value)
+        else:
+            assert value == pytest.approx(expected)
+
+
+def test_max_age_days():
+    assert max_age_days(2) == 730
+    assert max_age_days(2, 45) == 45
@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from tests.fake_driver import script_post_fields
+from src.linkedin_parser import FeedReader, LinkedinParser
+from src.page_scripts import NEW_POST_FIELDS_SCRIPT
+from src.post_age import parse_post_age_days
+
+
+@pytest.fixture(params=["html.parser", "lxml"])
+def posts(request):
+    with open(Path(__file__).parent / "activity.html", encoding="utf-8") as f:
+        soup = BeautifulSoup(f.read(), request.param)
+    return LinkedinParser.find_posts(soup)
+
+
+def extract_fields(post):
+    return {
+        "likes": LinkedinParser.extract_likes(post),
+        "reposts": LinkedinParser.extract_reposts(post),
+        "comments": LinkedinParser.extract_comments(post),
+        "post_age": LinkedinParser.extract_post_age(post),
+        "post_age_days": parse_post_age_days(LinkedinParser.extract_post_age(post)),
+        "text": LinkedinParser.extract_text(post),
+        "is_repost": LinkedinParser.extract_is_repost(post),
+        "post_type": LinkedinParser.extract_post_type(post),
+        "post_id": LinkedinParser.extract_post_id(post),
+    }
+
+
+def test_extract_posts_matches_field_extractors(posts):
+    assert LinkedinParser.extract_posts(posts) == [
+        extract_fields(post) for post in posts
+    ]
+
+
+def test_extract_post(posts):
+    record = LinkedinParser.extract_post(posts[0])
+    assert record["post_id"] == "urn:li:activity:7183990472795672576"
+    assert record["post_age"] == "7 months ago"
+    assert record["post_age_days"] == 210
+    assert record["reposts"] == 5
+    assert record["comments"] == 28
+
+
+@pytest.mark.parametrize(
+    "post_age, expected",
+    [("6 years ago", 6), ("1 year ago", 1), ("7 months ago", False)],
+)
+def test_parse_post_age_years(post_age, expected):
+    assert LinkedinParser.parse_post_age_years(post_age) == expected
+
+
+def test_feed_reader_extracts_each_post_once(posts):
+    reader = FeedReader(parser="html.parser")
+    fragments = [str(post) for post in posts]
+
+    assert reader.add_fragments(fragments[:2]) == LinkedinParser.extract_posts(
+        posts[:2]
+    )
+    assert reader.add_fragments(fragments) == LinkedinParser.extract_posts(
+        posts[2:]
+    )
+    assert reader.add_fragments([]) == []
+    assert reader.records == LinkedinParser.extract_posts(posts)
+    assert reader.last_post_age_days == 6 * 365
+
+
+class ScriptDriver:
+    def __init__(self, posts):
+        self.posts = posts
+
+    def execute_script(self, script, *args):
+        assert script == NEW_POST_FIELDS_SCRIPT
+        posts, self.posts = self.posts, []
+        return json.dumps([script_post_fields(post) for post in posts])
+
+
+def test_post_from_script_matches_soup(posts):
+    for post in posts:
+        assert LinkedinParser.post_from_script(
+            script_post_fields(post)
+        ) == LinkedinParser.extract_post(post)
+
+
+@pytest.mark.parametrize("extraction", ["script", "verify"])
+def test_feed_reader_script_extraction(posts, extraction, caplog):
+    reader = FeedReader(parser="html.parser", extraction=extraction)
+    assert reader.read(ScriptDriver(posts)) == LinkedinParser.extract_posts(posts)
+    assert reader.read(ScriptDriver(posts)) == []
+    assert "differs" not in caplog.text
+
+
+def test_feed_reader_refresh_window(posts):
+    known = {LinkedinParser.extract_post_id(post) for post in posts[1:]}
+    reader = FeedReader(
+        parser="html.parser", known_post_ids=known, refresh_window=1
+    )
+
+    reader.add_posts(posts)
+
+    assert reader.records == LinkedinParser.extract_posts(posts[:2])
+    assert reader.known_seen == 2
@@ -0,0 +1,31 @@
+import threading
+
+from src.post_index import PostIndex
+
+PROFILE = "https://www.linkedin.com/in/johndoe"
+
+
+def test_add_and_known(tmp_path):
+    path = str(tmp_path / "posts.sqlite")
+    index = PostIndex(path)
+    index.add(PROFILE, ["a", "b"])
+    index.add(PROFILE, ["b", "c"])
+    index.add_rows([{"profile_url": "other", "post_id": "x"}, {"profile_url": "other"}])
+
+    index = PostIndex(path)
+    assert index.known(PROFILE) == {"a", "b", "c"}
+    assert index.known("other") == {"x"}
+    assert index.known("missing") == set()
+    assert len(index) == 4
+
+
+def test_add_many_from_another_thread(tmp_path):
+    index = PostIndex(str(tmp_path / "posts.sqlite"))
+    thread = threading.Thread(
+        target=index.add_many, args=([(PROFILE, ["a"]), ("other", ["b", "c"])],)
+    )
+    thread.start()
+    thread.join()
+
+    assert index.known(PROFILE) == {"a"}
+    assert len(index) == 3
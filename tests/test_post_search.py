@@ -0,0 +1,107 @@
+from src.post_search import PostSearchIndex
+from src.records import Post, Profile
+from src.result_store import ResultStore
+
+PROFILE = "https://www.linkedin.com/in/johndoe"
+OTHER = "https://www.linkedin.com/in/janedoe"
+
+
+def make_index(tmp_path):
+    index = PostSearchIndex(str(tmp_path / "search.sqlite"))
+    index.add_profiles(
+        [
+            Profile(
+                PROFILE,
+                name="John",
+                followers=500,
+                posts=[
+                    Post("a", likes=150, text="Hiring Python engineers"),
+                    Post("b", likes=20, text="Python tips", post_type="Image"),
+                    Post("c", likes=300, text="Café culture", is_repost=True),
+                ],
+            ),
+            Profile(OTHER, name="Jane", followers=50000),
+        ]
+    )
+    return index
+
+
+def test_search_by_text_and_attributes(tmp_path):
+    index = make_index(tmp_path)
+
+    assert len(index) == 3
+    assert [p["post_id"] for p in index.search(match="python")] == ["a", "b"]
+    assert [p["post_id"] for p in index.search(match="python", min_likes=100)] == ["a"]
+    assert [p["post_id"] for p in index.search(match="cafe")] == ["c"]
+    assert [p["post_id"] for p in index.search(post_type="Image")] == ["b"]
+    assert [p["post_id"] for p in index.search(is_repost=True)] == ["c"]
+    assert [p["post_id"] for p in index.search(limit=2)] == ["c", "a"]
+    assert index.search(min_followers=1000) == []
+
+    post = index.search(match="hiring")[0]
+    assert post["name"] == "John"
+    assert post["followers"] == 500
+    assert post["is_repost"] is False
+
+
+def test_upsert_updates_counts_and_text(tmp_path):
+    index = make_index(tmp_path)
+    index.add_rows(
+        [
+            {
+                "profile_url": PROFILE,
+                "name": "John D.",
+                "post_id": "b",
+                "likes": "250",
+                "text": "Rust tips",
+                "is_repost": "False",
+            }
+        ]
+    )
+
+    assert len(index) == 3
+    assert [p["post_id"] for p in index.search(match="python")] == ["a"]
+    post = index.search(match="rust")[0]
+    assert post["likes"] == 250
+    assert post["name"] == "John D."
+
+
+def test_update_from_store_is_incremental(tmp_path):
+    store_path = str(tmp_path / "results.jsonl")
+    index = PostSearchIndex(str(tmp_path / "search.sqlite"))
+    store = ResultStore(store_path)
+
+    store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "a", "text": "hello"}])
+    assert index.update_from_store(store_path) == 1
+    assert index.update_from_store(store_path) == 0
+
+    store.append(
+        PROFILE,
+        [{"profile_url": PROFILE, "post_id": "b", "likes": 5, "text": "hello again"}],
+        refresh=True,
+    )
+    with open(store_path, "a") as f:
+        f.write('{"profile_url": "trunc')
+
+    assert index.update_from_store(store_path) == 1
+    assert [p["post_id"] for p in index.search(match="hello")] == ["b", "a"]
+
+
+def test_update_from_store_recovers_from_changed_stores(tmp_path):
+    store_path = tmp_path / "results.jsonl"
+    index = PostSearchIndex(str(tmp_path / "search.sqlite"))
+    with ResultStore(str(store_path)) as store:
+        for post_id in ["a", "b"]:
+            store.append(
+                PROFILE, [{"profile_url": PROFILE, "post_id": post_id, "text": "hi"}]
+            )
+    assert index.update_from_store(str(store_path)) == 2
+
+    # Replaced by a shorter store, with a line that doesn't decode.
+    with ResultStore(str(tmp_path / "new.jsonl")) as store:
+        store.append(OTHER, [{"profile_url": OTHER, "post_id": "c", "text": "hi"}])
+    store_path.write_bytes(b"{corrupt\n" + (tmp_path / "new.jsonl").read_bytes())
+
+    assert index.update_from_store(str(store_path)) == 1
+    assert index.update_from_store(str(store_path)) == 0
+    assert {p["post_id"] for p in index.search(match="hi")} == {"a", "b", "c"}
@@ -0,0 +1,70 @@
+import pandas
+import pytest
+
+from src.linkedin_parser import LinkedinParser
+from src.profile_urls import (
+    canonical_profile_url,
+    canonical_profile_urls,
+    plan_profile_urls,
+)
+
+# The test_extract_linkedin_profile cases.
+EXTRACT_CASES = [
+    (
+        "https://www.linkedin.com/in/johndoe/some-other-stuff",
+        "https://www.linkedin.com/in/johndoe",
+    ),
+    (
+        "https://www.linkedin.com/in/janedoe1234/?utm_source=linkedin",
+        "https://www.linkedin.com/in/janedoe1234",
+    ),
+    ("https://www.linkedin.com/company/linkedin/", None),
+    ("https://example.com/in/johndoe", None),
+    ("https://www.linkedin.com/johndoe", None),
+    ("https://www.linkedin.com/in/", None),
+]
+
+SPELLINGS = [
+    "http://www.linkedin.com/in/johndoe",
+    "https://linkedin.com/in/JohnDoe/",
+    "https://uk.linkedin.com/in/johndoe?trk=public",
+    "www.linkedin.com/in/johndoe#about",
+    "  https://www.linkedin.com/in/johndoe/recent-activity/all/ ",
+]
+
+
+@pytest.mark.parametrize("url, expected", EXTRACT_CASES)
+def test_matches_extract_linkedin_profile(url, expected):
+    assert canonical_profile_url(url) == expected
+    assert LinkedinParser.extract_linkedin_profile(url) == expected
+
+
+def test_vectorized_matches_scalar():
+    urls = [url for url, _ in EXTRACT_CASES] + SPELLINGS + [None]
+    assert canonical_profile_urls(pandas.Series(urls)).tolist() == [
+        canonical_profile_url(url) for url in urls
+    ]
+
+
+@pytest.mark.parametrize("url", SPELLINGS)
+def test_spellings_share_a_canonical_url(url):
+    assert canonical_profile_url(url) == "https://www.linkedin.com/in/johndoe"
+
+
+def test_plan_dedupes_and_subtracts_completed():
+    urls = pandas.Series(
+        [
+            "https://www.linkedin.com/in/janedoe",
+            *SPELLINGS,
+            "https://www.linkedin.com/company/linkedin/",
+            None,
+            "https://www.linkedin.com/in/Bob/",
+        ]
+    )
+    todo, malformed = plan_profile_urls(urls, {"http://linkedin.com/in/bob"})
+
+    assert todo == [
+        "https://www.linkedin.com/in/janedoe",
+        "https://www.linkedin.com/in/johndoe",
+    ]
+    assert malformed.tolist() == ["https://www.linkedin.com/company/linkedin/"]
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from src.profile_search import search_linkedin_profile
+from src.query_cache import QueryCache, normalize_query
+from src.search_client import SearchClient
+
+ORGANIC = [{"url": "https://www.linkedin.com/in/jane"}]
+
+
+def test_normalize_query():
+    assert normalize_query("  Jane   Doe\tACME ") == "jane doe acme"
+
+
+def test_put_and_get(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"))
+    cache.put("Jane Doe", ORGANIC, "https://www.linkedin.com/in/jane")
+    cache.put("nobody", [], None)
+
+    assert cache.get("jane  doe") == {
+        "organic": ORGANIC,
+        "url": "https://www.linkedin.com/in/jane",
+    }
+    assert cache.get("nobody") == {"organic": [], "url": None}
+    assert cache.get("someone else") is None
+    assert cache.stats() == {"hits": 2, "misses": 1, "entries": 2}
+
+
+def test_put_again_replaces_the_entry(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"))
+    cache.put("jane doe", [], None)
+    cache.put("Jane Doe", ORGANIC, "https://www.linkedin.com/in/jane")
+
+    assert cache.get("jane doe")["url"] == "https://www.linkedin.com/in/jane"
+    assert cache.stats()["entries"] == cache.count() == 1
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    QueryCache(path).put("jane doe", ORGANIC, "https://www.linkedin.com/in/jane")
+
+    assert QueryCache(path).get("jane doe")["url"] == "https://www.linkedin.com/in/jane"
+
+
+def test_ttl(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"), ttl=0.05)
+    cache.put("jane doe", ORGANIC, "https://www.linkedin.com/in/jane")
+    assert cache.get("jane doe") is not None
+
+    time.sleep(0.1)
+    assert cache.get("jane doe") is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.put("a", [], None)
+    time.sleep(0.01)
+    cache.put("b", [], None)
+    time.sleep(0.01)
+    cache.get("a")
+    cache.put("c", [], None)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.count() == 2
+
+
+def test_concurrent_access(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"), max_entries=50)
+
+    def work(worker):
+        for i in range(40):
+            cache.put(f"query {worker} {i}", ORGANIC, None)
+            cache.get(f"query {worker} {i // 2}")
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.count() == 50
+
+
+def test_search_uses_cache(search_api, tmp_path):
+    client = SearchClient("user", "pass", url=search_api.url)
+    cache = QueryCache(str(tmp_path / "cache.sqlite"))
+
+    for _ in range(2):
+        assert search_linkedin_profile(0, "user", "pass", "jane acme", client, cache) == (
+            0,
+            "https://www.linkedin.com/in/jane",
+        )
+        assert search_linkedin_profile(1, "user", "pass", "nobody x", client, cache) == (
+            1,
+            "NOT FOUND",
+        )
+
+    assert len(search_api.requests) == 2
@@ -0,0 +1,78 @@
+import pytest
+
+from src.records import Post, Profile, export_parquet, profiles_to_frames
+
+PROFILE = "https://www.linkedin.com/in/johndoe"
+
+
+@pytest.fixture
+def profiles():
+    return [
+        Profile(
+            PROFILE,
+            "John",
+            "Engineer",
+            10,
+            [
+                Post("a", likes=3, post_age="2mo", post_type="image"),
+                Post("b", comments=1, post_age="2mo", is_repost=True),
+            ],
+        ),
+        Profile("https://www.linkedin.com/in/janedoe", "Jane", "", 5),
+    ]
+
+
+def test_rows_round_trip(profiles):
+    rows = profiles[0].rows()
+    assert rows[1] == {
+        "profile_url": PROFILE,
+        "name": "John",
+        "bio": "Engineer",
+        "followers": 10,
+        "post_id": "b",
+        "likes": 0,
+        "reposts": 0,
+        "comments": 1,
+        "post_age": "2mo",
+        "post_age_days": None,
+        "text": "",
+        "is_repost": True,
+        "post_type": "Text",
+    }
+    assert Profile.from_rows(PROFILE, rows) == profiles[0]
+
+    empty = profiles[1]
+    assert empty.rows() == [
+        {"profile_url": empty.profile_url, "name": "Jane", "bio": "", "followers": 5}
+    ]
+    assert Profile.from_rows(empty.profile_url, empty.rows()) == empty
+
+
+def test_records_have_no_instance_dict(profiles):
+    assert not hasattr(profiles[0], "__dict__")
+    assert not hasattr(profiles[0].posts[0], "__dict__")
+
+
+def test_profiles_to_frames(profiles):
+    profiles_df, posts_df = profiles_to_frames(profiles)
+
+    assert list(profiles_df.profile_url) == [p.profile_url for p in profiles]
+    assert list(posts_df.post_id) == ["a", "b"]
+    assert posts_df.profile_url.dtype == "category"
+    assert list(posts_df.profile_url.cat.categories) == [PROFILE]
+    assert posts_df.post_type.dtype == "category"
+    assert posts_df.likes.dtype == "int64"
+
+
+def test_export_parquet(profiles, tmp_path):
+    pandas = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+
+    profiles_path = str(tmp_path / "profiles.parquet")
+    posts_path = str(tmp_path / "posts.parquet")
+    export_parquet(profiles, profiles_path, posts_path)
+
+    assert len(pandas.read_parquet(profiles_path)) == 2
+    posts_df = pandas.read_parquet(posts_path)
+    assert posts_df.profile_url.dtype == "category"
+    assert list(posts_df.likes) == [3, 0]
@@ -0,0 +1,144 @@
+import json
+
+import pandas
+
+from src.records import Post, Profile
+from src.result_store import ResultStore
+
+PROFILE = "https://www.linkedin.com/in/johndoe"
+
+
+def test_append_and_reopen(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with ResultStore(path) as store:
+        store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "a", "likes": 1}])
+
+    store = ResultStore(path)
+    assert PROFILE in store
+    assert "https://www.linkedin.com/in/janedoe" not in store
+
+
+def test_truncated_entry_is_dropped(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with ResultStore(str(path)) as store:
+        store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "a"}])
+
+    with open(path, "a") as f:
+        f.write('{"profile_url": "https://www.linkedin.com/in/jan')
+
+    with ResultStore(str(path)) as store:
+        assert len(store) == 1
+        store.append("https://www.linkedin.com/in/janedoe", [])
+
+    assert len(ResultStore(str(path))) == 2
+
+
+def test_corrupt_entry_is_skipped(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with ResultStore(str(path)) as store:
+        for profile_url in [PROFILE, "https://www.linkedin.com/in/janedoe"]:
+            store.append(profile_url, [{"profile_url": profile_url, "post_id": "a"}])
+
+    lines = path.read_bytes().splitlines(keepends=True)
+    path.write_bytes(b"{corrupt\n" + b"".join(lines))
+    size = path.stat().st_size
+
+    store = ResultStore(str(path))
+    assert len(store) == 2
+    assert len(list(store.iter_rows())) == 2
+    assert path.stat().st_size == size
+
+
+def test_latest_entry_wins(tmp_path):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "a", "likes": 1}])
+    store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "a", "likes": 2}])
+
+    assert list(store.iter_rows()) == [
+        {"profile_url": PROFILE, "post_id": "a", "likes": 2}
+    ]
+
+
+def test_import_and_export_csv(tmp_path):
+    rows = pandas.DataFrame(
+        [
+            {"profile_url": PROFILE, "post_id": "a", "likes": 1},
+            {"profile_url": PROFILE, "post_id": "b", "likes": 3},
+        ]
+    )
+    rows.to_csv(tmp_path / "in.csv", index=False)
+
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    store.import_csv(str(tmp_path / "in.csv"))
+    store.export_csv(str(tmp_path / "out.csv"))
+
+    assert PROFILE in store
+    pandas.testing.assert_frame_equal(pandas.read_csv(tmp_path / "out.csv"), rows)
+
+
+def test_refresh_entries_are_merged(tmp_path):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    row = {"profile_url": PROFILE, "name": "John", "bio": "", "followers": 10}
+    store.append(
+        PROFILE,
+        [{**row, "post_id": "b", "likes": 1}, {**row, "post_id": "a", "likes": 1}],
+    )
+    store.append("https://www.linkedin.com/in/other", [{"profile_url": "other"}])
+    store.append(
+        PROFILE,
+        [
+            {**row, "followers": 12, "post_id": "c", "likes": 0},
+            {**row, "followers": 12, "post_id": "b", "likes": 5},
+        ],
+        refresh=True,
+    )
+
+    rows = [r for r in store.iter_rows() if r["profile_url"] == PROFILE]
+    assert [(r["post_id"], r["likes"], r["followers"]) for r in rows] == [
+        ("c", 0, 12),
+        ("b", 5, 12),
+        ("a", 1, 12),
+    ]
+    assert len(list(store.iter_rows())) == 4
+
+
+def test_full_scrape_replaces_refreshes(tmp_path):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "a"}])
+    store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "b"}], refresh=True)
+    store.append(PROFILE, [{"profile_url": PROFILE, "post_id": "c"}])
+
+    assert [r["post_id"] for r in store.iter_rows()] == ["c"]
+
+
+def test_profiles_are_stored_once_per_entry(tmp_path):
+    store = ResultStore(str(tmp_path / "results.jsonl"))
+    profile = Profile(PROFILE, "John", "", 10, [Post("a", likes=1), Post("b")])
+    store.append_profile(profile)
+
+    (entry,) = store.iter_entries()
+    assert entry["profile"] == {"name": "John", "bio": "", "followers": 10}
+    assert [post["post_id"] for post in entry["posts"]] == ["a", "b"]
+
+    assert list(store.iter_profiles()) == [profile]
+    assert list(store.iter_rows()) == profile.rows()
+
+
+def test_reads_row_entries(tmp_path):
+    path = tmp_path / "results.jsonl"
+    rows = [{"profile_url": PROFILE, "name": "John", "post_id": "a"}]
+    path.write_text(json.dumps({"profile_url": PROFILE, "rows": rows}) + "\n")
+
+    assert list(ResultStore(str(path)).iter_rows()) == rows
+
+
+def test_append_profiles_batch(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    other = "https://www.linkedin.com/in/janedoe"
+    with ResultStore(path) as store:
+        store.append_profiles(
+            [(Profile(PROFILE, posts=[Post("a")]), False), (Profile(other), False)]
+        )
+        assert PROFILE in store and other in store
+
+    assert [p.profile_url for p in ResultStore(path).iter_profiles()] == [PROFILE, other]
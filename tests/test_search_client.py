@@ -0,0 +1,78 @@
+import pytest
+import requests
+
+from src.profile_search import search_linkedin_profile
+from src.search_client import SearchClient
+
+
+def make_client(search_api, **kwargs):
+    return SearchClient("user", "pass", url=search_api.url, backoff=0.01, **kwargs)
+
+
+def test_search_linkedin_profile(search_api):
+    client = make_client(search_api)
+
+    assert search_linkedin_profile(3, "user", "pass", "jane acme", client) == (
+        3,
+        "https://www.linkedin.com/in/jane",
+    )
+    assert search_linkedin_profile(4, "user", "pass", "nobody acme", client) == (
+        4,
+        "NOT FOUND",
+    )
+    assert search_api.requests[0] == {
+        "source": "google_search",
+        "query": "linkedin jane acme",
+        "parse": True,
+    }
+
+
+def test_connections_are_reused(search_api):
+    client = make_client(search_api)
+    for _ in range(5):
+        client.search("jane acme")
+
+    assert len(search_api.client_ports) == 1
+
+
+def test_retries_transient_errors(search_api):
+    search_api.responses = [(503, {}), (429, {"Retry-After": "0"})]
+    client = make_client(search_api)
+
+    client.search("jane acme")
+
+    stats = client.stats()
+    assert stats["requests"] == 1
+    assert stats["retries"] == 2
+    assert stats["failures"] == 0
+
+
+def test_gives_up_after_max_retries(search_api):
+    search_api.responses = [(500, {})] * 3
+    client = make_client(search_api, max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        client.search("jane acme")
+
+    assert client.stats()["failures"] == 1
+    assert len(search_api.requests) == 3
+
+
+def test_client_errors_are_not_retried(search_api):
+    search_api.responses = [(401, {})]
+    client = make_client(search_api)
+
+    with pytest.raises(requests.HTTPError):
+        client.search("jane acme")
+
+    assert len(search_api.requests) == 1
+
+
+def test_timeouts_are_retried(search_api):
+    search_api.delay = 0.2
+    client = make_client(search_api, max_retries=1, timeout=0.05)
+
+    with pytest.raises(requests.Timeout):
+        client.search("jane acme")
+
+    assert client.stats()["retries"] == 1
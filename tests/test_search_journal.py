@@ -0,0 +1,78 @@
+import json
+from argparse import Namespace
+
+import pandas
+
+from src.profile_search import run_threaded, search_streaming
+from src.search_client import SearchClient
+from src.search_journal import SearchJournal
+
+
+def write_input(path):
+    pandas.DataFrame(
+        {
+            "name": ["Jane", "John", "Nobody", "Ann", "Bob"],
+            "extra_info": ["acme"] * 5,
+            "profile_url": [None, "https://www.linkedin.com/in/known", None, None, None],
+        }
+    ).to_csv(path, index=False)
+
+
+def test_journal_replay_and_merge(tmp_path):
+    csv_path = str(tmp_path / "input.csv")
+    write_input(csv_path)
+
+    journal = SearchJournal(csv_path + ".journal.jsonl")
+    journal.append(0, "https://www.linkedin.com/in/jane")
+    journal.append(2, "NOT FOUND")
+    journal.checkpoint()
+    with open(journal.path, "a") as f:
+        f.write('{"index": 3, "prof')
+
+    journal = SearchJournal(journal.path)
+    assert journal.completed() == {0, 2}
+
+    journal.merge_into_csv(csv_path, chunk_size=2)
+    df = pandas.read_csv(csv_path)
+    assert df.profile_url.tolist()[:3] == [
+        "https://www.linkedin.com/in/jane",
+        "https://www.linkedin.com/in/known",
+        "NOT FOUND",
+    ]
+    assert df.profile_url.isnull().tolist()[3:] == [True, True]
+
+
+def test_search_streaming(search_api, tmp_path):
+    csv_path = str(tmp_path / "input.csv")
+    write_input(csv_path)
+    with open(csv_path + ".journal.jsonl", "w") as f:
+        f.write(json.dumps({"index": 3, "profile_url": "https://www.linkedin.com/in/ann"}))
+        f.write("\n")
+
+    args = Namespace(
+        input=csv_path,
+        username="user",
+        password="pass",
+        threads=2,
+        window=2,
+        chunk_size=2,
+        save_every=1,
+    )
+    client = SearchClient("user", "pass", url=search_api.url)
+    search_streaming(
+        args,
+        lambda items, on_result: run_threaded(args, client, None, items, on_result),
+    )
+
+    assert sorted(request["query"] for request in search_api.requests) == [
+        "linkedin Bob acme",
+        "linkedin Jane acme",
+        "linkedin Nobody acme",
+    ]
+    assert pandas.read_csv(csv_path).profile_url.tolist() == [
+        "https://www.linkedin.com/in/jane",
+        "https://www.linkedin.com/in/known",
+        "NOT FOUND",
+        "https://www.linkedin.com/in/ann",
+        "https://www.linkedin.com/in/bob",
+    ]
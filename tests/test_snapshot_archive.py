@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+
+from src.linkedin_parser import LinkedinParser
+from src.snapshot_archive import SnapshotArchive
+
+PROFILE = "https://www.linkedin.com/in/veronica-ramos-4007b21a4"
+FIXTURES = Path(__file__).parent
+
+
+def read_fixture(name):
+    with open(FIXTURES / name, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_put_is_content_addressed(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    first = archive.put(PROFILE, SnapshotArchive.PROFILE, "<html>a</html>", 1.0)
+    second = archive.put(PROFILE, SnapshotArchive.PROFILE, "<html>a</html>", 2.0)
+
+    assert first == second
+    assert archive.get(first) == "<html>a</html>"
+    assert len(list(archive.iter_entries())) == 2
+    assert len(os.listdir(tmp_path / "objects" / first[:2])) == 1
+
+
+def test_latest_captures(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    archive.put(PROFILE, SnapshotArchive.PROFILE, "old", 1.0)
+    latest = archive.put(PROFILE, SnapshotArchive.PROFILE, "new", 2.0)
+    activity = archive.put(PROFILE, SnapshotArchive.ACTIVITY, "feed", 2.0)
+
+    captures = archive.latest_captures()[PROFILE]
+    assert captures[SnapshotArchive.PROFILE]["digest"] == latest
+    assert captures[SnapshotArchive.ACTIVITY]["digest"] == activity
+
+
+def test_incomplete_capture_is_not_paired(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    profile = archive.put(PROFILE, SnapshotArchive.PROFILE, "profile", 1.0)
+    activity = archive.put(PROFILE, SnapshotArchive.ACTIVITY, "feed", 1.0)
+    # A later scrape that failed before saving the activity page.
+    archive.put(PROFILE, SnapshotArchive.PROFILE, "newer profile", 2.0)
+    archive.put("https://www.linkedin.com/in/other", SnapshotArchive.PROFILE, "x", 2.0)
+
+    captures = archive.latest_captures()
+    assert list(captures) == [PROFILE]
+    assert captures[PROFILE][SnapshotArchive.PROFILE]["digest"] == profile
+    assert captures[PROFILE][SnapshotArchive.ACTIVITY]["digest"] == activity
+
+
+def test_extract_snapshot():
+    rows = LinkedinParser.extract_snapshot(
+        PROFILE,
+        read_fixture("profile.html"),
+        read_fixture("activity.html"),
+        max_post_age_years=5,
+        max_posts=30,
+    )
+
+    assert [row["post_id"] for row in rows] == [
+        "urn:li:activity:7183990472795672576",
+        "urn:li:activity:7183879598164561920",
+    ]
+    assert rows[0]["name"] == "Veronica Ramos"
+    assert rows[0]["followers"] == 69
+    assert rows[0]["profile_url"] == PROFILE
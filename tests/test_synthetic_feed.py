@@ -0,0 +1,17 @@
+from src.html_parser import parse_html
+from src.linkedin_parser import LinkedinParser
+from tests.synthetic_feed import make_activity_page, make_posts
+
+
+def test_make_activity_page():
+    posts = LinkedinParser.find_posts(parse_html(make_activity_page(7)))
+    records = LinkedinParser.extract_posts(posts)
+
+    assert len(records) == 7
+    assert len({record["post_id"] for record in records}) == 7
+    assert records[3]["likes"] == records[0]["likes"]
+
+
+def test_make_posts_continues_numbering():
+    assert make_posts(2, start=5) != make_posts(2)
+    assert make_posts(3)[1:] == make_posts(2, start=1)
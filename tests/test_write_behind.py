@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from src.write_behind import WriteBehindWriter
+
+
+class Sink:
+    def __init__(self):
+        self.batches = []
+        self.checkpoints = []
+
+    def write(self, batch):
+        self.batches.append(batch)
+
+    def checkpoint(self):
+        self.checkpoints.append(sum(len(batch) for batch in self.batches))
+
+
+def test_batches_by_size_and_drains_on_close():
+    sink = Sink()
+    with WriteBehindWriter(
+        sink.write, sink.checkpoint, batch_size=3, flush_interval=60
+    ) as writer:
+        for i in range(7):
+            writer.submit(i)
+
+    assert sink.batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert sink.checkpoints == [7]
+    assert writer.written == 7
+
+
+def test_flushes_after_interval():
+    sink = Sink()
+    writer = WriteBehindWriter(sink.write, batch_size=100, flush_interval=0.05)
+    writer.submit("a")
+
+    deadline = time.monotonic() + 5
+    while not sink.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert sink.batches == [["a"]]
+    writer.close()
+
+
+def test_checkpoint_writes_pending_items_first():
+    sink = Sink()
+    writer = WriteBehindWriter(
+        sink.write, sink.checkpoint, batch_size=100, flush_interval=60
+    )
+    writer.submit("a")
+    writer.submit("b")
+    writer.checkpoint(wait=True)
+
+    assert sink.batches == [["a", "b"]]
+    assert sink.checkpoints == [2]
+    writer.close()
+
+
+def test_submit_blocks_when_queue_is_full():
+    release = threading.Event()
+    writer = WriteBehindWriter(
+        lambda batch: release.wait(), max_queue=1, batch_size=1, flush_interval=60
+    )
+    writer.submit(1)  # taken by the writer thread, which blocks in write_batch
+    time.sleep(0.05)
+    writer.submit(2)  # fills the queue
+
+    blocked = threading.Thread(target=writer.submit, args=(3,))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(5)
+    writer.close()
+    assert writer.written == 3
+
+
+def test_write_errors_are_raised_to_the_producer():
+    def fail(batch):
+        raise OSError("disk full")
+
+    writer = WriteBehindWriter(fail, batch_size=1, flush_interval=60)
+    writer.submit(1)
+    deadline = time.monotonic() + 5
+    while writer.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with pytest.raises(RuntimeError) as excinfo:
+        writer.submit(2)
+    assert isinstance(excinfo.value.__cause__, OSError)
+
+    with pytest.raises(RuntimeError):
+        writer.close()